@@ -0,0 +1,8 @@
+"""Performance benchmarks for the CV generator backend.
+
+Run from the cv-generator-backend directory, e.g.:
+    python -m benchmarks.ats_accuracy
+    python -m benchmarks.extractors
+    python -m benchmarks.hot_paths
+    python -m benchmarks.templates
+"""
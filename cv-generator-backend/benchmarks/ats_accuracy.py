@@ -0,0 +1,235 @@
+"""Measure how much of each generated CV an ATS parser gets back, and how fast.
+
+Usage:
+    python -m benchmarks.ats_accuracy [--profiles 12] [--jobs 8] [--experiences 4]
+        [--template professional ...] [--workers N] [--json report.json]
+
+Every synthetic profile is tailored to every synthetic job posting in every
+template. Each CV is rendered to PDF and its text re-extracted with
+pdfminer, the parser most ATS pipelines build on. The round trips run in a
+process pool. The extracted text is scored against what the generator wrote
+and against the job analysis:
+
+    section_detection   section headings (and the name) found on a line of their own
+    contact_recall      email, phone, location and LinkedIn found
+    extraction_recall   job terms written into the CV that survive extraction
+    keyword_recall      job terms (keywords and skills) found in the extracted text
+    text_recall         distinct words of the CV found in the extracted text
+
+score_out_of_5 is 5 x the mean of the first four. On the synthetic corpus
+the first three are 1.0, so it tracks keyword_recall (see
+ATS_ACCURACY_REPORT.md). render_ms times generate_cv_bytes alone. The JSON
+report carries the commit and generator version so results can be tracked
+per commit.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing import get_context
+from typing import Dict, List
+
+from benchmarks.reporting import git_commit, percentile
+from benchmarks.synthetic import synthetic_job_description, synthetic_profile
+from src.services.cv_document import CVDocument
+from src.services.cv_generator import GENERATOR_VERSION, CVGenerator
+from src.services.cv_preview import render_text
+from src.services.cv_templates import list_templates
+from src.services.job_analyzer import TOKENIZER_MODES, JobAnalyzer
+from src.services.profile_index import ProfileIndex
+from src.services.text_extraction import EXTRACTOR_REGISTRY
+
+SCORED_METRICS = ('section_detection', 'contact_recall', 'extraction_recall', 'keyword_recall')
+METRICS = SCORED_METRICS + ('text_recall',)
+CONTACT_FIELDS = ('email', 'phone', 'location', 'linkedin')
+
+# The accuracy ATS_ACCURACY_REPORT.md claims, on the same scale as score_out_of_5
+CLAIMED_SCORE = 4.0
+
+# Generator owned by a pool worker process, built once by _init_worker
+_worker_generator = None
+
+
+def _init_worker():
+    global _worker_generator
+    _worker_generator = CVGenerator()
+
+
+def _flatten(text: str) -> str:
+    return ' '.join(text.split()).lower()
+
+
+def job_terms(job_analysis: Dict) -> List[str]:
+    """Distinct lowercased keywords and skills an ATS would search the CV for"""
+    terms = []
+    for field in ('keywords', 'technical_skills', 'soft_skills'):
+        terms.extend(term.lower() for term in job_analysis.get(field) or [])
+    return list(dict.fromkeys(terms))
+
+
+def score_round_trip(document: CVDocument, user_data: Dict, job_analysis: Dict, extracted: str) -> Dict:
+    """Score extracted PDF text against the document that was rendered and the job it targets"""
+    lines = {_flatten(line) for line in extracted.splitlines()}
+    headings = []
+    for _, blocks in document.sections:
+        heading = next((block.text for block in blocks if block.style in ('CVHeader', 'SectionHeader')), None)
+        if heading:
+            headings.append(_flatten(heading))
+    detected = sum(heading in lines for heading in headings)
+
+    flat = _flatten(extracted)
+    contact = user_data.get('personal_info', {})
+    contact_values = [str(contact[field]).lower() for field in CONTACT_FIELDS if contact.get(field)]
+    contact_found = sum(value in flat for value in contact_values)
+
+    written_index = ProfileIndex({'text': _flatten(render_text(document))})
+    extracted_index = ProfileIndex({'text': flat})
+    terms = job_terms(job_analysis)
+    written = {term for term in terms if written_index.has_term(term)}
+    found = {term for term in terms if extracted_index.has_term(term)}
+
+    return {
+        'section_detection': detected / len(headings) if headings else 1.0,
+        'contact_recall': contact_found / len(contact_values) if contact_values else 1.0,
+        'extraction_recall': len(written & found) / len(written) if written else 1.0,
+        'keyword_recall': len(found) / len(terms) if terms else 1.0,
+        'text_recall': (
+            len(written_index.tokens & extracted_index.tokens) / len(written_index.tokens)
+            if written_index.tokens else 1.0
+        ),
+        'lost_terms': sorted(written - found),
+    }
+
+
+def _round_trip(case: Dict) -> Dict:
+    """Run inside a worker: render one CV, re-extract it and score the text"""
+    profile = synthetic_profile(case['profile_seed'], case['experiences'])
+    analysis = case['job_analysis']
+
+    # Built only for scoring; generate_cv_bytes builds its own, inside the timed render
+    document = _worker_generator.build_document(profile, analysis, case['template'])
+    started = time.perf_counter()
+    pdf_bytes = _worker_generator.generate_cv_bytes(profile, analysis, case['template'])
+    render_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    extracted = ''.join(EXTRACTOR_REGISTRY['pdf']['pdfminer'].extract(BytesIO(pdf_bytes)))
+    extract_ms = (time.perf_counter() - started) * 1000
+
+    return {
+        'profile_seed': case['profile_seed'],
+        'job_seed': case['job_seed'],
+        'template': case['template'],
+        **score_round_trip(document, profile, analysis, extracted),
+        'pdf_bytes': len(pdf_bytes),
+        'render_ms': round(render_ms, 2),
+        'extract_ms': round(extract_ms, 2),
+    }
+
+
+def summarize(results: List[Dict]) -> Dict:
+    """Mean of every metric, the score out of 5 and the worst case per metric"""
+    summary = {metric: round(statistics.fmean(result[metric] for result in results), 4) for metric in METRICS}
+    summary['score_out_of_5'] = round(5 * statistics.fmean(summary[metric] for metric in SCORED_METRICS), 2)
+    summary['worst'] = {metric: round(min(result[metric] for result in results), 4) for metric in METRICS}
+    summary['round_trips'] = len(results)
+    return summary
+
+
+def main():
+    template_ids = [template['id'] for template in list_templates()]
+    parser = argparse.ArgumentParser(description='Benchmark ATS round-trip accuracy of generated CVs')
+    parser.add_argument('--profiles', type=int, default=12, help='Synthetic profiles')
+    parser.add_argument('--jobs', type=int, default=8, help='Synthetic job postings')
+    parser.add_argument('--experiences', type=int, default=4, help='Work-experience entries per profile')
+    parser.add_argument('--job-chars', type=int, default=1500, help='Approximate length of each posting')
+    parser.add_argument('--template', action='append', choices=template_ids,
+                        help='Template to render (repeatable; default: all)')
+    parser.add_argument('--tokenizer', choices=TOKENIZER_MODES, default='fast',
+                        help="Job analyzer tokenizer ('fast' needs no NLTK data)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Round-trip worker processes')
+    parser.add_argument('--json', help='Write the report to this JSON file')
+    args = parser.parse_args()
+
+    analyzer = JobAnalyzer(tokenizer=args.tokenizer)
+    analyses = [
+        analyzer.analyze_job_description(synthetic_job_description(seed, args.job_chars))
+        for seed in range(args.jobs)
+    ]
+    cases = [
+        {
+            'profile_seed': profile_seed,
+            'experiences': args.experiences,
+            'job_seed': job_seed,
+            'job_analysis': analysis,
+            'template': template_id,
+        }
+        for template_id in args.template or template_ids
+        for profile_seed in range(args.profiles)
+        for job_seed, analysis in enumerate(analyses)
+    ]
+
+    workers = max(1, args.workers)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(workers, mp_context=get_context('spawn'), initializer=_init_worker) as pool:
+        results = list(pool.map(_round_trip, cases, chunksize=max(1, len(cases) // (workers * 4))))
+    wall_seconds = time.perf_counter() - started
+
+    by_template = {}
+    for result in results:
+        by_template.setdefault(result['template'], []).append(result)
+    lost = Counter(term for result in results for term in result['lost_terms'])
+
+    render_ms = [result['render_ms'] for result in results]
+    extract_ms = [result['extract_ms'] for result in results]
+    report = {
+        'commit': git_commit(),
+        'generator_version': GENERATOR_VERSION,
+        'config': {
+            'profiles': args.profiles,
+            'jobs': args.jobs,
+            'experiences': args.experiences,
+            'job_chars': args.job_chars,
+            'templates': list(by_template),
+            'tokenizer': args.tokenizer,
+            'workers': workers,
+        },
+        'claimed_score': CLAIMED_SCORE,
+        'summary': summarize(results),
+        'templates': {template_id: summarize(group) for template_id, group in by_template.items()},
+        'most_lost_terms': dict(lost.most_common(10)),
+        'throughput': {
+            'wall_seconds': round(wall_seconds, 3),
+            'round_trips_per_second': round(len(results) / wall_seconds, 2),
+            'render_ms_p50': round(percentile(render_ms, 0.5), 2),
+            'render_ms_p95': round(percentile(render_ms, 0.95), 2),
+            'extract_ms_p50': round(percentile(extract_ms, 0.5), 2),
+            'extract_ms_p95': round(percentile(extract_ms, 0.95), 2),
+        },
+    }
+
+    print(f"{'template':<14} {'sections':>9} {'contact':>8} {'extract':>8} {'keywords':>9} {'text':>6} {'score':>6}")
+    for template_id, summary in list(report['templates'].items()) + [('all', report['summary'])]:
+        print(f"{template_id:<14} {summary['section_detection']:>9.3f} {summary['contact_recall']:>8.3f} "
+              f"{summary['extraction_recall']:>8.3f} {summary['keyword_recall']:>9.3f} "
+              f"{summary['text_recall']:>6.3f} {summary['score_out_of_5']:>6}")
+    print()
+    print(f"claimed score: {CLAIMED_SCORE}/5, measured: {report['summary']['score_out_of_5']}/5")
+    throughput = report['throughput']
+    print(f"{len(results)} round trips in {throughput['wall_seconds']} s "
+          f"({throughput['round_trips_per_second']}/s on {workers} workers); "
+          f"render p50 {throughput['render_ms_p50']} ms, extract p50 {throughput['extract_ms_p50']} ms")
+    if lost:
+        print('most often lost in extraction: ' + ', '.join(f'{term} ({count})' for term, count in lost.most_common(5)))
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
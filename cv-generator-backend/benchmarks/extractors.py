@@ -0,0 +1,161 @@
+"""Compare throughput and peak RSS of the document text extractor backends.
+
+Usage:
+    python -m benchmarks.extractors [--pages 20] [--repeat 5] [--json results.json]
+
+Each backend runs in a freshly spawned process in which the other backends'
+libraries are blocked from importing, so its import cost and peak resident
+set size only include its own library. text_extraction imports every
+available library when it loads; this script imports it only inside the
+child, after blocking the rest.
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Top-level package each backend's library is imported from
+BACKEND_MODULES = {
+    'pdfminer': 'pdfminer',
+    'pypdf2': 'PyPDF2',
+    'python-docx': 'docx',
+    'docx2txt': 'docx2txt',
+    'textract': 'textract',
+}
+
+SAMPLE_PARAGRAPH = (
+    'We are looking for a senior Python developer with experience in Flask, '
+    'PostgreSQL, Docker and AWS. You will design REST APIs, mentor junior '
+    'engineers and work in an agile team practising CI/CD and TDD. '
+)
+
+
+def build_pdf(pages: int) -> bytes:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate
+
+    styles = getSampleStyleSheet()
+    story = []
+    for page in range(pages):
+        for _ in range(8):
+            story.append(Paragraph(SAMPLE_PARAGRAPH * 2, styles['Normal']))
+        story.append(PageBreak())
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build(story)
+    return buffer.getvalue()
+
+
+def build_docx(pages: int) -> bytes:
+    import docx
+
+    document = docx.Document()
+    for _ in range(pages * 8):
+        document.add_paragraph(SAMPLE_PARAGRAPH * 2)
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss survives exec on Linux, so a spawned child would report the
+    # parent's peak; VmHWM belongs to the child's own address space
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_backend(file_format: str, name: str, data: bytes, repeat: int) -> dict:
+    """Run inside a child process: time one backend and record its import cost and peak RSS"""
+    # A None entry makes any import of the module raise ImportError, which
+    # text_extraction treats as the library not being installed
+    for backend_name, module in BACKEND_MODULES.items():
+        if backend_name != name and module not in sys.modules:
+            sys.modules[module] = None
+
+    startup_rss = _peak_rss_mb()
+    from src.services.text_extraction import EXTRACTOR_REGISTRY
+    backend = EXTRACTOR_REGISTRY[file_format][name]
+    if not backend.available:
+        raise RuntimeError(f"{file_format}/{name} needs a library of another backend")
+    loaded = sorted(backend_name for backend_name, module in BACKEND_MODULES.items() if sys.modules.get(module))
+    baseline_rss = _peak_rss_mb()
+
+    characters = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        characters = sum(len(chunk) for chunk in backend.extract(io.BytesIO(data)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        'format': file_format,
+        'backend': name,
+        'bytes': len(data),
+        'characters': characters,
+        'ms_per_document': round(elapsed / repeat * 1000, 2),
+        'mb_per_second': round(len(data) * repeat / elapsed / (1024 * 1024), 2),
+        'libraries_loaded': loaded,
+        'import_rss_mb': round(baseline_rss - startup_rss, 1),
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+        'rss_growth_mb': round(_peak_rss_mb() - baseline_rss, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark text extractor backends')
+    parser.add_argument('--pages', type=int, default=20, help='Pages per sample document')
+    parser.add_argument('--repeat', type=int, default=5, help='Extractions per backend')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    # Imported here, not at module level, so spawned children start without any extractor library
+    from src.services.text_extraction import EXTRACTOR_REGISTRY
+
+    samples = {'pdf': build_pdf(args.pages), 'docx': build_docx(args.pages)}
+    context = multiprocessing.get_context('spawn')
+
+    results = []
+    for file_format, data in samples.items():
+        for name, backend in EXTRACTOR_REGISTRY.get(file_format, {}).items():
+            if not backend.available:
+                print(f"skipping {file_format}/{name}: not installed")
+                continue
+            with context.Pool(1) as pool:
+                try:
+                    results.append(pool.apply(_run_backend, (file_format, name, data, args.repeat)))
+                except RuntimeError as e:
+                    print(f"skipping {file_format}/{name}: {e}")
+
+    print(f"{'format':<6} {'backend':<12} {'ms/doc':>9} {'MB/s':>7} {'chars':>8} "
+          f"{'import MB':>10} {'peak RSS MB':>12} {'growth MB':>10}")
+    for result in results:
+        print(f"{result['format']:<6} {result['backend']:<12} {result['ms_per_document']:>9} "
+              f"{result['mb_per_second']:>7} {result['characters']:>8} {result['import_rss_mb']:>10} "
+              f"{result['peak_rss_mb']:>12} {result['rss_growth_mb']:>10}")
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({'pages': args.pages, 'repeat': args.repeat, 'results': results}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""Time the analyzer, extractor, generator and validator hot paths across input sizes.
+
+Usage:
+    python -m benchmarks.hot_paths [--stage analyze ...] [--repeat 20] [--json results.json]
+        [--baseline previous.json] [--p50-threshold 0.2] [--p99-threshold 0.5] [--memory-threshold 0.25]
+
+Stages and the inputs each is run on:
+
+    analyze    JobAnalyzer.analyze_job_description on postings of 500 B to 50 KB
+    extract    JobAnalyzer.extract_text_from_file on the same postings as PDF and DOCX
+    generate   CVGenerator.generate_cv_bytes for profiles with 1 to 30 jobs
+    validate   CVGenerator.validate_ats_compatibility for the same profiles
+
+Inputs come from benchmarks.synthetic, so every run sees the same documents.
+Each case reports p50/p99 latency, calls and input MB per second, and the
+peak Python memory of one call (tracemalloc, measured outside the timed
+runs). With --baseline, p50, p99 and peak memory are compared to an earlier
+--json file, and the exit status is 1 if any grew by more than its threshold.
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.reporting import git_commit, percentile
+from benchmarks.synthetic import synthetic_job_description, synthetic_profile
+from src.services.cv_generator import GENERATOR_VERSION, CVGenerator
+from src.services.job_analyzer import TOKENIZER_MODES, JobAnalyzer
+
+STAGES = ('analyze', 'extract', 'generate', 'validate')
+
+# Posting sizes in characters, from a short ad to a 50 KB description
+POSTING_SIZES = {'short': 500, 'medium': 5000, 'long': 50000}
+
+# Work-experience entries per generated and validated profile
+EXPERIENCE_COUNTS = (1, 5, 15, 30)
+
+# Metrics compared against a baseline, with the relative growth allowed by default
+DEFAULT_THRESHOLDS = {'p50_ms': 0.2, 'p99_ms': 0.5, 'peak_kb': 0.25}
+
+
+def posting_pdf(text: str) -> bytes:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    style = getSampleStyleSheet()['Normal']
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build([Paragraph(paragraph, style) for paragraph in text.split('\n\n')])
+    return buffer.getvalue()
+
+
+def posting_docx(text: str) -> bytes:
+    import docx
+
+    document = docx.Document()
+    for paragraph in text.split('\n\n'):
+        document.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(stage: str, case: str, function: Callable[[], object], input_bytes: int,
+            repeat: int, max_seconds: float) -> Dict:
+    """Time repeated calls of function, then trace the peak memory of one more"""
+    function()  # warm caches and lazy imports outside the timed runs
+
+    timings = []
+    deadline = time.perf_counter() + max_seconds
+    while len(timings) < repeat and (len(timings) < 3 or time.perf_counter() < deadline):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'stage': stage,
+        'case': case,
+        'input_bytes': input_bytes,
+        'runs': len(timings),
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'mean_ms': round(total / len(timings) * 1000, 3),
+        'per_second': round(len(timings) / total, 2),
+        'mb_per_second': round(input_bytes * len(timings) / total / (1024 * 1024), 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run_stages(stages: List[str], analyzer: JobAnalyzer, generator: CVGenerator,
+               repeat: int, max_seconds: float) -> List[Dict]:
+    postings = {size: synthetic_job_description(seed, chars) for seed, (size, chars) in enumerate(POSTING_SIZES.items())}
+    analysis = analyzer.analyze_job_description(postings['medium'])
+    profiles = {count: synthetic_profile(count, count) for count in EXPERIENCE_COUNTS}
+
+    results = []
+    for stage in stages:
+        if stage == 'analyze':
+            for size, text in postings.items():
+                results.append(measure(
+                    stage, size, lambda: analyzer.analyze_job_description(text),
+                    len(text.encode('utf-8')), repeat, max_seconds
+                ))
+        elif stage == 'extract':
+            for size, text in postings.items():
+                for extension, build in (('pdf', posting_pdf), ('docx', posting_docx)):
+                    data = build(text)
+                    results.append(measure(
+                        stage, f'{size}.{extension}',
+                        lambda: analyzer.extract_text_from_file(data, f'posting.{extension}'),
+                        len(data), repeat, max_seconds
+                    ))
+        elif stage == 'generate':
+            for count, profile in profiles.items():
+                results.append(measure(
+                    stage, f'{count}_jobs', lambda: generator.generate_cv_bytes(profile, analysis),
+                    len(json.dumps(profile).encode('utf-8')), repeat, max_seconds
+                ))
+        elif stage == 'validate':
+            for count, profile in profiles.items():
+                results.append(measure(
+                    stage, f'{count}_jobs', lambda: generator.validate_ats_compatibility(profile, analysis),
+                    len(json.dumps(profile).encode('utf-8')), repeat, max_seconds
+                ))
+    return results
+
+
+def compare(results: List[Dict], baseline: Dict, thresholds: Dict[str, float]) -> List[Dict]:
+    """Annotate results with their change against baseline and return the regressions.
+
+    A regression is a metric that grew by more than its threshold, as a
+    fraction of the baseline value (0.2 allows 20% growth).
+    """
+    previous = {(result['stage'], result['case']): result for result in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        before = previous.get((result['stage'], result['case']))
+        if before is None:
+            continue
+        result['vs_baseline'] = {}
+        for metric, threshold in thresholds.items():
+            if not before.get(metric):
+                continue
+            change = result[metric] / before[metric] - 1
+            result['vs_baseline'][metric] = round(change, 4)
+            if change > threshold:
+                regressions.append({
+                    'stage': result['stage'],
+                    'case': result['case'],
+                    'metric': metric,
+                    'baseline': before[metric],
+                    'current': result[metric],
+                    'change': round(change, 4),
+                    'threshold': threshold,
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analyzer, extractor, generator and validator hot paths')
+    parser.add_argument('--stage', action='append', choices=STAGES, help='Stage to run (repeatable; default: all)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed calls per case')
+    parser.add_argument('--max-seconds', type=float, default=10.0,
+                        help='Stop timing a case after this long (at least 3 calls are always made)')
+    parser.add_argument('--tokenizer', choices=TOKENIZER_MODES, default='fast',
+                        help="Job analyzer tokenizer ('fast' needs no NLTK data)")
+    parser.add_argument('--json', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Compare against results previously written with --json')
+    parser.add_argument('--p50-threshold', type=float, default=DEFAULT_THRESHOLDS['p50_ms'],
+                        help='Allowed p50 latency growth over the baseline, as a fraction')
+    parser.add_argument('--p99-threshold', type=float, default=DEFAULT_THRESHOLDS['p99_ms'],
+                        help='Allowed p99 latency growth over the baseline, as a fraction')
+    parser.add_argument('--memory-threshold', type=float, default=DEFAULT_THRESHOLDS['peak_kb'],
+                        help='Allowed peak memory growth over the baseline, as a fraction')
+    args = parser.parse_args()
+
+    stages = args.stage or list(STAGES)
+    # No analysis cache, so repeated calls measure the analysis itself
+    results = run_stages(stages, JobAnalyzer(tokenizer=args.tokenizer), CVGenerator(),
+                         max(1, args.repeat), args.max_seconds)
+
+    report = {
+        'commit': git_commit(),
+        'generator_version': GENERATOR_VERSION,
+        'python': platform.python_version(),
+        'config': {'stages': stages, 'repeat': args.repeat, 'tokenizer': args.tokenizer},
+        'results': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        thresholds = {'p50_ms': args.p50_threshold, 'p99_ms': args.p99_threshold, 'peak_kb': args.memory_threshold}
+        regressions = compare(results, baseline, thresholds)
+        report['baseline'] = {'commit': baseline.get('commit'), 'thresholds': thresholds}
+        report['regressions'] = regressions
+
+    print(f"{'stage':<9} {'case':<12} {'runs':>5} {'p50 ms':>9} {'p99 ms':>9} {'per s':>8} {'MB/s':>8} "
+          f"{'peak KB':>9} {'p50 vs base':>12}")
+    for result in results:
+        change = result.get('vs_baseline', {}).get('p50_ms')
+        change_text = f'{change:+.1%}' if change is not None else '-'
+        print(f"{result['stage']:<9} {result['case']:<12} {result['runs']:>5} {result['p50_ms']:>9} "
+              f"{result['p99_ms']:>9} {result['per_second']:>8} {result['mb_per_second']:>8} "
+              f"{result['peak_kb']:>9} {change_text:>12}")
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if regressions:
+        print()
+        for regression in regressions:
+            print(f"REGRESSION {regression['stage']}/{regression['case']} {regression['metric']}: "
+                  f"{regression['baseline']} -> {regression['current']} "
+                  f"({regression['change']:+.1%}, allowed {regression['threshold']:+.0%})")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
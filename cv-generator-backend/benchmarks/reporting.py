@@ -0,0 +1,25 @@
+"""Helpers shared by the benchmark reports, so every report computes them the same way."""
+import math
+import subprocess
+from typing import Iterable, Optional
+
+
+def percentile(values: Iterable[float], fraction: float) -> float:
+    """Nearest-rank percentile: the smallest value with at least fraction of the values at or below it.
+
+    Returns 0.0 for no values.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def git_commit() -> Optional[str]:
+    """The checked-out commit, recorded with results so runs can be compared across commits"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,133 @@
+"""Deterministic synthetic CV profiles and job descriptions for benchmarks.
+
+The same seed always produces the same document, so results can be
+compared across commits and regenerated inside worker processes instead of
+being pickled to them.
+"""
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ['Alex', 'Priya', 'Jordan', 'Mei', 'Tomás', 'Amara', 'Lukas', 'Zoë', 'Kwame', 'Sofía', 'Noah', 'Yuki']
+LAST_NAMES = ['Morgan', 'Patel', 'Okafor', 'Nguyen', 'García', 'Schmidt', 'Kowalski', 'Haddad', 'Silva', 'Brennan']
+CITIES = ['London, UK', 'Manchester, UK', 'Berlin, Germany', 'Toronto, Canada', 'Austin, TX', 'Lisbon, Portugal']
+
+JOB_TITLES = [
+    'Software Engineer', 'Backend Developer', 'Data Engineer', 'DevOps Engineer', 'Full Stack Developer',
+    'Machine Learning Engineer', 'Platform Engineer', 'Site Reliability Engineer', 'Frontend Developer',
+]
+SENIORITY = ['Junior', '', 'Senior', 'Lead', 'Principal']
+COMPANIES = [
+    'Northwind Analytics', 'Bluefin Systems', 'Cobalt Health', 'Larch Logistics', 'Meridian Bank',
+    'Orbital Media', 'Quartz Robotics', 'Saffron Retail', 'Tidewater Energy', 'Vantage Cloud',
+]
+
+# Drawn from the analyzer's skill vocabulary, including punctuated and multi-word terms
+TECHNICAL_SKILLS = [
+    'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'aws', 'docker', 'kubernetes', 'git',
+    'agile', 'scrum', 'machine learning', 'data analysis', 'flask', 'django', 'mongodb', 'postgresql',
+    'mysql', 'redis', 'elasticsearch', 'api', 'rest', 'graphql', 'microservices', 'devops', 'ci/cd',
+    'jenkins', 'terraform', 'linux', 'bash',
+]
+SOFT_SKILLS = ['leadership', 'communication', 'problem solving', 'teamwork', 'mentoring', 'collaboration']
+LANGUAGES = ['English', 'Spanish', 'German', 'French', 'Portuguese', 'Japanese']
+DEGREES = ['BSc Computer Science', 'MSc Data Science', 'BEng Software Engineering', 'BSc Mathematics']
+SCHOOLS = ['University of Leeds', 'TU Munich', 'University of Toronto', 'University of Lisbon', 'UT Austin']
+
+ACTIONS = [
+    'Worked on {skill} services for the {team} team',
+    'Built {skill} pipelines processing {count} million events a day',
+    'Helped migrate legacy systems to {skill}',
+    'Used {skill} and {other} to cut release time by {count}%',
+    'Handled on-call rotation and incident reviews for {team}',
+    'Designed {skill} APIs consumed by {count} internal teams',
+    'Mentored {count} engineers on {skill} best practices',
+    'Made dashboards in {skill} for the {team} leadership',
+]
+TEAMS = ['payments', 'search', 'growth', 'platform', 'data', 'mobile', 'risk', 'logistics']
+
+POSTING_SENTENCES = [
+    'We are looking for a {title} to join our {team} team at {company}.',
+    'You will design and build {skill} services that scale to millions of users.',
+    'Strong experience with {skill} and {other} is required.',
+    'Familiarity with {skill} is a plus.',
+    'You have {years}+ years of professional experience with {skill}.',
+    'Excellent {soft} and {soft2} skills are essential.',
+    'You will work in an agile environment with code review and continuous delivery.',
+    'Experience operating {skill} in production on {other} is highly desirable.',
+    'A degree in Computer Science or a related field is preferred.',
+    'You will partner with product and design to ship features every week.',
+]
+
+
+def synthetic_profile(seed: int, experiences: int = 4) -> Dict:
+    """A complete profile with the given number of work-experience entries, newest first"""
+    rng = random.Random(seed)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(TECHNICAL_SKILLS, 8)
+    end_year = 2025
+
+    work_experience = []
+    for index in range(experiences):
+        start_year = end_year - rng.randint(1, 4)
+        bullets = [
+            action.format(skill=rng.choice(skills), other=rng.choice(skills), team=rng.choice(TEAMS),
+                          count=rng.randint(2, 40))
+            for action in rng.sample(ACTIONS, rng.randint(2, 4))
+        ]
+        work_experience.append({
+            'job_title': ' '.join(filter(None, [rng.choice(SENIORITY), rng.choice(JOB_TITLES)])),
+            'company': rng.choice(COMPANIES),
+            'start_date': str(start_year),
+            'end_date': 'Present' if index == 0 else str(end_year),
+            'description': '\n'.join(bullets),
+        })
+        end_year = start_year
+
+    return {
+        'personal_info': {
+            'full_name': f'{first} {last}',
+            'email': f'{first}.{last}@example.com'.lower(),
+            'phone': f'+44 20 7946 {rng.randint(1000, 9999)}',
+            'location': rng.choice(CITIES),
+            'linkedin': f'linkedin.com/in/{first}{last}{seed}'.lower(),
+        },
+        'professional_summary': (
+            f'{rng.choice(JOB_TITLES)} with {experiences + rng.randint(1, 5)} years building '
+            f'{skills[0]} and {skills[1]} systems for {rng.choice(TEAMS)} teams.'
+        ),
+        'work_experience': work_experience,
+        'education': [{
+            'degree': rng.choice(DEGREES),
+            'school': rng.choice(SCHOOLS),
+            'graduation_date': str(end_year),
+        }],
+        'skills': {
+            'technical_skills': list(skills),
+            'soft_skills': [skill.title() for skill in rng.sample(SOFT_SKILLS, 2)],
+            'languages': rng.sample(LANGUAGES, 2),
+        },
+    }
+
+
+def synthetic_job_description(seed: int, target_chars: int = 1200) -> str:
+    """A job posting of roughly target_chars characters, grown sentence by sentence"""
+    rng = random.Random(seed)
+    required = rng.sample(TECHNICAL_SKILLS, 6)
+    title = ' '.join(filter(None, [rng.choice(SENIORITY), rng.choice(JOB_TITLES)]))
+    company = rng.choice(COMPANIES)
+
+    paragraphs: List[str] = [f'{title} - {company}']
+    length = len(paragraphs[0])
+    while length < target_chars:
+        sentences = [
+            rng.choice(POSTING_SENTENCES).format(
+                title=title, team=rng.choice(TEAMS), company=company,
+                skill=rng.choice(required), other=rng.choice(required), years=rng.randint(2, 8),
+                soft=rng.choice(SOFT_SKILLS), soft2=rng.choice(SOFT_SKILLS),
+            )
+            for _ in range(rng.randint(3, 5))
+        ]
+        paragraph = ' '.join(sentences)
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+    return '\n\n'.join(paragraphs)
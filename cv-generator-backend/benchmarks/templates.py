@@ -0,0 +1,112 @@
+"""Measure per-render setup cost and render time for each CV template.
+
+Usage:
+    python -m benchmarks.templates [--repeat 200] [--json results.json]
+
+"stylesheet build" is what every CVGenerator() used to pay before templates
+were precompiled: getSampleStyleSheet() plus the custom paragraph styles.
+"generator setup" is what a CVGenerator() costs now that it reuses the
+process-wide template registry.
+"""
+import argparse
+import json
+import time
+
+from reportlab.lib.styles import getSampleStyleSheet
+
+from src.services.cv_generator import CVGenerator
+from src.services.cv_templates import _TEMPLATE_SPECS, get_template, list_templates
+
+SAMPLE_PROFILE = {
+    'personal_info': {
+        'full_name': 'Alex Morgan',
+        'email': 'alex.morgan@example.com',
+        'phone': '+44 20 7946 0000',
+        'location': 'London, UK',
+        'linkedin': 'linkedin.com/in/alexmorgan',
+    },
+    'professional_summary': 'Backend engineer with eight years building Python services and data pipelines.',
+    'work_experience': [
+        {
+            'job_title': f'Software Engineer {index}',
+            'company': f'Company {index}',
+            'start_date': f'{2015 + index}',
+            'end_date': f'{2016 + index}',
+            'description': 'Worked on REST APIs for the team\nHandled project delivery and performance tuning\n'
+                           'Helped users migrate to the new platform',
+        }
+        for index in range(4)
+    ],
+    'education': [{'degree': 'BSc Computer Science', 'school': 'University of Leeds', 'graduation_date': '2014'}],
+    'skills': {
+        'technical_skills': ['Python', 'Flask', 'PostgreSQL', 'Docker', 'AWS', 'Kubernetes'],
+        'soft_skills': ['Leadership', 'Communication'],
+        'languages': ['English', 'Spanish'],
+    },
+}
+
+SAMPLE_ANALYSIS = {
+    'keywords': ['python', 'api', 'aws', 'agile', 'docker', 'microservices', 'team', 'data', 'cloud', 'testing'],
+    'technical_skills': ['python', 'aws', 'docker', 'kubernetes'],
+    'soft_skills': ['leadership', 'communication'],
+}
+
+
+def _time_per_call(function, repeat: int) -> float:
+    """Return the mean milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CV template setup and render cost')
+    parser.add_argument('--repeat', type=int, default=200, help='Iterations per measurement')
+    parser.add_argument('--json', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    # First use compiles every template once for the process
+    started = time.perf_counter()
+    get_template()
+    registry_ms = (time.perf_counter() - started) * 1000
+
+    build_styles = _TEMPLATE_SPECS['professional'].build_styles
+    setup = {
+        'registry_compile_ms': round(registry_ms, 3),
+        'stylesheet_build_ms': round(
+            _time_per_call(lambda: build_styles(getSampleStyleSheet()), args.repeat), 4
+        ),
+        'generator_setup_ms': round(_time_per_call(CVGenerator, args.repeat), 4),
+    }
+
+    generator = CVGenerator()
+    renders = []
+    render_repeat = max(1, args.repeat // 10)
+    for template in list_templates():
+        template_id = template['id']
+        renders.append({
+            'template': template_id,
+            'shared_generator_ms': round(_time_per_call(
+                lambda: generator.generate_cv_bytes(SAMPLE_PROFILE, SAMPLE_ANALYSIS, template_id), render_repeat
+            ), 3),
+            'generator_per_render_ms': round(_time_per_call(
+                lambda: CVGenerator().generate_cv_bytes(SAMPLE_PROFILE, SAMPLE_ANALYSIS, template_id), render_repeat
+            ), 3),
+        })
+
+    print(f"registry compile (once per process): {setup['registry_compile_ms']:>9} ms")
+    print(f"stylesheet build (old per-request):  {setup['stylesheet_build_ms']:>9} ms")
+    print(f"generator setup (now):               {setup['generator_setup_ms']:>9} ms")
+    print()
+    print(f"{'template':<14} {'shared ms':>10} {'new generator ms':>17}")
+    for result in renders:
+        print(f"{result['template']:<14} {result['shared_generator_ms']:>10} {result['generator_per_render_ms']:>17}")
+
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump({'repeat': args.repeat, 'setup': setup, 'renders': renders}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Build the corpus IDF table used for TF-IDF keyword ranking.
+
+Usage:
+    python scripts/build_idf_table.py corpus/ idf_table.bin [--tokenizer fast] [--min-df 2]
+
+The corpus is any mix of .txt files (one job description each) and .jsonl
+files (one JSON object per line with the posting under --field). Point
+IDF_TABLE_PATH at the output file and restart the workers to use it.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.idf_table import build_idf_table
+from src.services.job_analyzer import JobAnalyzer
+
+
+def iter_documents(paths, field):
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, name) for root, _, names in os.walk(path) for name in names
+            )
+        else:
+            files = [path]
+
+        for file_path in files:
+            if file_path.endswith('.jsonl'):
+                with open(file_path, encoding='utf-8') as handle:
+                    for line in handle:
+                        if line.strip():
+                            yield json.loads(line).get(field, '')
+            elif file_path.endswith('.txt'):
+                with open(file_path, encoding='utf-8', errors='replace') as handle:
+                    yield handle.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('corpus', nargs='+', help='Corpus files or directories')
+    parser.add_argument('output', help='Path of the IDF table to write')
+    parser.add_argument('--tokenizer', default='fast', choices=('nltk', 'fast'),
+                        help='Tokenizer mode; use the same mode the service runs with')
+    parser.add_argument('--field', default='job_text', help='Posting field in .jsonl records')
+    parser.add_argument('--min-df', type=int, default=2, help='Drop terms seen in fewer documents')
+    args = parser.parse_args()
+
+    analyzer = JobAnalyzer(tokenizer=args.tokenizer)
+
+    # Tokenize exactly as keyword ranking does, so every ranked token can be looked up
+    def tokenize(document):
+        return analyzer._keyword_counts(analyzer._normalize_text(document)).keys()
+
+    terms = build_idf_table(iter_documents(args.corpus, args.field), args.output, tokenize, args.min_df)
+    print(f"Wrote {terms} terms to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
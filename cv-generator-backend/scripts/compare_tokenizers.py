@@ -0,0 +1,59 @@
+"""Report where the fast tokenizer's keyword rankings differ from NLTK's.
+
+Usage:
+    python scripts/compare_tokenizers.py path/to/job_descriptions [more paths...]
+
+Every .txt file under the given paths is analyzed with both tokenizer modes
+and the top keyword lists are compared. Needs NLTK's punkt_tab and stopwords
+data, since this is the only check against the trained Punkt model. Exits
+non-zero on any mismatch.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.job_analyzer import JobAnalyzer
+
+
+def iter_corpus(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith('.txt'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='+', help='Job description files or directories')
+    args = parser.parse_args()
+
+    reference = JobAnalyzer(tokenizer='nltk')
+    fast = JobAnalyzer(tokenizer='fast')
+
+    documents = 0
+    mismatches = 0
+    for path in iter_corpus(args.paths):
+        with open(path, encoding='utf-8', errors='replace') as handle:
+            text = reference._normalize_text(handle.read())
+
+        documents += 1
+        expected = reference._extract_keywords(text)
+        actual = fast._extract_keywords(text)
+        if expected != actual:
+            mismatches += 1
+            print(f"MISMATCH {path}")
+            print(f"  nltk: {expected}")
+            print(f"  fast: {actual}")
+
+    print(f"{documents} documents, {mismatches} ranking mismatches")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
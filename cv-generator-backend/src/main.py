@@ -7,16 +7,18 @@ from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
 from src.routes.user import user_bp
-from src.routes.cv import cv_bp
+from src.routes.cv import UploadRequest, cv_bp, init_services
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+app.request_class = UploadRequest
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
 # Enable CORS for all routes
-CORS(app)
+CORS(app, expose_headers=["X-CV-Id", "X-CV-Cache", "X-CV-Render-Ms", "ETag", "Content-Range", "Accept-Ranges"])
 
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(cv_bp, url_prefix='/api')
+init_services()
 
 # uncomment if you need to use database
 app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
@@ -1,14 +1,135 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Request, Response, request, jsonify, send_file, stream_with_context
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
 import os
+import re
 import json
+import tempfile
+import time
+import uuid
+from src.services.analysis_cache import AnalysisCache
+from src.services.analysis_session import AnalysisSessionStore
+from src.services.cv_job_queue import CVJobQueue
+from src.services.cv_preview import render_html, render_text
+from src.services.cv_storage import STORAGE_BACKENDS, StoredCV, content_etag, is_content_addressed
 from src.services.job_analyzer import JobAnalyzer
-from src.services.cv_generator import CVGenerator
+from src.services.match_matrix import MatchMatrix
+from src.services.render_cache import RenderedCVCache
+from src.services.render_pool import RenderPool, RenderPoolBusy, RenderTimeoutError
+from src.services.text_cache import DigestingSpool, ExtractedTextCache
+from src.services.zip_stream import stream_zip
+from src.services.text_extraction import ExtractionLimitError, ExtractionLimits, parse_backend_preferences
+from src.services.cv_generator import CVGenerator, GENERATOR_VERSION
+from src.services.cv_templates import DEFAULT_TEMPLATE, list_templates
 
 cv_bp = Blueprint('cv', __name__)
 
-# Initialize services
-job_analyzer = JobAnalyzer()
+# Analysis cache configuration (set ANALYSIS_CACHE_DB to an empty string to disable the shared tier)
+ANALYSIS_CACHE_SIZE = int(os.environ.get('ANALYSIS_CACHE_SIZE', 1024))
+ANALYSIS_CACHE_TTL = float(os.environ.get('ANALYSIS_CACHE_TTL', 86400))
+ANALYSIS_CACHE_DB = os.environ.get(
+    'ANALYSIS_CACHE_DB', os.path.join(tempfile.gettempdir(), 'cv_analysis_cache.sqlite3')
+)
+
+# Tokenizer mode: 'nltk' (default) or 'fast' for the NLTK-free regex tokenizer
+ANALYZER_TOKENIZER = os.environ.get('ANALYZER_TOKENIZER', 'nltk')
+
+# Optional corpus IDF table (built with scripts/build_idf_table.py) for TF-IDF keyword ranking
+IDF_TABLE_PATH = os.environ.get('IDF_TABLE_PATH') or None
+
+# Batch analysis configuration
+ANALYSIS_WORKERS = int(os.environ.get('ANALYSIS_WORKERS', os.cpu_count() or 1))
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 5000))
+
+# Upload text extraction limits
+EXTRACTION_LIMITS = ExtractionLimits(
+    max_bytes=int(os.environ.get('EXTRACTION_MAX_BYTES', 16 * 1024 * 1024)),
+    max_pages=int(os.environ.get('EXTRACTION_MAX_PAGES', 50)),
+    max_chars=int(os.environ.get('EXTRACTION_MAX_CHARS', 100000))
+)
+
+# Extractor backend order per format, e.g. "pdf=pypdf2,pdfminer;docx=docx-stream"
+EXTRACTOR_BACKENDS = parse_backend_preferences(os.environ.get('EXTRACTOR_BACKENDS', ''))
+
+# Extracted text cache (set EXTRACTION_CACHE_DIR to an empty string to disable)
+EXTRACTION_CACHE_DIR = os.environ.get(
+    'EXTRACTION_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cv_extraction_cache')
+)
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Incremental analysis sessions
+ANALYSIS_SESSION_TTL = float(os.environ.get('ANALYSIS_SESSION_TTL', 1800))
+MAX_ANALYSIS_SESSIONS = int(os.environ.get('MAX_ANALYSIS_SESSIONS', 1000))
+
+# Rendered CV cache (set RENDER_CACHE_DIR to an empty string to disable)
+RENDER_CACHE_DIR = os.environ.get(
+    'RENDER_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cv_render_cache')
+)
+RENDER_CACHE_MAX_BYTES = int(os.environ.get('RENDER_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Generated CVs kept for /download-cv: backend ('local' or 'sqlite'), lifetime, quota and sweep interval
+CV_STORAGE_BACKEND = os.environ.get('CV_STORAGE_BACKEND', 'local')
+CV_STORAGE_DIR = os.environ.get('CV_STORAGE_DIR', os.path.join(tempfile.gettempdir(), 'generated_cvs'))
+CV_STORAGE_DB = os.environ.get('CV_STORAGE_DB', os.path.join(tempfile.gettempdir(), 'generated_cvs.sqlite3'))
+CV_STORAGE_TTL = float(os.environ.get('CV_STORAGE_TTL', 86400))
+CV_STORAGE_MAX_BYTES = int(os.environ.get('CV_STORAGE_MAX_BYTES', 1024 * 1024 * 1024))
+CV_STORAGE_SWEEP_INTERVAL = float(os.environ.get('CV_STORAGE_SWEEP_INTERVAL', 300))
+
+# CV rendering workers (0 renders on the request thread), queue bound and per-render timeout
+RENDER_WORKERS = int(os.environ.get('RENDER_WORKERS', os.cpu_count() or 1))
+RENDER_QUEUE_SIZE = int(os.environ.get('RENDER_QUEUE_SIZE', 16))
+RENDER_TIMEOUT = float(os.environ.get('RENDER_TIMEOUT', 30))
+
+# Asynchronous CV jobs (set CV_JOB_DB to an empty string to disable)
+CV_JOB_DB = os.environ.get('CV_JOB_DB', os.path.join(tempfile.gettempdir(), 'cv_jobs.sqlite3'))
+CV_JOB_WORKERS = int(os.environ.get('CV_JOB_WORKERS', 2))
+CV_JOB_RESULT_TTL = float(os.environ.get('CV_JOB_RESULT_TTL', 86400))
+
+# Whether CVs are rendered as compact PDFs when a request does not say
+COMPACT_PDF_DEFAULT = os.environ.get('COMPACT_PDF_DEFAULT', '').lower() in ('1', 'true', 'yes')
+
+# Page counts a CV can be fitted to with "fit_pages"
+FIT_PAGE_TARGETS = (1, 2)
+
+# Bulk CV generation: jobs per request and jobs sent to a render worker at a time
+MAX_BULK_CVS = int(os.environ.get('MAX_BULK_CVS', 50))
+BULK_RENDER_CHUNK = int(os.environ.get('BULK_RENDER_CHUNK', 4))
+
+# Bulk candidate matching limits
+MAX_MATCH_PROFILES = int(os.environ.get('MAX_MATCH_PROFILES', 5000))
+MAX_MATCH_JOBS = int(os.environ.get('MAX_MATCH_JOBS', 1000))
+
+# Initialize services; the on-disk caches, CV storage and job queue are opened by
+# init_services() from app setup, so importing this module creates no files and
+# starts no threads
+analysis_cache = AnalysisCache(
+    max_entries=ANALYSIS_CACHE_SIZE,
+    ttl_seconds=ANALYSIS_CACHE_TTL
+)
+job_analyzer = JobAnalyzer(
+    cache=analysis_cache,
+    max_workers=ANALYSIS_WORKERS,
+    tokenizer=ANALYZER_TOKENIZER,
+    extraction_limits=EXTRACTION_LIMITS,
+    extractor_backends=EXTRACTOR_BACKENDS,
+    idf_table_path=IDF_TABLE_PATH
+)
+analysis_sessions = AnalysisSessionStore(
+    job_analyzer,
+    max_sessions=MAX_ANALYSIS_SESSIONS,
+    ttl_seconds=ANALYSIS_SESSION_TTL
+)
+render_pool = RenderPool(
+    max_workers=RENDER_WORKERS,
+    max_queue=RENDER_QUEUE_SIZE,
+    timeout_seconds=RENDER_TIMEOUT
+)
+if CV_STORAGE_BACKEND not in STORAGE_BACKENDS:
+    raise ValueError(f"Unknown CV_STORAGE_BACKEND '{CV_STORAGE_BACKEND}'. Available: {', '.join(STORAGE_BACKENDS)}")
+text_cache = None
+render_cache = None
+cv_storage = None
+cv_jobs = None
 cv_generator = CVGenerator()
 
 # Allowed file extensions for job descriptions
@@ -18,11 +139,180 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+class UploadRequest(Request):
+    """Request that hashes file uploads while spooling them, so the text cache never rereads them.
+
+    Install with app.request_class = UploadRequest.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return DigestingSpool()
+
+def wants_stream(data) -> bool:
+    """Check the body flag and query string for the direct PDF response mode"""
+    if data.get('stream') is True:
+        return True
+    return request.args.get('stream', '').lower() in ('1', 'true', 'yes')
+
+def bulk_cv_filename(index, job_analysis):
+    """Archive entry name for a bulk CV: input position plus a slug of the job title"""
+    job_info = job_analysis.get('job_info') or {}
+    title = job_info.get('job_title') or job_analysis.get('job_title') or 'job'
+    slug = re.sub(r'[^a-z0-9]+', '_', str(title).lower()).strip('_')[:40] or 'job'
+    return f"{index + 1:02d}_{slug}.pdf"
+
+def valid_template(template_id) -> bool:
+    return any(template['id'] == template_id for template in list_templates())
+
+def wants_async(data) -> bool:
+    """Check the body flag and query string for queued (202) generation"""
+    if data.get('async') is True:
+        return True
+    return request.args.get('async', '').lower() in ('1', 'true', 'yes')
+
+def wants_compact(data) -> bool:
+    """Check the body flag, then the query string, for compact PDF output"""
+    if isinstance(data.get('compact'), bool):
+        return data['compact']
+    flag = request.args.get('compact', '').lower()
+    if flag:
+        return flag in ('1', 'true', 'yes')
+    return COMPACT_PDF_DEFAULT
+
+def valid_fit_pages(fit_pages) -> bool:
+    return fit_pages is None or (type(fit_pages) is int and fit_pages in FIT_PAGE_TARGETS)
+
+def render_cached_cv(user_data, job_analysis, template_id, compact=False, fit_pages=None):
+    """Return (cv_id, PDF bytes, cached) for a CV, rendering only on a cache miss.
+    
+    The cache key is the CV id, so identical requests share one PDF.
+    """
+    key = RenderedCVCache.make_key(user_data, job_analysis, template_id, GENERATOR_VERSION, compact, fit_pages)
+    pdf_bytes = render_cache.read(key)
+    if pdf_bytes is not None:
+        return key, pdf_bytes, True
+    
+    started = time.perf_counter()
+    pdf_bytes = render_pool.render(user_data, job_analysis, template_id, compact, fit_pages)
+    render_cache.set(key, pdf_bytes, render_seconds=time.perf_counter() - started)
+    return key, pdf_bytes, False
+
+def save_cv(user_data, job_analysis, template_id, compact=False, fit_pages=None):
+    """Render a CV to storage for /download-cv and report what it cost.
+    
+    Cached or not, every CV is written through cv_storage, so its TTL and
+    quota apply to all of them. Returns cv_id, cached (served from the
+    render cache), size_bytes and render_ms, the time taken to produce the
+    PDF including any cache lookup.
+    """
+    started = time.perf_counter()
+    if render_cache is not None:
+        cv_id, pdf_bytes, cached = render_cached_cv(user_data, job_analysis, template_id, compact, fit_pages)
+    else:
+        cv_id, cached = str(uuid.uuid4()), False
+        pdf_bytes = render_pool.render(user_data, job_analysis, template_id, compact, fit_pages)
+    
+    report = cv_report(cv_id, cached, len(pdf_bytes), started)
+    cv_storage.put(cv_id, pdf_bytes)
+    return report
+
+def cv_report(cv_id, cached, size, started):
+    return {
+        'cv_id': cv_id,
+        'cached': cached,
+        'size_bytes': size,
+        'render_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+
+def run_cv_job(payload):
+    """Generate the CV for a queued job"""
+    return save_cv(
+        payload['user_data'], payload.get('job_analysis'), payload['template'], payload.get('compact', False),
+        payload.get('fit_pages')
+    )
+
+def find_cv(cv_id):
+    """Return the StoredCV for a CV id, or None"""
+    return cv_storage.get(cv_id)
+
+def send_stored_cv(stored, downloadable=True):
+    """Send a stored CV with a strong ETag, answering If-None-Match with 304 and Range with 206.
+    
+    HTTP errors such as 416 for a range past the end are returned as
+    responses, so the callers' catch-all error handlers never turn them into 500s.
+    The X-CV-Id header is only sent for CVs in cv_storage (downloadable), whose
+    id works with /download-cv.
+    """
+    try:
+        response = send_file(
+            stored.source(),
+            as_attachment=True,
+            download_name=f"optimized_cv_{stored.cv_id}.pdf",
+            mimetype='application/pdf',
+            conditional=True,
+            etag=stored.etag,
+            last_modified=stored.created_at
+        )
+    except HTTPException as e:
+        return e.get_response()
+    if is_content_addressed(stored.cv_id):
+        # The id is a hash of the CV's inputs, so its bytes never change
+        response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+    else:
+        response.headers['Cache-Control'] = 'private, no-cache'
+    if downloadable:
+        response.headers['X-CV-Id'] = stored.cv_id
+    return response
+
+def init_services():
+    """Open the on-disk caches, CV storage and job queue and start their background threads.
+
+    Called once from app setup in src/main.py. Queued jobs render on the
+    job queue's threads through the same pool and cache as requests.
+    """
+    global analysis_cache, text_cache, render_cache, cv_storage, cv_jobs
+    if ANALYSIS_CACHE_DB:
+        analysis_cache = AnalysisCache(
+            max_entries=ANALYSIS_CACHE_SIZE,
+            ttl_seconds=ANALYSIS_CACHE_TTL,
+            db_path=ANALYSIS_CACHE_DB
+        )
+        job_analyzer.cache = analysis_cache
+    text_cache = ExtractedTextCache(
+        EXTRACTION_CACHE_DIR,
+        max_bytes=EXTRACTION_CACHE_MAX_BYTES
+    ) if EXTRACTION_CACHE_DIR else None
+    job_analyzer.text_extractor.cache = text_cache
+    render_cache = RenderedCVCache(
+        RENDER_CACHE_DIR,
+        max_bytes=RENDER_CACHE_MAX_BYTES
+    ) if RENDER_CACHE_DIR else None
+
+    cv_storage = STORAGE_BACKENDS[CV_STORAGE_BACKEND](
+        CV_STORAGE_DB if CV_STORAGE_BACKEND == 'sqlite' else CV_STORAGE_DIR,
+        ttl_seconds=CV_STORAGE_TTL,
+        max_bytes=CV_STORAGE_MAX_BYTES,
+        sweep_interval=CV_STORAGE_SWEEP_INTERVAL
+    )
+    cv_storage.start()
+
+    cv_jobs = CVJobQueue(
+        CV_JOB_DB,
+        run_cv_job,
+        worker_threads=CV_JOB_WORKERS,
+        lease_seconds=RENDER_TIMEOUT + 60,
+        result_ttl_seconds=CV_JOB_RESULT_TTL,
+        retry_on=(RenderPoolBusy,)
+    ) if CV_JOB_DB else None
+    if cv_jobs is not None:
+        cv_jobs.start()
+
 @cv_bp.route('/analyze-job', methods=['POST'])
 def analyze_job_description():
     """Analyze job description and extract keywords/requirements"""
     try:
         job_text = ""
+        extraction = None
         
         # Check if job description is provided as JSON
         if request.is_json:
@@ -39,8 +329,11 @@ def analyze_job_description():
             file = request.files['job_file']
             if file and file.filename != '' and allowed_file(file.filename):
                 filename = secure_filename(file.filename)
-                file_content = file.read()
-                job_text = job_analyzer.extract_text_from_file(file_content, filename)
+                try:
+                    extraction = job_analyzer.extract_text_from_stream(file.stream, filename)
+                except ExtractionLimitError as e:
+                    return jsonify({'error': str(e), 'limit_hit': e.limit}), 413
+                job_text = extraction.text
             else:
                 return jsonify({'error': 'Invalid file type. Please upload txt, pdf, doc, or docx files.'}), 400
         
@@ -53,17 +346,242 @@ def analyze_job_description():
         # Analyze job description
         analysis_result = job_analyzer.analyze_job_description(job_text)
         
-        return jsonify({
+        response = {
             'success': True,
             'analysis': analysis_result
+        }
+        if extraction is not None:
+            response['extraction'] = extraction.to_dict()
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
+
+@cv_bp.route('/analyze-jobs-batch', methods=['POST'])
+def analyze_jobs_batch():
+    """Analyze many job descriptions in one request.
+    
+    Accepts JSON {"job_texts": [...]} or multipart form data with repeated
+    job_texts fields and/or job_files uploads (texts first, then files).
+    Results are returned in input order with per-item errors.
+    """
+    try:
+        items = []
+        
+        if request.is_json:
+            data = request.get_json()
+            job_texts = data.get('job_texts') if isinstance(data, dict) else None
+            if not isinstance(job_texts, list):
+                return jsonify({'error': 'job_texts must be a list of job descriptions.'}), 400
+            items = [{'text': text} for text in job_texts]
+        else:
+            job_texts = request.form.getlist('job_texts')
+            job_files = request.files.getlist('job_files')
+            # Reject oversized batches before paying for any PDF or DOCX parsing
+            if len(job_texts) + len(job_files) > MAX_BATCH_SIZE:
+                return jsonify({'error': f'Too many job descriptions. Maximum batch size is {MAX_BATCH_SIZE}.'}), 413
+            items = [{'text': text} for text in job_texts]
+            for file in job_files:
+                if not file or file.filename == '' or not allowed_file(file.filename):
+                    items.append({'error': 'Invalid file type. Please upload txt, pdf, doc, or docx files.'})
+                    continue
+                try:
+                    filename = secure_filename(file.filename)
+                    items.append({'text': job_analyzer.extract_text_from_stream(file.stream, filename).text})
+                except ValueError as e:
+                    items.append({'error': str(e)})
+        
+        if not items:
+            return jsonify({'error': 'No job descriptions provided. Please provide job_texts or job_files.'}), 400
+        
+        if len(items) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Too many job descriptions. Maximum batch size is {MAX_BATCH_SIZE}.'}), 413
+        
+        # Only analyze items whose text was read successfully
+        analyzable = [index for index, item in enumerate(items) if 'error' not in item]
+        analyses = job_analyzer.analyze_job_descriptions([items[index]['text'] for index in analyzable])
+        
+        results = [{'success': False, 'error': item.get('error')} for item in items]
+        for index, outcome in zip(analyzable, analyses):
+            results[index] = outcome
+        
+        for index, result in enumerate(results):
+            result['index'] = index
+        
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'failed': sum(1 for result in results if not result['success']),
+            'results': results
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Batch analysis failed: {str(e)}'}), 500
+
+@cv_bp.route('/analysis-sessions', methods=['POST'])
+def create_analysis_session():
+    """Start an incremental analysis session for a job description being edited"""
+    try:
+        data = request.get_json(silent=True) or {}
+        job_text = data.get('job_text', '')
+        
+        if not isinstance(job_text, str) or not job_text.strip():
+            return jsonify({'error': 'Job description is empty.'}), 400
+        
+        session = analysis_sessions.create(job_text)
+        with session.lock:
+            analysis = session.analysis()
+            paragraph_count = len(session.paragraphs)
+        
+        return jsonify({
+            'success': True,
+            'session_id': session.session_id,
+            'paragraph_count': paragraph_count,
+            'analysis': analysis
+        }), 201
+        
+    except Exception as e:
+        return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
+
+@cv_bp.route('/analysis-sessions/<session_id>', methods=['PATCH'])
+def update_analysis_session(session_id):
+    """Apply paragraph edits to an analysis session and return the updated analysis.
+    
+    Body: {"edits": [{"start": 2, "delete": 1, "insert": ["new paragraph text"]}]}
+    where paragraphs are the lines of the job description. Lines are
+    tokenized separately, so the result matches /analyze-job on the same
+    text unless a sentence runs on across a line break.
+    """
+    try:
+        session = analysis_sessions.get(session_id)
+        if session is None:
+            return jsonify({'error': 'Analysis session not found or expired'}), 404
+        
+        data = request.get_json(silent=True) or {}
+        edits = data.get('edits')
+        if not isinstance(edits, list):
+            return jsonify({'error': 'edits must be a list of paragraph edits'}), 400
+        
+        with session.lock:
+            try:
+                session.apply_edits(edits)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            analysis = session.analysis()
+            paragraph_count = len(session.paragraphs)
+        
+        return jsonify({
+            'success': True,
+            'session_id': session_id,
+            'paragraph_count': paragraph_count,
+            'analysis': analysis
         })
         
     except Exception as e:
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
+@cv_bp.route('/analysis-sessions/<session_id>', methods=['DELETE'])
+def delete_analysis_session(session_id):
+    """End an analysis session"""
+    if not analysis_sessions.delete(session_id):
+        return jsonify({'error': 'Analysis session not found or expired'}), 404
+    return '', 204
+
+@cv_bp.route('/analysis-cache/stats', methods=['GET'])
+def get_analysis_cache_stats():
+    """Get job analysis cache hit/miss/eviction counters"""
+    try:
+        return jsonify({
+            'success': True,
+            'stats': analysis_cache.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get cache stats: {str(e)}'}), 500
+
+@cv_bp.route('/render-cache/stats', methods=['GET'])
+def get_render_cache_stats():
+    """Get rendered CV cache hit rate, disk usage and estimated render time saved"""
+    try:
+        if render_cache is None:
+            return jsonify({'error': 'Render cache is disabled'}), 404
+        
+        return jsonify({
+            'success': True,
+            'stats': render_cache.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get cache stats: {str(e)}'}), 500
+
+@cv_bp.route('/cv-storage/stats', methods=['GET'])
+def get_cv_storage_stats():
+    """Get generated CV storage usage, quota, expiry and sweep metrics"""
+    try:
+        return jsonify({
+            'success': True,
+            'stats': cv_storage.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get storage stats: {str(e)}'}), 500
+
+@cv_bp.route('/render-pool/stats', methods=['GET'])
+def get_render_pool_stats():
+    """Get CV render worker queue depth, rejections, timeouts and render times"""
+    try:
+        return jsonify({
+            'success': True,
+            'stats': render_pool.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get render pool stats: {str(e)}'}), 500
+
+@cv_bp.route('/extraction-cache/stats', methods=['GET'])
+def get_extraction_cache_stats():
+    """Get extracted text cache hit/miss/eviction counters and disk usage"""
+    try:
+        if text_cache is None:
+            return jsonify({'error': 'Extraction cache is disabled'}), 404
+        
+        return jsonify({
+            'success': True,
+            'stats': text_cache.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get cache stats: {str(e)}'}), 500
+
+@cv_bp.route('/extraction-cache/purge', methods=['POST'])
+def purge_extraction_cache():
+    """Delete every cached text extraction"""
+    try:
+        if text_cache is None:
+            return jsonify({'error': 'Extraction cache is disabled'}), 404
+        
+        removed = text_cache.purge()
+        return jsonify({
+            'success': True,
+            'removed': removed
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to purge cache: {str(e)}'}), 500
+
 @cv_bp.route('/generate-cv', methods=['POST'])
 def generate_cv():
-    """Generate ATS-optimized CV based on user data and job analysis"""
+    """Generate ATS-optimized CV based on user data and job analysis.
+    
+    By default the PDF is saved for /download-cv and its id returned. With
+    "stream": true in the body (or ?stream=true) the PDF is rendered in
+    memory and returned directly; it is not stored, so the response carries
+    no X-CV-Id for /download-cv (its ETag still identifies the PDF). With
+    "async": true (or ?async=true) the render is queued and 202 returned
+    with a job id to poll at /cv-jobs/<job_id>. "fit_pages": 1 or 2 shrinks
+    the layout, and if need be trims older bullets, to fit that many pages.
+    """
     try:
         data = request.get_json()
         
@@ -77,39 +595,324 @@ def generate_cv():
         if not user_data.get('personal_info', {}).get('full_name'):
             return jsonify({'error': 'Full name is required'}), 400
         
-        # Generate CV
-        cv_filepath = cv_generator.generate_cv(user_data, job_analysis)
+        template_id = data.get('template', DEFAULT_TEMPLATE)
+        if not valid_template(template_id):
+            return jsonify({'error': f'Unknown template: {template_id}'}), 400
+        compact = wants_compact(data)
+        fit_pages = data.get('fit_pages')
+        if not valid_fit_pages(fit_pages):
+            return jsonify({'error': f"fit_pages must be one of: {', '.join(map(str, FIT_PAGE_TARGETS))}"}), 400
+        
+        if wants_async(data):
+            if cv_jobs is None:
+                return jsonify({'error': 'Asynchronous generation is disabled'}), 400
+            job_id = cv_jobs.submit({
+                'user_data': user_data,
+                'job_analysis': job_analysis,
+                'template': template_id,
+                'compact': compact,
+                'fit_pages': fit_pages
+            })
+            response = jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status': 'queued',
+                'status_url': f'/api/cv-jobs/{job_id}',
+                'result_url': f'/api/cv-jobs/{job_id}/result'
+            })
+            response.headers['Location'] = f'/api/cv-jobs/{job_id}'
+            return response, 202
+        
+        if wants_stream(data):
+            started = time.perf_counter()
+            cached = False
+            if render_cache is not None:
+                cv_id, pdf_bytes, cached = render_cached_cv(
+                    user_data, job_analysis, template_id, compact, fit_pages
+                )
+            else:
+                cv_id = str(uuid.uuid4())
+                pdf_bytes = render_pool.render(user_data, job_analysis, template_id, compact, fit_pages)
+            
+            response = send_stored_cv(StoredCV(
+                cv_id, len(pdf_bytes), content_etag(cv_id, pdf_bytes), None, data=pdf_bytes
+            ), downloadable=False)
+            if render_cache is not None:
+                response.headers['X-CV-Cache'] = 'hit' if cached else 'miss'
+            response.headers['X-CV-Render-Ms'] = str(cv_report(cv_id, cached, len(pdf_bytes), started)['render_ms'])
+            return response
+        
+        # Generate CV and save it for download
+        report = save_cv(user_data, job_analysis, template_id, compact, fit_pages)
+        
+        result = {
+            'success': True,
+            'cv_id': report['cv_id'],
+            'message': 'CV generated successfully',
+            'compact': compact,
+            'fit_pages': fit_pages,
+            'size_bytes': report['size_bytes'],
+            'render_ms': report['render_ms']
+        }
+        if render_cache is not None:
+            result['cached'] = report['cached']
+        return jsonify(result)
+        
+    except RenderPoolBusy as e:
+        response = jsonify({'error': 'CV rendering is busy. Please retry shortly.', 'retry_after': e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+    except RenderTimeoutError as e:
+        return jsonify({'error': f'Failed to generate CV: {str(e)}'}), 504
+    except Exception as e:
+        return jsonify({'error': f'Failed to generate CV: {str(e)}'}), 500
+
+# Preview renderers by the "format" a request asks for
+PREVIEW_RENDERERS = {'text': render_text, 'html': render_html}
+
+@cv_bp.route('/preview-cv', methods=['POST'])
+def preview_cv():
+    """Return the optimized CV text an ATS will read, without building a PDF.
+    
+    Accepts the same user_data, job_analysis and template as /generate-cv,
+    plus "format": "text" (default) or "html". The content is identical to
+    the generated PDF's, after summary, experience and skill optimization.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Request must be JSON'}), 400
+        
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        user_data = data.get('user_data', {})
+        job_analysis = data.get('job_analysis')
+        template_id = data.get('template', DEFAULT_TEMPLATE)
+        preview_format = data.get('format', 'text')
+        
+        if not isinstance(user_data, dict):
+            return jsonify({'error': 'user_data must be an object'}), 400
+        if not valid_template(template_id):
+            return jsonify({'error': f'Unknown template: {template_id}'}), 400
+        if preview_format not in PREVIEW_RENDERERS:
+            return jsonify({'error': f"format must be one of: {', '.join(PREVIEW_RENDERERS)}"}), 400
+        
+        document = cv_generator.build_document(user_data, job_analysis, template_id)
         
-        # Return CV file path and metadata
         return jsonify({
             'success': True,
-            'cv_id': os.path.basename(cv_filepath).replace('.pdf', '').replace('cv_', ''),
-            'message': 'CV generated successfully'
+            'template': template_id,
+            'format': preview_format,
+            'preview': PREVIEW_RENDERERS[preview_format](document)
         })
         
     except Exception as e:
-        return jsonify({'error': f'Failed to generate CV: {str(e)}'}), 500
+        return jsonify({'error': f'Failed to preview CV: {str(e)}'}), 500
+
+@cv_bp.route('/generate-cvs-bulk', methods=['POST'])
+def generate_cvs_bulk():
+    """Generate one profile's CV tailored to many jobs, streamed back as a ZIP archive.
+    
+    Accepts JSON {"user_data": {...}, "jobs": [...], "template": "professional"}
+    where each job is a job analysis or a raw job description. CVs are added
+    to the archive as they finish rendering; manifest.json, written last,
+    lists each job's file or error by input index.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Request must be JSON'}), 400
+        
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        user_data = data.get('user_data', {})
+        jobs = data.get('jobs')
+        template_id = data.get('template', DEFAULT_TEMPLATE)
+        compact = wants_compact(data)
+        fit_pages = data.get('fit_pages')
+        
+        if not isinstance(user_data, dict) or not user_data.get('personal_info', {}).get('full_name'):
+            return jsonify({'error': 'Full name is required'}), 400
+        if not isinstance(jobs, list) or not jobs or not all(isinstance(job, (dict, str)) for job in jobs):
+            return jsonify({'error': 'jobs must be a non-empty list of job analyses or job descriptions.'}), 400
+        if not valid_template(template_id):
+            return jsonify({'error': f'Unknown template: {template_id}'}), 400
+        if not valid_fit_pages(fit_pages):
+            return jsonify({'error': f"fit_pages must be one of: {', '.join(map(str, FIT_PAGE_TARGETS))}"}), 400
+        if len(jobs) > MAX_BULK_CVS:
+            return jsonify({'error': f'Too many jobs. Maximum is {MAX_BULK_CVS} per request.'}), 413
+        
+        manifest = [{'index': index} for index in range(len(jobs))]
+        job_analyses = list(jobs)
+        
+        # Analyze raw job descriptions in one batch
+        text_indices = [index for index, job in enumerate(jobs) if isinstance(job, str)]
+        if text_indices:
+            outcomes = job_analyzer.analyze_job_descriptions([jobs[index] for index in text_indices])
+            for index, outcome in zip(text_indices, outcomes):
+                if outcome['success']:
+                    job_analyses[index] = outcome['analysis']
+                else:
+                    job_analyses[index] = None
+                    manifest[index]['error'] = outcome['error']
+        
+        for index, analysis in enumerate(job_analyses):
+            if analysis is not None:
+                manifest[index]['file'] = bulk_cv_filename(index, analysis)
+        
+        # Serve cached renders straight from disk and render the rest
+        cache_keys = {}
+        cached = {}
+        to_render = []
+        for index, analysis in enumerate(job_analyses):
+            if analysis is None:
+                continue
+            if render_cache is not None:
+                cache_keys[index] = RenderedCVCache.make_key(
+                    user_data, analysis, template_id, GENERATOR_VERSION, compact, fit_pages
+                )
+                path = render_cache.get(cache_keys[index])
+                if path:
+                    cached[index] = path
+                    continue
+            to_render.append(index)
+        
+        rendered = render_pool.render_many(
+            user_data,
+            [job_analyses[index] for index in to_render],
+            template_id=template_id,
+            chunk_size=BULK_RENDER_CHUNK,
+            compact=compact,
+            fit_pages=fit_pages
+        ) if to_render else None
+        
+        def entries():
+            for index, path in cached.items():
+                try:
+                    with open(path, 'rb') as cv_file:
+                        pdf_bytes = cv_file.read()
+                except OSError as e:
+                    manifest[index].pop('file')
+                    manifest[index]['error'] = f'Cached CV could not be read: {str(e)}'
+                    continue
+                manifest[index]['cached'] = True
+                manifest[index]['size_bytes'] = len(pdf_bytes)
+                yield manifest[index]['file'], pdf_bytes
+            
+            for position, pdf_bytes, error in rendered or ():
+                index = to_render[position]
+                if error:
+                    manifest[index].pop('file')
+                    manifest[index]['error'] = error
+                    continue
+                if render_cache is not None:
+                    render_cache.set(cache_keys[index], pdf_bytes)
+                manifest[index]['size_bytes'] = len(pdf_bytes)
+                yield manifest[index]['file'], pdf_bytes
+            
+            yield 'manifest.json', json.dumps({
+                'template': template_id, 'compact': compact, 'fit_pages': fit_pages, 'jobs': manifest
+            }, indent=2).encode('utf-8')
+        
+        response = Response(
+            stream_with_context(stream_zip(entries())),
+            mimetype='application/zip',
+            headers={'Content-Disposition': 'attachment; filename="tailored_cvs.zip"'}
+        )
+        if rendered is not None:
+            # Frees the render queue slots even if the client leaves before the archive starts
+            response.call_on_close(rendered.close)
+        return response
+        
+    except RenderPoolBusy as e:
+        response = jsonify({'error': 'CV rendering is busy. Please retry shortly.', 'retry_after': e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 503
+    except Exception as e:
+        return jsonify({'error': f'Failed to generate CVs: {str(e)}'}), 500
 
 @cv_bp.route('/download-cv/<cv_id>', methods=['GET'])
 def download_cv(cv_id):
     """Download generated CV"""
     try:
-        cv_filename = f"cv_{cv_id}.pdf"
-        cv_filepath = os.path.join('/tmp', cv_filename)
+        stored = find_cv(cv_id)
         
-        if not os.path.exists(cv_filepath):
+        if not stored:
             return jsonify({'error': 'CV not found'}), 404
         
-        return send_file(
-            cv_filepath,
-            as_attachment=True,
-            download_name=f"optimized_cv_{cv_id}.pdf",
-            mimetype='application/pdf'
-        )
+        return send_stored_cv(stored)
         
     except Exception as e:
         return jsonify({'error': f'Failed to download CV: {str(e)}'}), 500
 
+@cv_bp.route('/cv-jobs/<job_id>', methods=['GET'])
+def get_cv_job(job_id):
+    """Get the status of a queued CV generation job"""
+    try:
+        if cv_jobs is None:
+            return jsonify({'error': 'Asynchronous generation is disabled'}), 404
+        
+        job = cv_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if job['status'] == 'succeeded':
+            job['result_url'] = f'/api/cv-jobs/{job_id}/result'
+        
+        return jsonify({
+            'success': True,
+            'job': job
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get job status: {str(e)}'}), 500
+
+@cv_bp.route('/cv-jobs/<job_id>/result', methods=['GET'])
+def get_cv_job_result(job_id):
+    """Download the CV produced by a finished job (202 while it is still pending)"""
+    try:
+        if cv_jobs is None:
+            return jsonify({'error': 'Asynchronous generation is disabled'}), 404
+        
+        job = cv_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if job['status'] in ('queued', 'running'):
+            response = jsonify({'success': True, 'job': job})
+            response.headers['Retry-After'] = '1'
+            return response, 202
+        
+        if job['status'] == 'failed':
+            return jsonify({'error': f"CV generation failed: {job.get('error')}", 'job': job}), 409
+        
+        cv_id = job['result']['cv_id']
+        stored = find_cv(cv_id)
+        if not stored:
+            return jsonify({'error': 'CV is no longer available'}), 410
+        
+        return send_stored_cv(stored)
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get job result: {str(e)}'}), 500
+
+@cv_bp.route('/cv-jobs/stats', methods=['GET'])
+def get_cv_job_stats():
+    """Get queued, running and finished CV job counts"""
+    try:
+        if cv_jobs is None:
+            return jsonify({'error': 'Asynchronous generation is disabled'}), 404
+        
+        return jsonify({
+            'success': True,
+            'stats': cv_jobs.stats()
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Failed to get job stats: {str(e)}'}), 500
+
 @cv_bp.route('/templates', methods=['GET'])
 def get_cv_templates():
     """Get available CV templates"""
@@ -207,3 +1010,74 @@ def validate_ats_compatibility():
     except Exception as e:
         return jsonify({'error': f'Validation failed: {str(e)}'}), 500
 
+@cv_bp.route('/match-matrix', methods=['POST'])
+def match_matrix():
+    """Rank many candidate profiles against many jobs by ATS score.
+    
+    Accepts JSON {"profiles": [user_data, ...], "jobs": [...], "top_k": 10,
+    "by": "job" | "candidate" | "both"}. Each job is either a job analysis
+    (as returned by /analyze-job) or a raw job description string, which is
+    analyzed first. Matches reference profiles and jobs by input index.
+    """
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Request must be JSON'}), 400
+        
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        profiles = data.get('profiles')
+        jobs = data.get('jobs')
+        top_k = data.get('top_k', 10)
+        by = data.get('by', 'job')
+        
+        if not isinstance(profiles, list) or not all(isinstance(profile, dict) for profile in profiles):
+            return jsonify({'error': 'profiles must be a list of user data objects.'}), 400
+        if not isinstance(jobs, list) or not all(isinstance(job, (dict, str)) for job in jobs):
+            return jsonify({'error': 'jobs must be a list of job analyses or job descriptions.'}), 400
+        if not profiles or not jobs:
+            return jsonify({'error': 'At least one profile and one job are required.'}), 400
+        if not isinstance(top_k, int) or top_k < 1:
+            return jsonify({'error': 'top_k must be a positive integer.'}), 400
+        if by not in ('job', 'candidate', 'both'):
+            return jsonify({'error': "by must be 'job', 'candidate' or 'both'."}), 400
+        
+        if len(profiles) > MAX_MATCH_PROFILES or len(jobs) > MAX_MATCH_JOBS:
+            return jsonify({
+                'error': f'Too many inputs. Maximum is {MAX_MATCH_PROFILES} profiles and {MAX_MATCH_JOBS} jobs.'
+            }), 413
+        
+        # Analyze raw job descriptions in one batch
+        text_indices = [index for index, job in enumerate(jobs) if isinstance(job, str)]
+        job_analyses = list(jobs)
+        if text_indices:
+            outcomes = job_analyzer.analyze_job_descriptions([jobs[index] for index in text_indices])
+            for index, outcome in zip(text_indices, outcomes):
+                if not outcome['success']:
+                    return jsonify({'error': f'Job {index} could not be analyzed: {outcome["error"]}'}), 400
+                job_analyses[index] = outcome['analysis']
+        
+        matrix = MatchMatrix(profiles, job_analyses)
+        response = {
+            'success': True,
+            'profiles': len(profiles),
+            'jobs': len(jobs),
+            'vocabulary_size': len(matrix.vocabulary)
+        }
+        
+        if by in ('job', 'both'):
+            response['by_job'] = [
+                {'job': job, 'matches': [{'profile': index, 'score': score} for index, score in matches]}
+                for job, matches in enumerate(matrix.top_k(top_k, by='job'))
+            ]
+        if by in ('candidate', 'both'):
+            response['by_candidate'] = [
+                {'profile': profile, 'matches': [{'job': index, 'score': score} for index, score in matches]}
+                for profile, matches in enumerate(matrix.top_k(top_k, by='candidate'))
+            ]
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({'error': f'Matching failed: {str(e)}'}), 500
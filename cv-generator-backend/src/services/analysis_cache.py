@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class AnalysisCache:
+    """Two-tier cache of job analyses: a bounded in-process LRU backed by a shared SQLite file"""
+
+    # Prune the shared tier every N writes rather than on every insert
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400,
+                 db_path: Optional[str] = None, max_shared_entries: int = 50000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.max_shared_entries = max_shared_entries
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self._counters = {
+            'memory_hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'shared_errors': 0,
+        }
+
+        if self.db_path:
+            self._init_shared_tier()
+
+    @staticmethod
+    def make_key(normalized_text: str, version: str) -> str:
+        """Hash normalized job text together with the analyzer version"""
+        digest = hashlib.sha256()
+        digest.update(version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(normalized_text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached analysis, checking the local tier before the shared one"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return json.loads(payload)
+                del self._entries[key]
+                self._counters['expirations'] += 1
+
+        shared = self._shared_get(key, now)
+        if shared is not None:
+            payload, created_at = shared
+            with self._lock:
+                self._counters['shared_hits'] += 1
+                self._store_local(key, payload, created_at)
+            return json.loads(payload)
+
+        with self._lock:
+            self._counters['misses'] += 1
+        return None
+
+    def set(self, key: str, value: Dict):
+        """Store an analysis in both tiers"""
+        payload = json.dumps(value)
+        created_at = time.time()
+
+        with self._lock:
+            self._store_local(key, payload, created_at)
+
+        self._shared_set(key, payload, created_at)
+
+    def clear(self):
+        """Drop every cached analysis from both tiers"""
+        with self._lock:
+            self._entries.clear()
+
+        if self.db_path:
+            try:
+                connection = self._connection()
+                with connection:
+                    connection.execute('DELETE FROM analysis_cache')
+            except sqlite3.Error:
+                self._count_shared_error()
+
+    def stats(self) -> Dict:
+        """Return hit/miss/eviction counters for sizing the cache"""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+
+        hits = counters['memory_hits'] + counters['shared_hits']
+        lookups = hits + counters['misses']
+
+        return {
+            **counters,
+            'hits': hits,
+            'lookups': lookups,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'shared_entries': self._shared_count(),
+            'shared_db_path': self.db_path,
+        }
+
+    def _store_local(self, key: str, payload: str, created_at: float):
+        """Insert into the LRU tier; caller must hold the lock"""
+        if self.max_entries <= 0:
+            return
+
+        self._entries[key] = (payload, created_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def _init_shared_tier(self):
+        """Create the SQLite table shared by all worker processes"""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS analysis_cache ('
+                    'key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)'
+                )
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS idx_analysis_cache_created ON analysis_cache (created_at)'
+                )
+        except sqlite3.Error:
+            # A broken shared tier should degrade to local-only caching
+            self._count_shared_error()
+            self.db_path = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the shared tier"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _shared_get(self, key: str, now: float) -> Optional[tuple]:
+        if not self.db_path:
+            return None
+
+        try:
+            connection = self._connection()
+            row = connection.execute(
+                'SELECT value, created_at FROM analysis_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                with connection:
+                    connection.execute('DELETE FROM analysis_cache WHERE key = ?', (key,))
+                with self._lock:
+                    self._counters['expirations'] += 1
+                return None
+            return row
+        except sqlite3.Error:
+            self._count_shared_error()
+            return None
+
+    def _shared_set(self, key: str, payload: str, created_at: float):
+        if not self.db_path:
+            return
+
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO analysis_cache (key, value, created_at) VALUES (?, ?, ?)',
+                    (key, payload, created_at)
+                )
+
+            with self._lock:
+                self._writes += 1
+                should_prune = self._writes % self.PRUNE_INTERVAL == 0
+            if should_prune:
+                self._prune_shared(connection, created_at)
+        except sqlite3.Error:
+            self._count_shared_error()
+
+    def _prune_shared(self, connection: sqlite3.Connection, now: float):
+        """Drop expired rows and keep the shared tier within its row budget"""
+        with connection:
+            expired = connection.execute(
+                'DELETE FROM analysis_cache WHERE created_at < ?', (now - self.ttl_seconds,)
+            ).rowcount
+            overflow = connection.execute(
+                'DELETE FROM analysis_cache WHERE key IN ('
+                'SELECT key FROM analysis_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_shared_entries,)
+            ).rowcount
+
+        with self._lock:
+            self._counters['expirations'] += max(expired, 0)
+            self._counters['evictions'] += max(overflow, 0)
+
+    def _shared_count(self) -> int:
+        if not self.db_path:
+            return 0
+
+        try:
+            return self._connection().execute('SELECT COUNT(*) FROM analysis_cache').fetchone()[0]
+        except sqlite3.Error:
+            self._count_shared_error()
+            return 0
+
+    def _count_shared_error(self):
+        with self._lock:
+            self._counters['shared_errors'] += 1
@@ -0,0 +1,222 @@
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+from sortedcontainers import SortedList
+
+
+# Gap between paragraph labels after relabelling, and the smallest gap an
+# insertion may split before every paragraph is relabelled
+_LABEL_SPACING = 1024.0
+_MIN_LABEL_GAP = 1e-6
+
+
+class AnalysisSession:
+    """Job analysis kept up to date paragraph by paragraph as the posting is edited.
+
+    A paragraph is one line of the posting, not a block between blank lines.
+    Each keeps its own keyword, term and pattern counts. An edit subtracts
+    the counts of the paragraphs it removes and adds those of the paragraphs
+    it inserts, so the work per update depends on the size of the edit
+    rather than the size of the document.
+
+    Each line is tokenized on its own, so a sentence that runs on past a
+    line break ("... python etc." then "and django") is treated as ending at
+    the break. Only then can keyword counts differ from a full analysis of
+    the same text, which tokenizes it whole.
+
+    Results list keys in order of first appearance. Paragraphs carry
+    increasing float labels that insertions split without renumbering, and
+    each key keeps a sorted list of its (label, offset) positions, so the
+    first appearance of any key is read off without rescanning paragraphs.
+    """
+
+    def __init__(self, analyzer, session_id: str, paragraphs: List[str]):
+        self.analyzer = analyzer
+        self.session_id = session_id
+        self.paragraphs: List[str] = []
+        self.fragments: List[Dict[str, Counter]] = []
+        self.labels: List[float] = []
+        self.totals: Dict[str, Counter] = {'keywords': Counter(), 'terms': Counter(), 'patterns': Counter()}
+        # field -> key -> sorted (paragraph label, offset in paragraph) of every paragraph containing the key
+        self.positions: Dict[str, Dict[Hashable, SortedList]] = {field: {} for field in self.totals}
+        self.lock = threading.Lock()
+        self.updated_at = time.time()
+
+        self.apply_edits([{'start': 0, 'delete': 0, 'insert': paragraphs}])
+
+    def apply_edits(self, edits: List[Dict]):
+        """Apply splice edits of the form {'start': i, 'delete': n, 'insert': [paragraphs]}.
+
+        Edits are applied in order, each against the result of the previous one.
+        All edits are validated before any is applied.
+        """
+        length = len(self.paragraphs)
+        for edit in edits:
+            if not isinstance(edit, dict):
+                raise ValueError("Each edit must be an object")
+            start = edit.get('start')
+            delete = edit.get('delete', 0)
+            inserted = edit.get('insert', [])
+
+            if not isinstance(start, int) or not 0 <= start <= length:
+                raise ValueError(f"Edit start must be between 0 and {length}")
+            if not isinstance(delete, int) or delete < 0 or start + delete > length:
+                raise ValueError("Edit deletes paragraphs past the end of the document")
+            if not isinstance(inserted, list) or not all(isinstance(text, str) for text in inserted):
+                raise ValueError("Edit insert must be a list of strings")
+            length += len(inserted) - delete
+
+        for edit in edits:
+            start = edit['start']
+            delete = edit.get('delete', 0)
+            inserted = edit.get('insert', [])
+
+            for fragment, label in zip(self.fragments[start:start + delete], self.labels[start:start + delete]):
+                self._subtract(fragment, label)
+
+            texts = [self.analyzer._normalize_text(text) for text in inserted]
+            fragments = [self.analyzer._extract_fragment(text) for text in texts]
+            labels = self._labels_between(start, start + delete, len(fragments))
+            if labels is None:
+                self._relabel()
+                labels = self._labels_between(start, start + delete, len(fragments))
+
+            self.paragraphs[start:start + delete] = texts
+            self.fragments[start:start + delete] = fragments
+            self.labels[start:start + delete] = labels
+            for fragment, label in zip(fragments, labels):
+                self._add(fragment, label)
+
+        self.updated_at = time.time()
+
+    def analysis(self) -> Dict:
+        """Build the analysis from the running totals"""
+        return self.analyzer._build_analysis(
+            self.fragments, self._leading_text(), totals=self.totals, order=self._order
+        )
+
+    def _order(self, keys, field: str) -> List:
+        """Sort keys of a field by first appearance"""
+        positions = self.positions[field]
+        return sorted(keys, key=lambda key: positions[key][0])
+
+    def _leading_text(self) -> str:
+        """Return just enough leading text for job title extraction, which reads the first lines.
+
+        Leading blank paragraphs are skipped, as normalizing the whole text strips them.
+        """
+        lines = []
+        for paragraph in self.paragraphs:
+            if not lines and not paragraph:
+                continue
+            lines.extend(paragraph.split('\n'))
+            if len(lines) >= 5:
+                break
+        return '\n'.join(lines)
+
+    def _labels_between(self, start: int, stop: int, count: int) -> Optional[List[float]]:
+        """Labels for count paragraphs replacing [start, stop), or None if the gap is too small"""
+        before = self.labels[start - 1] if start > 0 else None
+        after = self.labels[stop] if stop < len(self.labels) else None
+        if before is None and after is None:
+            return [index * _LABEL_SPACING for index in range(count)]
+        if after is None:
+            return [before + (index + 1) * _LABEL_SPACING for index in range(count)]
+        if before is None:
+            return [after - (count - index) * _LABEL_SPACING for index in range(count)]
+
+        step = (after - before) / (count + 1)
+        if step < _MIN_LABEL_GAP:
+            return None
+        return [before + (index + 1) * step for index in range(count)]
+
+    def _relabel(self):
+        """Space every paragraph's label evenly again and rebuild the key positions"""
+        self.labels = [index * _LABEL_SPACING for index in range(len(self.fragments))]
+        self.positions = {field: {} for field in self.totals}
+        for fragment, label in zip(self.fragments, self.labels):
+            self._add_positions(fragment, label)
+
+    def _add(self, fragment: Dict[str, Counter], label: float):
+        for field, counts in fragment.items():
+            self.totals[field].update(counts)
+        self._add_positions(fragment, label)
+
+    def _add_positions(self, fragment: Dict[str, Counter], label: float):
+        for field, counts in fragment.items():
+            positions = self.positions[field]
+            # Counters keep insertion order, so the offset orders keys within the paragraph
+            for offset, key in enumerate(counts):
+                if key not in positions:
+                    positions[key] = SortedList()
+                positions[key].add((label, offset))
+
+    def _subtract(self, fragment: Dict[str, Counter], label: float):
+        for field, counts in fragment.items():
+            totals = self.totals[field]
+            positions = self.positions[field]
+            for offset, (key, count) in enumerate(counts.items()):
+                remaining = totals[key] - count
+                if remaining > 0:
+                    totals[key] = remaining
+                else:
+                    del totals[key]
+
+                key_positions = positions[key]
+                key_positions.remove((label, offset))
+                if not key_positions:
+                    del positions[key]
+
+
+class AnalysisSessionStore:
+    """Bounded, expiring in-process store of incremental analysis sessions.
+
+    Sessions live in the memory of the worker that created them, so
+    deployments with several workers need sticky routing for session calls.
+    """
+
+    def __init__(self, analyzer, max_sessions: int = 1000, ttl_seconds: float = 1800):
+        self.analyzer = analyzer
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+
+        self._sessions: "OrderedDict[str, AnalysisSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, text: str) -> AnalysisSession:
+        """Start a session from a full job description, one paragraph per line"""
+        paragraphs = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        session = AnalysisSession(self.analyzer, uuid.uuid4().hex, paragraphs)
+
+        with self._lock:
+            self._expire()
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+        return session
+
+    def get(self, session_id: str) -> Optional[AnalysisSession]:
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.updated_at = time.time()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self):
+        """Drop sessions idle past the TTL; caller must hold the lock"""
+        cutoff = time.time() - self.ttl_seconds
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.updated_at >= cutoff:
+                break
+            del self._sessions[session_id]
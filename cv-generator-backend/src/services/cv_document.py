@@ -0,0 +1,33 @@
+from typing import Iterator, NamedTuple, Tuple
+
+# Block style for vertical space; every other style names a template paragraph style
+SPACER = 'Spacer'
+
+
+class Block(NamedTuple):
+    """One paragraph or gap of a CV, independent of the output format.
+
+    style is a template paragraph style (CVHeader, ContactInfo, SectionHeader,
+    JobTitle, Company, CVBodyText) or SPACER for a gap of space points. label
+    is an optional bold lead-in such as "Technical:". Body text keeps the
+    line breaks between bullet points.
+    """
+    style: str
+    text: str = ''
+    label: str = ''
+    space: float = 0
+
+
+def spacer(points: float) -> Block:
+    return Block(SPACER, space=points)
+
+
+class CVDocument(NamedTuple):
+    """The optimized content of a CV as ordered (section, blocks) pairs"""
+    template_id: str
+    sections: Tuple[Tuple[str, Tuple[Block, ...]], ...]
+
+    @property
+    def blocks(self) -> Iterator[Block]:
+        for _, blocks in self.sections:
+            yield from blocks
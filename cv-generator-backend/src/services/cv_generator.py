@@ -1,120 +1,220 @@
-from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
-from typing import Dict, List
+from reportlab.pdfbase.pdfdoc import PDFStream, PDFZCompress
+from reportlab.pdfgen.canvas import Canvas
+from typing import BinaryIO, Dict, Iterator, List, Tuple, Union
+from io import BytesIO
+from src.services.cv_document import SPACER, Block, CVDocument, spacer
+from src.services.cv_templates import DEFAULT_TEMPLATE, CVTemplate, get_template, list_templates
+from src.services.page_fit import block_markup, fit_to_pages
+from src.services.profile_index import ProfileIndex
+from src.services.text_rewriter import PhraseRewriter, term_finder
 import os
 import uuid
 from datetime import datetime
 
+# Bump whenever rendered output changes so cached PDFs are not reused
+GENERATOR_VERSION = '1.2.1'
+
+# Generic verbs in experience descriptions and their stronger replacements
+EXPERIENCE_REWRITER = PhraseRewriter({
+    'worked on': 'developed',
+    'helped': 'collaborated',
+    'did': 'executed',
+    'made': 'created',
+    'used': 'leveraged',
+    'handled': 'managed'
+})
+
+# Page-fit layouts are rebuilt with this much more room kept free on each page
+# when the real PDF comes out longer than the estimate, up to FIT_ATTEMPTS times
+FIT_SLACK_STEP = 18
+FIT_ATTEMPTS = 3
+
+# Document info left blank in compact PDFs instead of ReportLab's defaults
+COMPACT_METADATA = {'title': '', 'author': '', 'subject': '', 'creator': '', 'producer': ''}
+
+
+class CompactCanvas(Canvas):
+    """Canvas writing page streams Flate-compressed without the ASCII85 wrapper.
+
+    ReportLab wraps compressed streams in ASCII85 by default (rl_config.useA85),
+    which inflates them by a quarter. That setting is process-wide and read
+    when the document is saved, so the plain stream is attached to each page
+    here instead, leaving other renders in the process untouched.
+    """
+
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages.pages[-1]
+        if page.compression and page.stream and not page.Contents:
+            contents = PDFStream(content=page.stream, filters=[PDFZCompress])
+            contents.__Comment__ = 'page stream'
+            page.Contents = contents
+
+
 class CVGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-        
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles for CV"""
-        # Header style
-        self.styles.add(ParagraphStyle(
-            name='CVHeader',
-            parent=self.styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#2563eb'),
-            alignment=TA_CENTER,
-            spaceAfter=12
-        ))
-        
-        # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#1f2937'),
-            borderWidth=1,
-            borderColor=colors.HexColor('#e5e7eb'),
-            borderPadding=6,
-            spaceBefore=12,
-            spaceAfter=6
-        ))
-        
-        # Contact info style
-        self.styles.add(ParagraphStyle(
-            name='ContactInfo',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            spaceAfter=12
-        ))
-        
-        # Job title style
-        self.styles.add(ParagraphStyle(
-            name='JobTitle',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            textColor=colors.HexColor('#374151'),
-            fontName='Helvetica-Bold',
-            spaceBefore=6,
-            spaceAfter=2
-        ))
-        
-        # Company style
-        self.styles.add(ParagraphStyle(
-            name='Company',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            textColor=colors.HexColor('#6b7280'),
-            fontName='Helvetica-Oblique',
-            spaceAfter=4
-        ))
-        
-        # Body text style
-        self.styles.add(ParagraphStyle(
-            name='CVBodyText',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_JUSTIFY,
-            spaceAfter=6
-        ))
+        # Styles come from the process-wide template registry, built once and shared
+        self.styles = get_template(DEFAULT_TEMPLATE).styles
 
-    def generate_cv(self, user_data: Dict, job_analysis: Dict = None) -> str:
+    def generate_cv(self, user_data: Dict, job_analysis: Dict = None, template_id: str = DEFAULT_TEMPLATE,
+                    compact: bool = False, fit_pages: int = None) -> str:
         """Generate ATS-optimized CV and return file path"""
         # Create unique filename
         cv_id = str(uuid.uuid4())
         filename = f"cv_{cv_id}.pdf"
         filepath = os.path.join('/tmp', filename)
         
-        # Create PDF document
+        self.render_cv(filepath, user_data, job_analysis, template_id, compact=compact, fit_pages=fit_pages)
+        
+        return filepath
+
+    def generate_cv_bytes(self, user_data: Dict, job_analysis: Dict = None,
+                          template_id: str = DEFAULT_TEMPLATE, compact: bool = False,
+                          fit_pages: int = None) -> bytes:
+        """Generate ATS-optimized CV in memory and return the PDF bytes"""
+        buffer = BytesIO()
+        self.render_cv(buffer, user_data, job_analysis, template_id, compact=compact, fit_pages=fit_pages)
+        return buffer.getvalue()
+
+    def generate_cv_bytes_many(self, user_data: Dict, job_analyses: List[Dict],
+                               template_id: str = DEFAULT_TEMPLATE, compact: bool = False,
+                               fit_pages: int = None) -> Iterator[bytes]:
+        """Generate one profile's CV tailored to each job, yielding PDF bytes in order.
+
+        Sections that do not depend on the job are built once and shared by
+        every render.
+        """
+        profile = ProfileIndex(user_data)
+        profile_sections = self._build_profile_sections(profile, get_template(template_id))
+        for job_analysis in job_analyses:
+            buffer = BytesIO()
+            self.render_cv(buffer, user_data, job_analysis, template_id, profile_sections, profile, compact, fit_pages)
+            yield buffer.getvalue()
+
+    def render_cv(self, output: Union[str, BinaryIO], user_data: Dict, job_analysis: Dict = None,
+                  template_id: str = DEFAULT_TEMPLATE, profile_sections: Dict[str, List] = None,
+                  profile: ProfileIndex = None, compact: bool = False, fit_pages: int = None):
+        """Render the CV as PDF into a file path or a writable binary file object.
+
+        compact output uses plain Flate page streams and blank document info;
+        text stays in the standard-14 fonts, which are never embedded.
+        fit_pages shrinks fonts and spacing, then trims the oldest jobs'
+        bullets, until the CV fits that many pages (see page_fit).
+        """
+        template = get_template(template_id)
+        if profile is None:
+            profile = ProfileIndex(user_data)
+        if fit_pages:
+            document = self.build_document(user_data, job_analysis, template_id, profile)
+            self._render_fitted(output, document, template, fit_pages, compact)
+            return
+        if profile_sections is None:
+            profile_sections = self._build_profile_sections(profile, template)
+        
+        # Build CV content in the template's section order
+        story = []
+        for section in template.sections:
+            if section in profile_sections:
+                story.extend(profile_sections[section])
+            else:
+                story.extend(self._to_flowables(self._build_section(section, profile, job_analysis, template), template))
+        
+        self._build_pdf(output, story, template, compact)
+
+    def _render_fitted(self, output: Union[str, BinaryIO], document: CVDocument, template: CVTemplate,
+                       pages: int, compact: bool):
+        """Render the layout page_fit estimates fits, re-fitting tighter if the real PDF runs over"""
+        slack = 0
+        for _ in range(FIT_ATTEMPTS):
+            layout = fit_to_pages(document, template, pages, slack=slack)
+            buffer = BytesIO()
+            rendered = self._build_pdf(buffer, self._to_flowables(layout.document.blocks, layout.template),
+                                       layout.template, compact)
+            # Stop once it fits, or when even the tightest layout was estimated too long
+            if rendered <= pages or layout.pages > pages:
+                break
+            slack += FIT_SLACK_STEP
+        
+        if isinstance(output, str):
+            with open(output, 'wb') as pdf_file:
+                pdf_file.write(buffer.getvalue())
+        else:
+            output.write(buffer.getvalue())
+
+    @staticmethod
+    def _build_pdf(output: Union[str, BinaryIO], story: List, template: CVTemplate, compact: bool) -> int:
+        """Lay out the story on A4 pages with the template's margins and return the page count"""
+        margin = template.margin_inches * inch
         doc = SimpleDocTemplate(
-            filepath,
+            output,
             pagesize=A4,
-            rightMargin=0.75*inch,
-            leftMargin=0.75*inch,
-            topMargin=0.75*inch,
-            bottomMargin=0.75*inch
+            rightMargin=margin,
+            leftMargin=margin,
+            topMargin=margin,
+            bottomMargin=margin,
+            **(COMPACT_METADATA if compact else {})
         )
         
-        # Build CV content
-        story = []
-        story.extend(self._build_header(user_data))
-        story.extend(self._build_professional_summary(user_data, job_analysis))
-        story.extend(self._build_experience_section(user_data, job_analysis))
-        story.extend(self._build_education_section(user_data))
-        story.extend(self._build_skills_section(user_data, job_analysis))
-        
         # Build PDF
-        doc.build(story)
-        
-        return filepath
+        if compact:
+            doc.build(story, canvasmaker=CompactCanvas)
+        else:
+            doc.build(story)
+        return doc.page
+
+    def build_document(self, user_data: Dict, job_analysis: Dict = None, template_id: str = DEFAULT_TEMPLATE,
+                       profile: ProfileIndex = None) -> CVDocument:
+        """Build the optimized CV content without any layout, for previews and other renderers"""
+        template = get_template(template_id)
+        if profile is None:
+            profile = ProfileIndex(user_data)
+        return CVDocument(template.id, tuple(
+            (section, tuple(self._build_section(section, profile, job_analysis, template)))
+            for section in template.sections
+        ))
+
+    def _build_section(self, section: str, profile: ProfileIndex, job_analysis: Dict,
+                       template: CVTemplate) -> List[Block]:
+        if section == 'header':
+            return self._build_header(profile, template)
+        if section == 'education':
+            return self._build_education_section(profile, template)
+        builders = {
+            'summary': self._build_professional_summary,
+            'experience': self._build_experience_section,
+            'skills': self._build_skills_section,
+        }
+        return builders[section](profile, job_analysis, template)
+
+    def _build_profile_sections(self, profile: ProfileIndex, template: CVTemplate) -> Dict[str, List]:
+        """Build the flowables that depend only on the profile, not on the job"""
+        return {
+            section: self._to_flowables(self._build_section(section, profile, None, template), template)
+            for section in ('header', 'education')
+        }
+
+    @staticmethod
+    def _to_flowables(blocks: List[Block], template: CVTemplate) -> List:
+        """Lay out document blocks as ReportLab flowables in the template's styles"""
+        flowables = []
+        for block in blocks:
+            if block.style == SPACER:
+                flowables.append(Spacer(1, block.space))
+            else:
+                flowables.append(Paragraph(block_markup(block), template.styles[block.style]))
+        return flowables
 
-    def _build_header(self, user_data: Dict) -> List:
+    def _build_header(self, profile: ProfileIndex, template: CVTemplate) -> List[Block]:
         """Build CV header with name and contact info"""
         story = []
+        user_data = profile.user_data
         
         # Name
         name = user_data.get('personal_info', {}).get('full_name', 'Your Name')
-        story.append(Paragraph(name, self.styles['CVHeader']))
+        story.append(Block('CVHeader', name))
         
         # Contact information
         contact_info = user_data.get('personal_info', {})
@@ -131,35 +231,35 @@ class CVGenerator:
         
         if contact_parts:
             contact_text = " | ".join(contact_parts)
-            story.append(Paragraph(contact_text, self.styles['ContactInfo']))
+            story.append(Block('ContactInfo', contact_text))
         
-        story.append(Spacer(1, 12))
+        story.append(spacer(12))
         return story
 
-    def _build_professional_summary(self, user_data: Dict, job_analysis: Dict = None) -> List:
+    def _build_professional_summary(self, profile: ProfileIndex, job_analysis: Dict, template: CVTemplate) -> List[Block]:
         """Build professional summary section"""
         story = []
         
-        summary = user_data.get('professional_summary', '')
+        summary = profile.user_data.get('professional_summary', '')
         if summary:
-            story.append(Paragraph("PROFESSIONAL SUMMARY", self.styles['SectionHeader']))
+            story.append(Block('SectionHeader', template.headings['summary']))
             
             # Optimize summary based on job analysis
             if job_analysis:
-                summary = self._optimize_summary(summary, job_analysis)
+                summary = self._optimize_summary(summary, job_analysis, profile.section_text.get('professional_summary'))
             
-            story.append(Paragraph(summary, self.styles['CVBodyText']))
-            story.append(Spacer(1, 12))
+            story.append(Block('CVBodyText', summary))
+            story.append(spacer(12))
         
         return story
 
-    def _build_experience_section(self, user_data: Dict, job_analysis: Dict = None) -> List:
+    def _build_experience_section(self, profile: ProfileIndex, job_analysis: Dict, template: CVTemplate) -> List[Block]:
         """Build work experience section"""
         story = []
         
-        experiences = user_data.get('work_experience', [])
+        experiences = profile.user_data.get('work_experience', [])
         if experiences:
-            story.append(Paragraph("PROFESSIONAL EXPERIENCE", self.styles['SectionHeader']))
+            story.append(Block('SectionHeader', template.headings['experience']))
             
             for exp in experiences:
                 # Job title and company
@@ -167,8 +267,8 @@ class CVGenerator:
                 company = exp.get('company', '')
                 dates = f"{exp.get('start_date', '')} - {exp.get('end_date', 'Present')}"
                 
-                story.append(Paragraph(f"{job_title}", self.styles['JobTitle']))
-                story.append(Paragraph(f"{company} | {dates}", self.styles['Company']))
+                story.append(Block('JobTitle', f"{job_title}"))
+                story.append(Block('Company', f"{company} | {dates}"))
                 
                 # Job description/achievements
                 description = exp.get('description', '')
@@ -182,19 +282,19 @@ class CVGenerator:
                         bullets = description.split('\n')
                         description = '\n'.join([f"• {bullet.strip()}" for bullet in bullets if bullet.strip()])
                     
-                    story.append(Paragraph(description, self.styles['CVBodyText']))
+                    story.append(Block('CVBodyText', description))
                 
-                story.append(Spacer(1, 8))
+                story.append(spacer(8))
         
         return story
 
-    def _build_education_section(self, user_data: Dict) -> List:
+    def _build_education_section(self, profile: ProfileIndex, template: CVTemplate) -> List[Block]:
         """Build education section"""
         story = []
         
-        education = user_data.get('education', [])
+        education = profile.user_data.get('education', [])
         if education:
-            story.append(Paragraph("EDUCATION", self.styles['SectionHeader']))
+            story.append(Block('SectionHeader', template.headings['education']))
             
             for edu in education:
                 degree = edu.get('degree', '')
@@ -208,19 +308,19 @@ class CVGenerator:
                 if gpa:
                     degree_line += f" | GPA: {gpa}"
                 
-                story.append(Paragraph(degree_line, self.styles['JobTitle']))
-                story.append(Paragraph(school, self.styles['Company']))
-                story.append(Spacer(1, 6))
+                story.append(Block('JobTitle', degree_line))
+                story.append(Block('Company', school))
+                story.append(spacer(6))
         
         return story
 
-    def _build_skills_section(self, user_data: Dict, job_analysis: Dict = None) -> List:
+    def _build_skills_section(self, profile: ProfileIndex, job_analysis: Dict, template: CVTemplate) -> List[Block]:
         """Build skills section"""
         story = []
         
-        skills = user_data.get('skills', {})
+        skills = profile.user_data.get('skills', {})
         if skills:
-            story.append(Paragraph("TECHNICAL SKILLS", self.styles['SectionHeader']))
+            story.append(Block('SectionHeader', template.headings['skills']))
             
             # Organize skills by category
             skill_categories = []
@@ -231,7 +331,7 @@ class CVGenerator:
                     # Prioritize skills mentioned in job description
                     job_skills = job_analysis.get('technical_skills', [])
                     technical = self._prioritize_skills(technical, job_skills)
-                skill_categories.append(f"<b>Technical:</b> {', '.join(technical)}")
+                skill_categories.append(('Technical:', ', '.join(technical)))
             
             if skills.get('soft_skills'):
                 soft = skills['soft_skills']
@@ -239,50 +339,57 @@ class CVGenerator:
                     # Prioritize soft skills mentioned in job description
                     job_soft_skills = job_analysis.get('soft_skills', [])
                     soft = self._prioritize_skills(soft, job_soft_skills)
-                skill_categories.append(f"<b>Soft Skills:</b> {', '.join(soft)}")
+                skill_categories.append(('Soft Skills:', ', '.join(soft)))
             
             if skills.get('languages'):
                 languages = skills['languages']
-                skill_categories.append(f"<b>Languages:</b> {', '.join(languages)}")
+                skill_categories.append(('Languages:', ', '.join(languages)))
             
             if skills.get('certifications'):
                 certs = skills['certifications']
-                skill_categories.append(f"<b>Certifications:</b> {', '.join(certs)}")
+                skill_categories.append(('Certifications:', ', '.join(certs)))
             
-            for category in skill_categories:
-                story.append(Paragraph(category, self.styles['CVBodyText']))
-                story.append(Spacer(1, 4))
+            for label, text in skill_categories:
+                story.append(Block('CVBodyText', text, label))
+                story.append(spacer(4))
         
         return story
 
-    def _optimize_summary(self, summary: str, job_analysis: Dict) -> str:
-        """Optimize professional summary based on job analysis"""
+    def _optimize_summary(self, summary: str, job_analysis: Dict, lowered_summary: str = None) -> str:
+        """Optimize professional summary based on job analysis.
+
+        lowered_summary is the summary already lowercased by the profile index, if available.
+        """
         if not job_analysis:
             return summary
             
         keywords = job_analysis.get('keywords', [])
         technical_skills = job_analysis.get('technical_skills', [])
+        finder = term_finder(tuple(keywords[:5] + technical_skills))
         
         # Enhanced optimization with actual keyword integration
         optimized_summary = summary
+        # Lowercase once; each addition below only scans the text it appends
+        present = finder.find(summary.lower() if lowered_summary is None else lowered_summary)
         
         # Add missing critical keywords naturally
-        missing_keywords = []
-        for keyword in keywords[:5] # Top 5 keywords
-            if keyword.lower() not in summary.lower():
-                missing_keywords.append(keyword)
+        missing_keywords = [keyword for keyword in keywords[:5] if keyword.lower() not in present]
         
         # Advanced keyword density optimization
         if missing_keywords:
             # Add relevant skills if missing
-            skill_additions = [skill for skill in technical_skills if skill not in summary.lower()]
+            skill_additions = [skill for skill in technical_skills if skill.lower() not in present]
             if skill_additions:
-                optimized_summary += f" Experienced in {', '.join(skill_additions[:3])} with proven track record in {missing_keywords[0] if missing_keywords else 'software development'}."
+                addition = f" Experienced in {', '.join(skill_additions[:3])} with proven track record in {missing_keywords[0] if missing_keywords else 'software development'}."
+                optimized_summary += addition
+                present |= finder.find(addition.lower())
         
         # Ensure keyword density is optimal (1-3% for top keywords)
         for keyword in keywords[:3]:
-            if keyword.lower() not in optimized_summary.lower():
-                optimized_summary = self._inject_keyword_naturally(optimized_summary, keyword)
+            if keyword.lower() not in present:
+                addition = self._inject_keyword_naturally('', keyword)
+                optimized_summary += addition
+                present |= finder.find(addition.lower())
         
         return optimized_summary
 
@@ -298,9 +405,10 @@ class CVGenerator:
         ]
         
         # Choose appropriate pattern based on context
-        if any(word in keyword.lower() for word in ['management', 'leadership', 'strategy']):
+        lowered = keyword.lower()
+        if any(word in lowered for word in ['management', 'leadership', 'strategy']):
             return text + f" Demonstrated {keyword} capabilities across multiple projects."
-        elif any(word in keyword.lower() for word in ['development', 'programming', 'coding']):
+        elif any(word in lowered for word in ['development', 'programming', 'coding']):
             return text + f" Strong {keyword} experience with focus on best practices."
         else:
             return text + f" {insertion_patterns[0]}."
@@ -312,31 +420,14 @@ class CVGenerator:
             
         keywords = job_analysis.get('keywords', [])
         
-        # Enhance bullet points with job-relevant terms
-        optimized_desc = description
-        
-        # Replace generic terms with job-specific ones
-        replacements = {
-            'worked on': 'developed',
-            'helped': 'collaborated',
-            'did': 'executed',
-            'made': 'created',
-            'used': 'leveraged',
-            'handled': 'managed'
-        }
-        
-        for generic, specific in replacements.items():
-            optimized_desc = optimized_desc.replace(generic, specific)
+        # Replace generic terms with job-specific ones, in one whole-word pass
+        optimized_desc = EXPERIENCE_REWRITER.rewrite(description)
         
         # Add quantification suggestions
         optimized_desc = self._suggest_quantification(optimized_desc)
         
         # Inject relevant keywords from job analysis
-        for keyword in keywords[:3]:
-            if keyword.lower() not in optimized_desc.lower():
-                optimized_desc = self._enhance_bullets_with_keywords(optimized_desc, keyword)
-        
-        return optimized_desc
+        return self._enhance_bullets_with_keywords(optimized_desc, keywords[:3])
 
     def _suggest_quantification(self, description: str) -> str:
         """Add quantification hints to experience descriptions"""
@@ -351,39 +442,47 @@ class CVGenerator:
             'performance': '• Increased performance by [X]%'
         }
         
+        if '[X]' in description:
+            return description
+        
+        lowered = description.lower()
         enhanced_desc = description
         for keyword, suggestion in metric_opportunities.items():
-            if keyword in description.lower() and '[X]' not in description:
+            if keyword in lowered:
                 # Add quantification hint
                 enhanced_desc += f"\n{suggestion} ahead of schedule."
         
         return enhanced_desc
 
-    def _enhance_bullets_with_keywords(self, description: str, keyword: str) -> str:
-        """Enhance bullet points with relevant keywords"""
+    def _enhance_bullets_with_keywords(self, description: str, keywords: List[str]) -> str:
+        """Append keywords not already present to the first substantial bullet point"""
         lines = description.split('\n')
-        enhanced_lines = []
-        
-        keyword_added = False
-        for line in lines:
-            if line.strip() and not keyword_added and len(line) > 20:
-                # Add keyword to the first substantial bullet point
-                if keyword.lower() in ['agile', 'scrum']:
-                    line += f" using {keyword} methodology"
-                elif keyword.lower() in ['api', 'rest', 'microservices']:
-                    line += f" implementing {keyword} solutions"
-                else:
-                    line += f" utilizing {keyword}"
-                keyword_added = True
-            enhanced_lines.append(line)
-        
-        return '\n'.join(enhanced_lines)
+        target = next((index for index, line in enumerate(lines) if line.strip() and len(line) > 20), None)
+        if target is None:
+            return description
+        
+        finder = term_finder(tuple(keywords))
+        present = finder.find(description.lower())
+        
+        for keyword in keywords:
+            lowered = keyword.lower()
+            if lowered in present:
+                continue
+            if lowered in ['agile', 'scrum']:
+                addition = f" using {keyword} methodology"
+            elif lowered in ['api', 'rest', 'microservices']:
+                addition = f" implementing {keyword} solutions"
+            else:
+                addition = f" utilizing {keyword}"
+            lines[target] += addition
+            present |= finder.find(addition.lower())
+        
+        return '\n'.join(lines)
 
     def _prioritize_skills(self, user_skills: List[str], job_skills: List[str]) -> List[str]:
         """Prioritize skills that match job requirements"""
-        # Convert to lowercase for comparison
-        job_skills_lower = [skill.lower() for skill in job_skills]
-        user_skills_lower = [skill.lower() for skill in user_skills]
+        # Lowercase the job's skills once so each user skill is a set lookup
+        job_skills_lower = {skill.lower() for skill in job_skills}
         
         # Separate matching and non-matching skills
         matching_skills = []
@@ -400,26 +499,15 @@ class CVGenerator:
 
     def get_cv_templates(self) -> List[Dict]:
         """Return available CV templates"""
-        return [
-            {
-                'id': 'professional',
-                'name': 'Professional',
-                'description': 'Clean, ATS-friendly template suitable for most industries'
-            },
-            {
-                'id': 'modern',
-                'name': 'Modern',
-                'description': 'Contemporary design with subtle styling'
-            },
-            {
-                'id': 'minimal',
-                'name': 'Minimal',
-                'description': 'Ultra-clean template focused on content'
-            }
-        ]
+        return list_templates()
 
-    def validate_ats_compatibility(self, user_data: Dict, job_analysis: Dict = None) -> Dict:
-        """Validate CV for ATS compatibility and provide score"""
+    def validate_ats_compatibility(self, user_data: Dict, job_analysis: Dict = None,
+                                   profile: ProfileIndex = None) -> Dict:
+        """Validate CV for ATS compatibility and provide score.
+
+        Keywords are matched as whole words in the profile's user-visible
+        values. Pass a ProfileIndex to reuse one already built for the request.
+        """
         validation_results = {
             'overall_score': 0,
             'issues': [],
@@ -427,74 +515,90 @@ class CVGenerator:
             'ats_grade': 'F'
         }
         
+        score, issues, recommendations = self.score_profile_sections(user_data)
+        validation_results['issues'].extend(issues)
+        validation_results['recommendations'].extend(recommendations)
+        
+        # Check job alignment (30 points)
+        if job_analysis:
+            job_keywords = job_analysis.get('keywords', [])
+            job_skills = job_analysis.get('technical_skills', [])
+            
+            if profile is None:
+                profile = ProfileIndex(user_data)
+            
+            # Check keyword alignment
+            matching_keywords = sum(1 for keyword in job_keywords[:10] if profile.has_term(keyword))
+            score += (matching_keywords / 10) * 15
+            
+            # Check skill alignment
+            matching_skills = sum(1 for skill in job_skills if profile.has_skill(skill))
+            if job_skills:
+                score += (matching_skills / len(job_skills)) * 15
+        
+        validation_results['overall_score'] = round(score, 1)
+        validation_results['ats_grade'] = self._get_ats_grade(score)
+        
+        # Generate recommendations
+        if score < 70:
+            validation_results['recommendations'].extend([
+                "Include more job-relevant keywords in your summary",
+                "Add quantifiable achievements to your experience",
+                "Ensure all technical skills from job posting are included"
+            ])
+        
+        return validation_results
+
+    @staticmethod
+    def score_profile_sections(user_data: Dict) -> Tuple[float, List[str], List[str]]:
+        """Score the job-independent parts of a profile (70 points).
+
+        Returns the score with the issues and recommendations found. Shared by
+        single CV validation and bulk candidate matching.
+        """
+        issues = []
+        recommendations = []
+        
         score = 0
-        max_score = 100
         
         # Check essential sections (30 points)
         if user_data.get('personal_info', {}).get('full_name'):
             score += 5
         else:
-            validation_results['issues'].append("Missing full name")
+            issues.append("Missing full name")
         
         if user_data.get('personal_info', {}).get('email'):
             score += 5
         else:
-            validation_results['issues'].append("Missing email address")
+            issues.append("Missing email address")
         
         if user_data.get('professional_summary'):
             score += 10
         else:
-            validation_results['issues'].append("Missing professional summary")
+            issues.append("Missing professional summary")
         
         if user_data.get('work_experience'):
             score += 10
         else:
-            validation_results['issues'].append("Missing work experience")
+            issues.append("Missing work experience")
         
         # Check skills section (20 points)
         skills = user_data.get('skills', {})
         if skills.get('technical_skills'):
             score += 10
         else:
-            validation_results['issues'].append("Missing technical skills")
+            issues.append("Missing technical skills")
         
         if skills.get('soft_skills'):
             score += 10
         else:
-            validation_results['recommendations'].append("Add soft skills to improve ATS score")
-        
-        # Check job alignment (30 points)
-        if job_analysis:
-            job_keywords = job_analysis.get('keywords', [])
-            job_skills = job_analysis.get('technical_skills', [])
-            
-            # Check keyword alignment
-            user_text = str(user_data).lower()
-            matching_keywords = sum(1 for keyword in job_keywords[:10] if keyword.lower() in user_text)
-            score += (matching_keywords / 10) * 15
-            
-            # Check skill alignment
-            user_skills = [skill.lower() for skill in skills.get('technical_skills', [])]
-            matching_skills = sum(1 for skill in job_skills if skill.lower() in user_skills)
-            if job_skills:
-                score += (matching_skills / len(job_skills)) * 15
+            recommendations.append("Add soft skills to improve ATS score")
         
         # Check format and structure (20 points)
         # This is automatically good since we generate ATS-friendly PDFs
         score += 20
         
-        validation_results['overall_score'] = round(score, 1)
-        validation_results['ats_grade'] = self._get_ats_grade(score)
-        
-        # Generate recommendations
-        if score < 70:
-            validation_results['recommendations'].extend([
-                "Include more job-relevant keywords in your summary",
-                "Add quantifiable achievements to your experience",
-                "Ensure all technical skills from job posting are included"
-            ])
-        
-        return validation_results
+        return score, issues, recommendations
 
     def _get_ats_grade(self, score: float) -> str:
         """Convert ATS score to letter grade"""
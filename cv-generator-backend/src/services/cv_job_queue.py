@@ -0,0 +1,239 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple, Type
+
+JOB_STATES = ('queued', 'running', 'succeeded', 'failed')
+
+
+class CVJobQueue:
+    """Durable SQLite-backed queue of CV generation jobs run by background threads.
+
+    Jobs survive restarts: a job left 'running' by a process that died is
+    picked up again once its lease expires, up to max_attempts. Claims are
+    made inside an immediate transaction, so several server processes can
+    share one database file and each job still runs once.
+
+    handler(payload) returns the job result. Exceptions listed in retry_on
+    put the job back in the queue (after their retry_after attribute, if
+    any) without using up an attempt; any other exception fails the job.
+    """
+
+    # Remove finished jobs past their TTL every N claims rather than on every poll
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, db_path: str, handler: Callable[[Dict], Dict], worker_threads: int = 2,
+                 lease_seconds: float = 300, result_ttl_seconds: float = 86400,
+                 max_attempts: int = 3, retry_on: Tuple[Type[BaseException], ...] = (),
+                 poll_seconds: float = 1.0):
+        self.db_path = db_path
+        self.handler = handler
+        self.worker_threads = worker_threads
+        self.lease_seconds = lease_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self.max_attempts = max_attempts
+        self.retry_on = retry_on
+        self.poll_seconds = poll_seconds
+
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._claims = 0
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cv_jobs ('
+                'id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL, '
+                'result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, '
+                'created_at REAL NOT NULL, available_at REAL NOT NULL, '
+                'started_at REAL, finished_at REAL, lease_expires_at REAL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_cv_jobs_status ON cv_jobs (status, available_at)'
+            )
+
+    def start(self):
+        """Start the worker threads (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for index in range(self.worker_threads):
+                thread = threading.Thread(target=self._work, name=f'cv-job-worker-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """Ask the worker threads to exit after their current job"""
+        self._stopping.set()
+        self._wakeup.set()
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, payload: Dict) -> str:
+        """Persist a job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connection() as connection:
+            connection.execute(
+                'INSERT INTO cv_jobs (id, status, payload, created_at, available_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, 'queued', json.dumps(payload), now, now)
+            )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job's status, timings and result or error"""
+        row = self._connection().execute(
+            'SELECT id, status, result, error, attempts, created_at, started_at, finished_at '
+            'FROM cv_jobs WHERE id = ?', (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        job_id, status, result, error, attempts, created_at, started_at, finished_at = row
+        job = {
+            'id': job_id,
+            'status': status,
+            'attempts': attempts,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at,
+        }
+        if status == 'queued':
+            job['position'] = self._position(created_at)
+        if result is not None:
+            job['result'] = json.loads(result)
+        if error is not None:
+            job['error'] = error
+        return job
+
+    def stats(self) -> Dict:
+        """Return job counts by state"""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        for status, count in self._connection().execute(
+            'SELECT status, COUNT(*) FROM cv_jobs GROUP BY status'
+        ):
+            counts[status] = count
+        return {
+            **counts,
+            'worker_threads': len(self._threads),
+            'db_path': self.db_path,
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the job database"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _position(self, created_at: float) -> int:
+        """Number of queued jobs ahead of one created at created_at"""
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM cv_jobs WHERE status = 'queued' AND created_at < ?", (created_at,)
+        ).fetchone()[0]
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+            except sqlite3.Error:
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_seconds)
+                self._wakeup.clear()
+                continue
+
+            self._run(*job)
+
+    def _claim(self) -> Optional[Tuple[str, Dict]]:
+        """Atomically take the oldest runnable job, including ones whose lease ran out"""
+        now = time.time()
+        connection = self._connection()
+        with connection:
+            connection.execute('BEGIN IMMEDIATE')
+            row = connection.execute(
+                "SELECT id, payload, attempts, status FROM cv_jobs "
+                "WHERE (status = 'queued' AND available_at <= ?) "
+                "OR (status = 'running' AND lease_expires_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is None:
+                return None
+
+            job_id, payload, attempts, status = row
+            if status == 'running' and attempts >= self.max_attempts:
+                connection.execute(
+                    "UPDATE cv_jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    ('Worker stopped before the CV was generated', now, job_id)
+                )
+                return None
+
+            connection.execute(
+                "UPDATE cv_jobs SET status = 'running', attempts = attempts + 1, "
+                "started_at = ?, lease_expires_at = ? WHERE id = ?",
+                (now, now + self.lease_seconds, job_id)
+            )
+
+        with self._lock:
+            self._claims += 1
+            should_prune = self._claims % self.PRUNE_INTERVAL == 0
+        if should_prune:
+            self._prune()
+
+        return job_id, json.loads(payload)
+
+    def _run(self, job_id: str, payload: Dict):
+        connection = self._connection()
+        try:
+            result = self.handler(payload)
+        except self.retry_on as e:
+            delay = getattr(e, 'retry_after', self.poll_seconds)
+            with connection:
+                connection.execute(
+                    "UPDATE cv_jobs SET status = 'queued', attempts = attempts - 1, "
+                    "available_at = ?, lease_expires_at = NULL WHERE id = ?",
+                    (time.time() + delay, job_id)
+                )
+            return
+        except Exception as e:
+            with connection:
+                connection.execute(
+                    "UPDATE cv_jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                    (str(e) or type(e).__name__, time.time(), job_id)
+                )
+            return
+
+        with connection:
+            connection.execute(
+                "UPDATE cv_jobs SET status = 'succeeded', result = ?, finished_at = ? WHERE id = ?",
+                (json.dumps(result), time.time(), job_id)
+            )
+
+    def _prune(self):
+        """Delete finished jobs older than the result TTL"""
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "DELETE FROM cv_jobs WHERE status IN ('succeeded', 'failed') AND finished_at < ?",
+                    (time.time() - self.result_ttl_seconds,)
+                )
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,61 @@
+import html
+import re
+from typing import List
+
+from src.services.cv_document import SPACER, Block, CVDocument
+
+# ReportLab paragraph markup that may appear in block text
+_MARKUP = re.compile(r'</?(?:b|i|u|strong|em|br|font|super|sub)\b[^>]*>', re.IGNORECASE)
+
+_HTML_TAGS = {
+    'CVHeader': 'h1',
+    'SectionHeader': 'h2',
+    'JobTitle': 'h3',
+}
+
+
+def render_text(document: CVDocument) -> str:
+    """Plain text of a CV as an ATS parser reads it: one line per paragraph or bullet.
+
+    Sections are separated by a blank line.
+    """
+    sections = []
+    for _, blocks in document.sections:
+        lines = []
+        for block in blocks:
+            if block.style == SPACER:
+                continue
+            text = _plain(block.text)
+            if block.label:
+                text = f'{_plain(block.label)} {text}'
+            lines.extend(line for line in text.split('\n') if line.strip())
+        if lines:
+            sections.append('\n'.join(lines))
+    return '\n\n'.join(sections)
+
+
+def render_html(document: CVDocument) -> str:
+    """HTML fragment of a CV: one <section> per CV section, with user text escaped"""
+    sections = []
+    for section, blocks in document.sections:
+        parts = [_html_block(block) for block in blocks if block.style != SPACER]
+        if parts:
+            sections.append(f'<section class="cv-{section}">\n' + '\n'.join(parts) + '\n</section>')
+    return '\n'.join(sections)
+
+
+def _plain(text: str) -> str:
+    return html.unescape(_MARKUP.sub('', str(text)))
+
+
+def _html_block(block: Block) -> str:
+    lines: List[str] = [html.escape(_plain(line)) for line in str(block.text).split('\n') if line.strip()]
+    content = '<br>'.join(lines)
+    if block.label:
+        content = f'<strong>{html.escape(_plain(block.label))}</strong> {content}'
+
+    tag = _HTML_TAGS.get(block.style)
+    if tag:
+        return f'<{tag}>{content}</{tag}>'
+    css_class = {'ContactInfo': 'contact', 'Company': 'company'}.get(block.style, 'body')
+    return f'<p class="{css_class}">{content}</p>'
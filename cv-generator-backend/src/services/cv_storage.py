@@ -0,0 +1,429 @@
+import hashlib
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterator, NamedTuple, Optional, Tuple, Union
+
+# CV ids are uuid4 strings or sha256 hex digests; anything else never maps to a stored CV
+_CV_ID = re.compile(r'[0-9a-f][0-9a-f-]{7,63}')
+
+# Render cache keys: the CV's bytes are fully determined by its id
+_CONTENT_ADDRESSED_ID = re.compile(r'[0-9a-f]{64}')
+
+
+def is_content_addressed(cv_id: str) -> bool:
+    """Whether a CV id is a content hash, so its bytes can never change"""
+    return _CONTENT_ADDRESSED_ID.fullmatch(cv_id) is not None
+
+
+def content_etag(cv_id: str, pdf_bytes: bytes) -> str:
+    """Strong ETag for a CV's bytes: its id if content-addressed, else a hash of the PDF"""
+    if is_content_addressed(cv_id):
+        return cv_id
+    return hashlib.sha256(pdf_bytes).hexdigest()[:32]
+
+
+class StoredCV(NamedTuple):
+    """A stored CV ready to be sent: either a file path or the PDF bytes.
+
+    created_at is None for CVs that were never stored (streamed responses).
+    """
+    cv_id: str
+    size: int
+    etag: str
+    created_at: Optional[float]
+    path: Optional[str] = None
+    data: Optional[bytes] = None
+
+    def source(self) -> Union[str, BinaryIO]:
+        """Absolute path or in-memory file to send; both let the server answer range requests"""
+        return self.path if self.path is not None else BytesIO(self.data)
+
+
+def stored_file(cv_id: str, path: str) -> Optional[StoredCV]:
+    """Describe a PDF file on disk, or None if it no longer exists.
+
+    Content-addressed CVs use their id as the ETag, so rewriting the same CV
+    keeps its tag. Other files combine size and modification time in
+    nanoseconds; they are only ever replaced atomically, so any new content
+    gets a new tag.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    if is_content_addressed(cv_id):
+        etag = cv_id
+    else:
+        etag = f'{info.st_size:x}-{info.st_mtime_ns:x}'
+    return StoredCV(cv_id, info.st_size, etag, info.st_mtime, path=os.path.abspath(path))
+
+
+class CVStorage(ABC):
+    """Interface of generated CV storage backends.
+
+    Backends keep each CV for ttl_seconds and at most max_bytes in total,
+    evicting the oldest CVs first; a background thread calls sweep() every
+    sweep_interval seconds to delete expired ones.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400, max_bytes: int = 1024 * 1024 * 1024,
+                 sweep_interval: float = 300):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+
+        self._lock = threading.Lock()
+        self._counters = {'writes': 0, 'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'sweeps': 0}
+        self._last_sweep = {'at': None, 'seconds': 0.0, 'removed': 0}
+        self._stopping = threading.Event()
+        self._sweeper = None
+
+    @abstractmethod
+    def put(self, cv_id: str, pdf_bytes: bytes):
+        """Store a CV, evicting the oldest CVs if over quota"""
+
+    @abstractmethod
+    def get(self, cv_id: str) -> Optional[StoredCV]:
+        """Return a stored, unexpired CV, or None"""
+
+    def sweep(self) -> int:
+        """Delete expired CVs, enforce the quota and return how many were removed"""
+        started = time.perf_counter()
+        removed = self._sweep()
+        with self._lock:
+            self._counters['sweeps'] += 1
+            self._last_sweep = {
+                'at': time.time(),
+                'seconds': round(time.perf_counter() - started, 4),
+                'removed': removed,
+            }
+        return removed
+
+    def start(self):
+        """Start the background TTL sweeper (idempotent)"""
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._stopping.clear()
+            self._sweeper = threading.Thread(target=self._sweep_loop, name='cv-storage-sweeper', daemon=True)
+            self._sweeper.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background sweeper"""
+        self._stopping.set()
+        with self._lock:
+            sweeper, self._sweeper = self._sweeper, None
+        if sweeper is not None:
+            sweeper.join(timeout)
+
+    def stats(self) -> Dict:
+        """Return usage, quota, expiry and sweep metrics"""
+        entries, total_bytes, oldest = self._usage()
+        with self._lock:
+            return {
+                **self._counters,
+                'backend': self.backend,
+                'entries': entries,
+                'bytes': total_bytes,
+                'max_bytes': self.max_bytes,
+                'usage': round(total_bytes / self.max_bytes, 4) if self.max_bytes else 0.0,
+                'ttl_seconds': self.ttl_seconds,
+                'oldest_age_seconds': round(time.time() - oldest, 1) if oldest else None,
+                'last_sweep_at': self._last_sweep['at'],
+                'last_sweep_seconds': self._last_sweep['seconds'],
+                'last_sweep_removed': self._last_sweep['removed'],
+            }
+
+    @abstractmethod
+    def _sweep(self) -> int:
+        """Delete expired and over-quota CVs and return how many were removed"""
+
+    @abstractmethod
+    def _usage(self) -> Tuple[int, int, Optional[float]]:
+        """Return (entries, total bytes, oldest creation time)"""
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _hit(self, stored: StoredCV) -> StoredCV:
+        self._count('hits')
+        return stored
+
+    def _miss(self) -> None:
+        self._count('misses')
+        return None
+
+    def _expired(self, created_at: float) -> bool:
+        return time.time() - created_at > self.ttl_seconds
+
+    def _sweep_loop(self):
+        while not self._stopping.wait(self.sweep_interval):
+            try:
+                self.sweep()
+            except (OSError, sqlite3.Error):
+                pass
+
+
+class LocalCVStorage(CVStorage):
+    """Generated CVs as PDF files in a directory, sharded into subdirectories by id prefix.
+
+    An in-memory index of creation time and size, ordered oldest first,
+    drives expiry and quota eviction without listing the directory. Every
+    sweep rebuilds it from disk, so files written by other worker processes
+    are accounted for too.
+    """
+
+    backend = 'local'
+    _suffix = '.pdf'
+
+    def __init__(self, directory: str, **options):
+        super().__init__(**options)
+        self.directory = directory
+        # cv_id -> (created_at, size), oldest first
+        self._index: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._reindex()
+
+    def put(self, cv_id: str, pdf_bytes: bytes):
+        path = self._path(cv_id)
+        if path is None:
+            raise ValueError(f"Invalid CV id '{cv_id}'")
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                temp_file.write(pdf_bytes)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self._forget(cv_id)
+            self._index[cv_id] = (time.time(), len(pdf_bytes))
+            self._total_bytes += len(pdf_bytes)
+            self._counters['writes'] += 1
+            over_quota = self._total_bytes > self.max_bytes
+
+        if over_quota:
+            self._enforce_quota()
+
+    def get(self, cv_id: str) -> Optional[StoredCV]:
+        path = self._path(cv_id)
+        if path is None:
+            return self._miss()
+
+        # Also finds CVs written by another worker process since the last sweep
+        stored = stored_file(cv_id, path)
+        if stored is None:
+            with self._lock:
+                self._forget(cv_id)
+            return self._miss()
+        if self._expired(stored.created_at):
+            return self._miss()
+        return self._hit(stored)
+
+    def stats(self) -> Dict:
+        return {**super().stats(), 'directory': self.directory}
+
+    def _path(self, cv_id: str) -> Optional[str]:
+        if not isinstance(cv_id, str) or not _CV_ID.fullmatch(cv_id):
+            return None
+        # Shard by id prefix so no single directory grows too large
+        return os.path.join(self.directory, cv_id[:2], f'{cv_id}{self._suffix}')
+
+    def _usage(self) -> Tuple[int, int, Optional[float]]:
+        with self._lock:
+            oldest = next(iter(self._index.values()), None)
+            return len(self._index), self._total_bytes, oldest[0] if oldest else None
+
+    def _forget(self, cv_id: str):
+        """Drop an id from the index (caller holds the lock)"""
+        entry = self._index.pop(cv_id, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def _iter_files(self) -> Iterator[Tuple[str, float, int]]:
+        """Yield (cv_id, created_at, size) for every stored CV"""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(self._suffix):
+                    continue
+                try:
+                    info = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                yield name[:-len(self._suffix)], info.st_mtime, info.st_size
+
+    def _reindex(self):
+        """Rebuild the index from disk, oldest first"""
+        entries = sorted(self._iter_files(), key=lambda item: item[1])
+        with self._lock:
+            self._index = OrderedDict((cv_id, (created_at, size)) for cv_id, created_at, size in entries)
+            self._total_bytes = sum(size for _, _, size in entries)
+
+    def _sweep(self) -> int:
+        self._reindex()
+
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = []
+            for cv_id, (created_at, _) in self._index.items():
+                if created_at > cutoff:
+                    break
+                expired.append(cv_id)
+
+        removed = self._remove(expired, 'expired')
+        with self._lock:
+            over_quota = self._total_bytes > self.max_bytes
+        return removed + (self._enforce_quota() if over_quota else 0)
+
+    def _enforce_quota(self) -> int:
+        """Evict the oldest CVs until the store is back under 90% of its quota"""
+        target = self.max_bytes * 0.9
+        with self._lock:
+            victims = []
+            remaining = self._total_bytes
+            for cv_id, (_, size) in self._index.items():
+                if remaining <= target:
+                    break
+                victims.append(cv_id)
+                remaining -= size
+        return self._remove(victims, 'evicted')
+
+    def _remove(self, cv_ids, counter: str) -> int:
+        removed = 0
+        for cv_id in cv_ids:
+            try:
+                os.remove(self._path(cv_id))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            with self._lock:
+                self._forget(cv_id)
+            removed += 1
+
+        self._count(counter, removed)
+        return removed
+
+
+class SQLiteCVStorage(CVStorage):
+    """Generated CVs as blobs in one SQLite database file.
+
+    Suits deployments where several processes or hosts share a volume but
+    not a directory layout. The ETag, taken when the CV is stored, is its id
+    if content-addressed and otherwise a hash of the PDF bytes.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, db_path: str, **options):
+        super().__init__(**options)
+        self.db_path = db_path
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cv_files ('
+                'id TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, '
+                'etag TEXT NOT NULL, created_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS idx_cv_files_created ON cv_files (created_at)')
+
+    def put(self, cv_id: str, pdf_bytes: bytes):
+        if not isinstance(cv_id, str) or not _CV_ID.fullmatch(cv_id):
+            raise ValueError(f"Invalid CV id '{cv_id}'")
+
+        etag = content_etag(cv_id, pdf_bytes)
+        with self._connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO cv_files (id, data, size, etag, created_at) VALUES (?, ?, ?, ?, ?)',
+                (cv_id, sqlite3.Binary(pdf_bytes), len(pdf_bytes), etag, time.time())
+            )
+            total_bytes = connection.execute('SELECT COALESCE(SUM(size), 0) FROM cv_files').fetchone()[0]
+        self._count('writes')
+
+        if total_bytes > self.max_bytes:
+            self._enforce_quota(total_bytes)
+
+    def get(self, cv_id: str) -> Optional[StoredCV]:
+        row = self._connection().execute(
+            'SELECT data, size, etag, created_at FROM cv_files WHERE id = ?', (cv_id,)
+        ).fetchone()
+        if row is None:
+            return self._miss()
+
+        data, size, etag, created_at = row
+        if self._expired(created_at):
+            return self._miss()
+        return self._hit(StoredCV(cv_id, size, etag, created_at, data=bytes(data)))
+
+    def stats(self) -> Dict:
+        return {**super().stats(), 'db_path': self.db_path}
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the storage database"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def _usage(self) -> Tuple[int, int, Optional[float]]:
+        entries, total_bytes, oldest = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at) FROM cv_files'
+        ).fetchone()
+        return entries, total_bytes, oldest
+
+    def _sweep(self) -> int:
+        with self._connection() as connection:
+            expired = connection.execute(
+                'DELETE FROM cv_files WHERE created_at < ?', (time.time() - self.ttl_seconds,)
+            ).rowcount
+            total_bytes = connection.execute('SELECT COALESCE(SUM(size), 0) FROM cv_files').fetchone()[0]
+        self._count('expired', expired)
+
+        evicted = self._enforce_quota(total_bytes) if total_bytes > self.max_bytes else 0
+        return expired + evicted
+
+    def _enforce_quota(self, total_bytes: int) -> int:
+        """Delete the oldest CVs until the store is back under 90% of its quota"""
+        target = self.max_bytes * 0.9
+        victims = []
+        connection = self._connection()
+        for cv_id, size in connection.execute('SELECT id, size FROM cv_files ORDER BY created_at'):
+            if total_bytes <= target:
+                break
+            victims.append((cv_id,))
+            total_bytes -= size
+
+        with connection:
+            connection.executemany('DELETE FROM cv_files WHERE id = ?', victims)
+        self._count('evicted', len(victims))
+        return len(victims)
+
+
+STORAGE_BACKENDS = {
+    LocalCVStorage.backend: LocalCVStorage,
+    SQLiteCVStorage.backend: SQLiteCVStorage,
+}
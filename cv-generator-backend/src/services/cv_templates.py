@@ -0,0 +1,277 @@
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, NamedTuple, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+DEFAULT_TEMPLATE = 'professional'
+
+# Section builder names, in the order the professional template uses them
+SECTIONS = ('header', 'summary', 'experience', 'education', 'skills')
+
+_DEFAULT_HEADINGS = {
+    'summary': 'PROFESSIONAL SUMMARY',
+    'experience': 'PROFESSIONAL EXPERIENCE',
+    'education': 'EDUCATION',
+    'skills': 'TECHNICAL SKILLS',
+}
+
+
+class CVTemplate(NamedTuple):
+    """Immutable, precompiled description of how a CV is laid out and styled"""
+    id: str
+    name: str
+    description: str
+    styles: Mapping[str, ParagraphStyle]
+    sections: Tuple[str, ...]
+    headings: Mapping[str, str]
+    margin_inches: float
+
+
+class _TemplateSpec(NamedTuple):
+    name: str
+    description: str
+    build_styles: Callable[[Mapping[str, ParagraphStyle]], Dict[str, ParagraphStyle]]
+    sections: Tuple[str, ...]
+    headings: Dict[str, str]
+    margin_inches: float
+
+
+_TEMPLATE_SPECS: Dict[str, _TemplateSpec] = {}
+_templates: Dict[str, CVTemplate] = {}
+_templates_lock = threading.Lock()
+
+
+def register_template(template_id: str, name: str, description: str, sections: Tuple[str, ...] = SECTIONS,
+                      headings: Dict[str, str] = None, margin_inches: float = 0.75):
+    """Decorator registering a style builder as a CV template.
+
+    The builder receives the ReportLab sample stylesheet and returns the
+    paragraph styles the section builders use: CVHeader, ContactInfo,
+    SectionHeader, JobTitle, Company and CVBodyText.
+    """
+    def decorator(build_styles):
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown CV sections: {', '.join(sorted(unknown))}")
+        with _templates_lock:
+            _TEMPLATE_SPECS[template_id] = _TemplateSpec(
+                name, description, build_styles, tuple(sections), {**_DEFAULT_HEADINGS, **(headings or {})},
+                margin_inches
+            )
+            # Recompile on next use if templates were already built
+            _templates.clear()
+        return build_styles
+    return decorator
+
+
+def get_template(template_id: str = DEFAULT_TEMPLATE) -> CVTemplate:
+    """Return a compiled template, building every template on first use in this process"""
+    if not _templates:
+        with _templates_lock:
+            if not _templates:
+                _templates.update(_compile_templates())
+
+    template = _templates.get(template_id)
+    if template is None:
+        raise ValueError(f"Unknown CV template '{template_id}'. Available: {', '.join(_TEMPLATE_SPECS)}")
+    return template
+
+
+def list_templates() -> List[Dict]:
+    """Return id, name and description of every registered template"""
+    return [
+        {'id': template_id, 'name': spec.name, 'description': spec.description}
+        for template_id, spec in _TEMPLATE_SPECS.items()
+    ]
+
+
+def _compile_templates() -> Dict[str, CVTemplate]:
+    sample = getSampleStyleSheet()
+    compiled = {}
+    for template_id, spec in _TEMPLATE_SPECS.items():
+        styles = spec.build_styles(sample)
+        compiled[template_id] = CVTemplate(
+            id=template_id,
+            name=spec.name,
+            description=spec.description,
+            styles=MappingProxyType(dict(styles)),
+            sections=spec.sections,
+            headings=MappingProxyType(dict(spec.headings)),
+            margin_inches=spec.margin_inches,
+        )
+    return compiled
+
+
+@register_template('professional', 'Professional', 'Clean, ATS-friendly template suitable for most industries')
+def _professional_styles(sample: Mapping[str, ParagraphStyle]) -> Dict[str, ParagraphStyle]:
+    return {
+        'CVHeader': ParagraphStyle(
+            name='CVHeader',
+            parent=sample['Heading1'],
+            fontSize=18,
+            textColor=colors.HexColor('#2563eb'),
+            alignment=TA_CENTER,
+            spaceAfter=12
+        ),
+        'SectionHeader': ParagraphStyle(
+            name='SectionHeader',
+            parent=sample['Heading2'],
+            fontSize=14,
+            textColor=colors.HexColor('#1f2937'),
+            borderWidth=1,
+            borderColor=colors.HexColor('#e5e7eb'),
+            borderPadding=6,
+            spaceBefore=12,
+            spaceAfter=6
+        ),
+        'ContactInfo': ParagraphStyle(
+            name='ContactInfo',
+            parent=sample['Normal'],
+            fontSize=10,
+            alignment=TA_CENTER,
+            spaceAfter=12
+        ),
+        'JobTitle': ParagraphStyle(
+            name='JobTitle',
+            parent=sample['Normal'],
+            fontSize=12,
+            textColor=colors.HexColor('#374151'),
+            fontName='Helvetica-Bold',
+            spaceBefore=6,
+            spaceAfter=2
+        ),
+        'Company': ParagraphStyle(
+            name='Company',
+            parent=sample['Normal'],
+            fontSize=11,
+            textColor=colors.HexColor('#6b7280'),
+            fontName='Helvetica-Oblique',
+            spaceAfter=4
+        ),
+        'CVBodyText': ParagraphStyle(
+            name='CVBodyText',
+            parent=sample['Normal'],
+            fontSize=10,
+            alignment=TA_JUSTIFY,
+            spaceAfter=6
+        ),
+    }
+
+
+@register_template(
+    'modern', 'Modern', 'Contemporary design with subtle styling',
+    sections=('header', 'summary', 'skills', 'experience', 'education'),
+    headings={'summary': 'Profile', 'experience': 'Experience', 'education': 'Education', 'skills': 'Skills'}
+)
+def _modern_styles(sample: Mapping[str, ParagraphStyle]) -> Dict[str, ParagraphStyle]:
+    accent = colors.HexColor('#0f766e')
+    return {
+        'CVHeader': ParagraphStyle(
+            name='CVHeader',
+            parent=sample['Heading1'],
+            fontSize=22,
+            leading=26,
+            textColor=accent,
+            alignment=TA_LEFT,
+            spaceAfter=4
+        ),
+        'SectionHeader': ParagraphStyle(
+            name='SectionHeader',
+            parent=sample['Heading2'],
+            fontSize=13,
+            textColor=accent,
+            spaceBefore=14,
+            spaceAfter=4
+        ),
+        'ContactInfo': ParagraphStyle(
+            name='ContactInfo',
+            parent=sample['Normal'],
+            fontSize=10,
+            textColor=colors.HexColor('#4b5563'),
+            alignment=TA_LEFT,
+            spaceAfter=10
+        ),
+        'JobTitle': ParagraphStyle(
+            name='JobTitle',
+            parent=sample['Normal'],
+            fontSize=11.5,
+            textColor=colors.HexColor('#111827'),
+            fontName='Helvetica-Bold',
+            spaceBefore=6,
+            spaceAfter=1
+        ),
+        'Company': ParagraphStyle(
+            name='Company',
+            parent=sample['Normal'],
+            fontSize=10,
+            textColor=accent,
+            spaceAfter=4
+        ),
+        'CVBodyText': ParagraphStyle(
+            name='CVBodyText',
+            parent=sample['Normal'],
+            fontSize=10,
+            leading=13,
+            alignment=TA_LEFT,
+            spaceAfter=6
+        ),
+    }
+
+
+@register_template(
+    'minimal', 'Minimal', 'Ultra-clean template focused on content',
+    headings={'summary': 'Summary', 'experience': 'Experience', 'education': 'Education', 'skills': 'Skills'},
+    margin_inches=0.6
+)
+def _minimal_styles(sample: Mapping[str, ParagraphStyle]) -> Dict[str, ParagraphStyle]:
+    return {
+        'CVHeader': ParagraphStyle(
+            name='CVHeader',
+            parent=sample['Heading1'],
+            fontSize=16,
+            textColor=colors.black,
+            alignment=TA_LEFT,
+            spaceAfter=2
+        ),
+        'SectionHeader': ParagraphStyle(
+            name='SectionHeader',
+            parent=sample['Heading3'],
+            fontSize=11,
+            textColor=colors.black,
+            spaceBefore=10,
+            spaceAfter=3
+        ),
+        'ContactInfo': ParagraphStyle(
+            name='ContactInfo',
+            parent=sample['Normal'],
+            fontSize=9,
+            alignment=TA_LEFT,
+            spaceAfter=8
+        ),
+        'JobTitle': ParagraphStyle(
+            name='JobTitle',
+            parent=sample['Normal'],
+            fontSize=10,
+            fontName='Helvetica-Bold',
+            spaceBefore=4,
+            spaceAfter=0
+        ),
+        'Company': ParagraphStyle(
+            name='Company',
+            parent=sample['Normal'],
+            fontSize=9.5,
+            textColor=colors.HexColor('#404040'),
+            spaceAfter=2
+        ),
+        'CVBodyText': ParagraphStyle(
+            name='CVBodyText',
+            parent=sample['Normal'],
+            fontSize=9.5,
+            leading=12,
+            alignment=TA_LEFT,
+            spaceAfter=4
+        ),
+    }
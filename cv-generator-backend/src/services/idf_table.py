@@ -0,0 +1,118 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+from collections import Counter
+from typing import Callable, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# File layout (little-endian):
+#   header  magic 'IDF1', document count, term count, default idf, checksum, padding (32 bytes)
+#   uint64  term hashes, sorted ascending
+#   float32 idf value for each hash
+_MAGIC = b'IDF1'
+_HEADER = struct.Struct('<4sIIf8s8x')
+_HASH_DTYPE = '<u8'
+_IDF_DTYPE = '<f4'
+
+
+def term_hash(term: str) -> int:
+    """Stable 64-bit hash of a term, identical across processes and runs"""
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class IdfTable:
+    """Read-only inverse document frequency table memory-mapped from disk.
+
+    The hash and idf arrays are views over the mapped file, so every worker
+    process shares the operating system's page cache instead of holding its
+    own copy in the Python heap.
+    """
+
+    def __init__(self, path: str):
+        if np is None:
+            raise ImportError("numpy is required to use an IDF table")
+
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.documents, count, self.default_idf, checksum = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not an IDF table")
+
+        self.checksum = checksum.hex()
+        self.hashes = np.frombuffer(self._mmap, dtype=_HASH_DTYPE, count=count, offset=_HEADER.size)
+        self.idf = np.frombuffer(
+            self._mmap, dtype=_IDF_DTYPE, count=count, offset=_HEADER.size + count * 8
+        )
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def lookup(self, terms: List[str]) -> "np.ndarray":
+        """Return the idf of each term, using the unseen-term idf for terms not in the table"""
+        if not terms or not len(self.hashes):
+            return np.full(len(terms), self.default_idf, dtype=np.float64)
+
+        hashes = np.fromiter((term_hash(term) for term in terms), dtype=np.uint64, count=len(terms))
+        positions = np.searchsorted(self.hashes, hashes)
+        positions = np.minimum(positions, len(self.hashes) - 1)
+        found = self.hashes[positions] == hashes
+        return np.where(found, self.idf[positions], self.default_idf).astype(np.float64)
+
+
+def build_idf_table(documents: Iterable[str], path: str,
+                    tokenize: Callable[[str], Iterable[str]], min_df: int = 1) -> int:
+    """Count document frequencies over a corpus and write a compact IDF table.
+
+    Uses smoothed idf, log((1 + N) / (1 + df)) + 1, and drops terms seen in
+    fewer than min_df documents; those fall back to the unseen-term idf.
+    Returns the number of terms written.
+    """
+    if np is None:
+        raise ImportError("numpy is required to build an IDF table")
+
+    document_frequency = Counter()
+    total_documents = 0
+    for document in documents:
+        total_documents += 1
+        document_frequency.update(set(tokenize(document)))
+
+    terms = [term for term, df in document_frequency.items() if df >= min_df]
+    hashes = np.fromiter((term_hash(term) for term in terms), dtype=np.uint64, count=len(terms))
+    idf = np.array(
+        [math.log((1 + total_documents) / (1 + document_frequency[term])) + 1 for term in terms],
+        dtype=np.float32
+    )
+
+    order = np.argsort(hashes, kind='stable')
+    hashes = hashes[order].astype(_HASH_DTYPE)
+    idf = idf[order].astype(_IDF_DTYPE)
+
+    default_idf = math.log(1 + total_documents) + 1
+    checksum = hashlib.blake2b(hashes.tobytes() + idf.tobytes(), digest_size=8).digest()
+    header = _HEADER.pack(_MAGIC, total_documents, len(terms), default_idf, checksum)
+
+    # Write atomically so running workers never map a half-written table
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            output.write(header)
+            output.write(hashes.tobytes())
+            output.write(idf.tobytes())
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    return len(terms)
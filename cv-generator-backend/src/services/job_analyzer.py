@@ -1,32 +1,65 @@
 import re
-import nltk
+import heapq
+import multiprocessing
 from collections import Counter
-from typing import Dict, List, Set
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Sequence, Set
+from src.services.analysis_cache import AnalysisCache
+from src.services.idf_table import IdfTable
+from src.services.keyword_matcher import KeywordMatcher
+from src.services.text_cache import ExtractedTextCache
+from src.services.text_extraction import ExtractionLimits, ExtractionResult, StreamingTextExtractor
+from src.services.tokenizer import ENGLISH_STOP_WORDS, tokenize
 try:
-    import textract
+    import numpy as np
 except ImportError:
-    textract = None
+    np = None
 import io
 
+# Bump whenever analysis output changes so cached results are invalidated
+ANALYZER_VERSION = '1.2.3'
+
+# Common job posting boilerplate ignored when counting keywords
+BOILERPLATE_PATTERN = re.compile(r'(equal opportunity employer|eoe|benefits|salary|compensation)')
+
+# Phrases that name a technology without it being in the skills dictionary;
+# matches never span lines, so each line can be analyzed on its own
+SKILL_PATTERNS = [
+    re.compile(r'(\w+)[ \t]+programming'),
+    re.compile(r'(\w+)[ \t]+development'),
+    re.compile(r'(\w+)[ \t]+framework'),
+    re.compile(r'(\w+)[ \t]+database')
+]
+
+# 'nltk' tokenizes with nltk.word_tokenize; 'fast' applies the same Punkt and
+# Treebank rules, precompiled, with a bundled abbreviation and stopword list,
+# and never imports NLTK (sentence breaks can differ, see split_sentences)
+TOKENIZER_MODES = ('nltk', 'fast')
+
 class JobAnalyzer:
-    def __init__(self):
-        # Download required NLTK data
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
+    def __init__(self, cache: AnalysisCache = None, max_workers: int = 0, tokenizer: str = 'nltk',
+                 extraction_limits: ExtractionLimits = None, extractor_backends: Dict[str, Sequence[str]] = None,
+                 text_cache: ExtractedTextCache = None, idf_table_path: str = None):
+        if tokenizer not in TOKENIZER_MODES:
+            raise ValueError(f"Unknown tokenizer mode: {tokenizer}")
         
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
+        self.cache = cache
+        self.tokenizer = tokenizer
+        self.text_extractor = StreamingTextExtractor(extraction_limits, extractor_backends, text_cache)
         
-        try:
-            nltk.data.find('taggers/averaged_perceptron_tagger')
-        except LookupError:
-            nltk.download('averaged_perceptron_tagger')
+        # Corpus IDF table for TF-IDF keyword ranking; raw frequency is used without one
+        self.idf_table = IdfTable(idf_table_path) if idf_table_path else None
         
-        self.stop_words = set(nltk.corpus.stopwords.words('english'))
+        # Process pool used by analyze_job_descriptions; created on first use
+        self.max_workers = max_workers
+        self._pool = None
+        
+        if tokenizer == 'nltk':
+            self._setup_nltk()
+        else:
+            self.stop_words = ENGLISH_STOP_WORDS
+            self._tokenize = tokenize
         
         # Common technical skills and keywords
         self.technical_skills = {
@@ -52,40 +85,212 @@ class JobAnalyzer:
             'bachelor', 'master', 'phd', 'degree', 'computer science', 'engineering',
             'mathematics', 'statistics', 'certification', 'certified'
         }
+        
+        # Soft skills, in reporting order
+        self.soft_skills_keywords = [
+            'communication', 'leadership', 'teamwork', 'problem solving',
+            'analytical', 'creative', 'detail oriented', 'organized',
+            'time management', 'adaptable', 'collaborative', 'innovative',
+            'critical thinking', 'presentation', 'interpersonal'
+        ]
+        
+        # Compile every keyword collection into a single matcher so a job
+        # description is scanned once regardless of dictionary size
+        categories = {
+            'technical': self.technical_skills,
+            'soft': self.soft_skills_keywords,
+            'education': self.education_keywords,
+        }
+        for level, indicators in self.experience_indicators.items():
+            categories[f'experience:{level}'] = indicators
+        self.keyword_matcher = KeywordMatcher(categories)
+
+    def _setup_nltk(self):
+        """Load NLTK, downloading its data on first use"""
+        import nltk
+        
+        # Download required NLTK data
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            nltk.download('punkt')
+        
+        try:
+            nltk.data.find('corpora/stopwords')
+        except LookupError:
+            nltk.download('stopwords')
+        
+        try:
+            nltk.data.find('taggers/averaged_perceptron_tagger')
+        except LookupError:
+            nltk.download('averaged_perceptron_tagger')
+        
+        self.stop_words = set(nltk.corpus.stopwords.words('english'))
+        self._tokenize = nltk.word_tokenize
 
     def extract_text_from_file(self, file_content: bytes, filename: str) -> str:
         """Extract text from uploaded file"""
-        try:
-            if filename.lower().endswith('.txt'):
-                return file_content.decode('utf-8')
-            elif filename.lower().endswith(('.doc', '.docx')):
-                return textract.process(io.BytesIO(file_content)).decode('utf-8')
-            elif filename.lower().endswith('.pdf'):
-                return textract.process(io.BytesIO(file_content)).decode('utf-8')
-            else:
-                # Try to decode as text
-                return file_content.decode('utf-8')
-        except Exception as e:
-            raise ValueError(f"Could not extract text from file: {str(e)}")
+        return self.extract_text_from_stream(io.BytesIO(file_content), filename).text
+
+    def extract_text_from_stream(self, stream: BinaryIO, filename: str) -> ExtractionResult:
+        """Extract text from an upload stream page by page, within the configured limits"""
+        return self.text_extractor.extract(stream, filename)
+
+    @property
+    def cache_tag(self) -> str:
+        """Identify the analyzer configuration that produced a cached result"""
+        idf_tag = self.idf_table.checksum if self.idf_table is not None else 'tf'
+        return f"{ANALYZER_VERSION}:{self.tokenizer}:{idf_tag}"
 
     def analyze_job_description(self, text: str) -> Dict:
         """Analyze job description and extract key information"""
-        text = text.lower()
+        text = self._normalize_text(text)
+        
+        if self.cache is None:
+            return self._analyze_normalized(text)
+        
+        cache_key = AnalysisCache.make_key(text, self.cache_tag)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        analysis = self._analyze_normalized(text)
+        self.cache.set(cache_key, analysis)
+        return analysis
+
+    def analyze_job_descriptions(self, texts: List[str]) -> List[Dict]:
+        """Analyze many job descriptions, fanning cache misses out to the process pool.
+        
+        Results are returned in input order; each item is either
+        {'success': True, 'analysis': ...} or {'success': False, 'error': ...}.
+        """
+        results: List[Optional[Dict]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        cache_keys: Dict[str, str] = {}
+        
+        for index, text in enumerate(texts):
+            if not isinstance(text, str):
+                results[index] = {'success': False, 'error': 'Job description must be a string.'}
+                continue
+            if not text.strip():
+                results[index] = {'success': False, 'error': 'Job description is empty.'}
+                continue
+            
+            normalized = self._normalize_text(text)
+            if self.cache is not None and normalized not in pending:
+                cache_key = AnalysisCache.make_key(normalized, self.cache_tag)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    results[index] = {'success': True, 'analysis': cached}
+                    continue
+                cache_keys[normalized] = cache_key
+            
+            # Identical postings in one batch are analyzed once
+            pending.setdefault(normalized, []).append(index)
+        
+        unique_texts = list(pending)
+        for normalized, outcome in zip(unique_texts, self._analyze_many(unique_texts)):
+            if outcome['success'] and normalized in cache_keys:
+                self.cache.set(cache_keys[normalized], outcome['analysis'])
+            # Each index gets its own dict, so callers can annotate one without touching its duplicates
+            for index in pending[normalized]:
+                results[index] = dict(outcome)
+        
+        return results
+
+    def _analyze_many(self, texts: List[str]) -> List[Dict]:
+        """Analyze normalized texts in the pool, or inline when a pool would not pay off"""
+        if self.max_workers <= 1 or len(texts) < 2:
+            return [_analyze_safely(self, text) for text in texts]
+        
+        pool = self._get_pool()
+        chunksize = max(1, len(texts) // (self.max_workers * 4))
+        try:
+            return list(pool.map(_analyze_in_worker, texts, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            # A crashed worker poisons the pool; drop it so the next batch starts fresh
+            self.shutdown()
+            return [{'success': False, 'error': f'Analysis worker failed: {str(e)}'} for _ in texts]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # Spawned workers avoid inheriting locks and sockets from a threaded server
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self._worker_options(),)
+            )
+        return self._pool
+
+    def _worker_options(self) -> Dict:
+        """Constructor arguments used to build the analyzer inside each pool worker"""
+        return {
+            'tokenizer': self.tokenizer,
+            'idf_table_path': self.idf_table.path if self.idf_table is not None else None
+        }
+
+    def shutdown(self):
+        """Stop the analysis process pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _normalize_text(self, text: str) -> str:
+        """Lowercase and collapse insignificant whitespace so equivalent postings share a cache key"""
+        text = text.lower().replace('\r\n', '\n').replace('\r', '\n')
+        lines = [re.sub(r'[ \t\f\v]+', ' ', line).strip() for line in text.split('\n')]
+        return '\n'.join(lines).strip()
+
+    def _analyze_normalized(self, text: str) -> Dict:
+        """Run the full analysis over already-normalized text"""
+        return self._build_analysis([self._extract_fragment(text)], text)
+
+    def _extract_fragment(self, text: str) -> Dict[str, Counter]:
+        """Count keyword tokens, dictionary terms and skill patterns in a piece of normalized text.
+        
+        Fragment counts are additive, so a document's totals can be kept up to
+        date paragraph by paragraph (see AnalysisSession).
+        """
+        return {
+            'keywords': self._keyword_counts(text),
+            'terms': Counter((match.category, match.term) for match in self.keyword_matcher.find_all(text)),
+            'patterns': Counter(
+                (index, word)
+                for index, pattern in enumerate(SKILL_PATTERNS)
+                for word in pattern.findall(text)
+            ),
+        }
+
+    def _build_analysis(self, fragments: List[Dict[str, Counter]], text: str,
+                        totals: Dict[str, Counter] = None, order: Callable[[Iterable, str], List] = None) -> Dict:
+        """Assemble the analysis result from fragment counts in document order.
+        
+        order(keys, field) sorts keys of a field by first appearance; by default
+        the fragments are scanned for them.
+        """
+        if totals is None:
+            totals = fragments[0] if len(fragments) == 1 else self._sum_fragments(fragments)
+        if order is None:
+            order = lambda keys, field: self._order_by_first_appearance(keys, fragments, field)
         
         # Extract keywords
-        keywords = self._extract_keywords(text)
+        keywords = self._rank_keywords(totals['keywords'], order)
+        
+        # Dictionary terms found, in order of first appearance
+        terms = order(totals['terms'], 'terms')
         
         # Extract technical skills
-        technical_skills = self._extract_technical_skills(text)
+        technical_skills = self._extract_technical_skills(terms, totals, order)
         
         # Determine experience level
-        experience_level = self._determine_experience_level(text)
+        experience_level = self._determine_experience_level(terms)
         
         # Extract education requirements
-        education_requirements = self._extract_education_requirements(text)
+        education_requirements = self._extract_education_requirements(terms)
         
         # Extract soft skills
-        soft_skills = self._extract_soft_skills(text)
+        soft_skills = self._extract_soft_skills(terms)
         
         # Extract job title and company info
         job_info = self._extract_job_info(text)
@@ -106,6 +311,26 @@ class JobAnalyzer:
             )
         }
 
+    def _sum_fragments(self, fragments: List[Dict[str, Counter]]) -> Dict[str, Counter]:
+        totals = {'keywords': Counter(), 'terms': Counter(), 'patterns': Counter()}
+        for fragment in fragments:
+            for field, counts in fragment.items():
+                totals[field].update(counts)
+        return totals
+
+    def _order_by_first_appearance(self, wanted, fragments: List[Dict[str, Counter]], field: str) -> List:
+        """Order keys by where they first appear across fragments (counters keep insertion order)"""
+        remaining = set(wanted)
+        ordered = []
+        for fragment in fragments:
+            if not remaining:
+                break
+            for key in fragment[field]:
+                if key in remaining:
+                    ordered.append(key)
+                    remaining.discard(key)
+        return ordered
+
     def _calculate_ats_score(self, keywords: List[str], technical_skills: List[str], soft_skills: List[str]) -> Dict:
         """Calculate ATS optimization score based on job analysis"""
         score_factors = {
@@ -137,73 +362,74 @@ class JobAnalyzer:
 
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract important keywords from job description"""
+        counts = self._keyword_counts(text)
+        return self._rank_keywords(
+            counts, lambda keys, field: self._order_by_first_appearance(keys, [{field: counts}], field)
+        )
+
+    def _keyword_counts(self, text: str) -> Counter:
+        """Count candidate keyword tokens in order of first appearance"""
         # Remove common job posting boilerplate
-        text = re.sub(r'(equal opportunity employer|eoe|benefits|salary|compensation)', '', text)
+        text = BOILERPLATE_PATTERN.sub('', text)
         
         # Tokenize and filter
-        tokens = nltk.word_tokenize(text)
+        tokens = self._tokenize(text)
         
         # Filter out stop words and short words
-        keywords = [word for word in tokens 
-                   if word.isalpha() and len(word) > 2 and word not in self.stop_words]
+        return Counter(word for word in tokens
+                       if word.isalpha() and len(word) > 2 and word not in self.stop_words)
+
+    def _rank_keywords(self, counts: Counter, order: Callable[[Iterable, str], List]) -> List[str]:
+        """Return the 20 highest scoring keywords, breaking ties by first appearance.
+        
+        Keywords are scored by raw frequency, or by TF-IDF when an IDF table is loaded.
+        """
+        if not counts:
+            return []
+        
+        scores = counts if self.idf_table is None else self._tfidf_scores(counts)
+        threshold = heapq.nlargest(20, scores.values())[-1]
+        candidates = [word for word, score in scores.items() if score >= threshold]
+        ordered = order(candidates, 'keywords')
         
-        # Count frequency and return top keywords
-        keyword_freq = Counter(keywords)
-        return [word for word, count in keyword_freq.most_common(20)]
+        # sorted() is stable, so equal scores keep their first-appearance order
+        return sorted(ordered, key=lambda word: -scores[word])[:20]
 
-    def _extract_technical_skills(self, text: str) -> List[str]:
+    def _tfidf_scores(self, counts: Counter) -> Dict[str, float]:
+        """Score every keyword as term frequency times corpus IDF in one vectorized lookup"""
+        words = list(counts)
+        term_frequency = np.fromiter(counts.values(), dtype=np.float64, count=len(words))
+        scores = term_frequency * self.idf_table.lookup(words)
+        return dict(zip(words, scores.tolist()))
+
+    def _extract_technical_skills(self, terms: List, totals: Dict[str, Counter],
+                                  order: Callable[[Iterable, str], List]) -> List[str]:
         """Extract technical skills mentioned in job description"""
-        found_skills = []
-        
-        for skill in self.technical_skills:
-            if skill in text:
-                found_skills.append(skill)
-        
-        # Also look for common patterns
-        patterns = [
-            r'(\w+)\s+programming',
-            r'(\w+)\s+development',
-            r'(\w+)\s+framework',
-            r'(\w+)\s+database'
-        ]
+        found_skills = [term for category, term in terms if category == 'technical']
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            found_skills.extend(matches)
+        # Also look for common patterns, grouped by pattern
+        pattern_matches = order(totals['patterns'], 'patterns')
+        for index in range(len(SKILL_PATTERNS)):
+            found_skills.extend(word for pattern_index, word in pattern_matches if pattern_index == index)
         
-        return list(set(found_skills))
+        return list(dict.fromkeys(found_skills))
 
-    def _extract_soft_skills(self, text: str) -> List[str]:
+    def _extract_soft_skills(self, terms: List) -> List[str]:
         """Extract soft skills from job description"""
-        soft_skills_keywords = [
-            'communication', 'leadership', 'teamwork', 'problem solving',
-            'analytical', 'creative', 'detail oriented', 'organized',
-            'time management', 'adaptable', 'collaborative', 'innovative',
-            'critical thinking', 'presentation', 'interpersonal'
-        ]
-        
-        found_skills = []
-        for skill in soft_skills_keywords:
-            if skill in text:
-                found_skills.append(skill)
-        
-        return found_skills
+        found = {term for category, term in terms if category == 'soft'}
+        return [skill for skill in self.soft_skills_keywords if skill in found]
 
-    def _determine_experience_level(self, text: str) -> str:
+    def _determine_experience_level(self, terms: List) -> str:
         """Determine required experience level"""
-        for level, indicators in self.experience_indicators.items():
-            for indicator in indicators:
-                if indicator in text:
-                    return level
+        categories = {category for category, _ in terms}
+        for level in self.experience_indicators:
+            if f'experience:{level}' in categories:
+                return level
         return 'not_specified'
 
-    def _extract_education_requirements(self, text: str) -> List[str]:
+    def _extract_education_requirements(self, terms: List) -> List[str]:
         """Extract education requirements"""
-        requirements = []
-        for keyword in self.education_keywords:
-            if keyword in text:
-                requirements.append(keyword)
-        return list(set(requirements))
+        return [term for category, term in terms if category == 'education']
 
     def _extract_job_info(self, text: str) -> Dict:
         """Extract job title and company information"""
@@ -250,3 +476,20 @@ class JobAnalyzer:
         
         return suggestions
 
+
+# Analyzer owned by a pool worker process, built once by _init_worker
+_worker_analyzer = None
+
+def _init_worker(options: Dict):
+    global _worker_analyzer
+    _worker_analyzer = JobAnalyzer(**options)
+
+def _analyze_in_worker(text: str) -> Dict:
+    return _analyze_safely(_worker_analyzer, text)
+
+def _analyze_safely(analyzer: JobAnalyzer, text: str) -> Dict:
+    """Analyze normalized text, reporting failures per item instead of raising"""
+    try:
+        return {'success': True, 'analysis': analyzer._analyze_normalized(text)}
+    except Exception as e:
+        return {'success': False, 'error': f'Analysis failed: {str(e)}'}
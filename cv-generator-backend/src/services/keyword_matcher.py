@@ -0,0 +1,106 @@
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+
+class KeywordMatch(NamedTuple):
+    term: str
+    category: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds whole-word terms of every category in one pass"""
+
+    def __init__(self, categories: Dict[str, Iterable[str]] = None):
+        # Each node is a dict of child transitions; fail links and outputs are
+        # kept in parallel lists indexed by node id
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        self._compiled = False
+
+        for category, terms in (categories or {}).items():
+            for term in terms:
+                self.add(term, category)
+        self.compile()
+
+    def add(self, term: str, category: str):
+        """Register a term under a category (terms are matched case-sensitively)"""
+        if not term:
+            return
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        if (term, category) not in self._output[node]:
+            self._output[node].append((term, category))
+        self._compiled = False
+
+    def compile(self):
+        """Build failure links breadth-first so matching never backtracks"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit outputs of the suffix state so overlapping terms are reported
+                self._output[child] = self._output[child] + [
+                    out for out in self._output[self._fail[child]] if out not in self._output[child]
+                ]
+
+        self._compiled = True
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """Return every whole-word occurrence of a registered term, in text order"""
+        if not self._compiled:
+            self.compile()
+
+        matches = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        text_length = len(text)
+
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            if not output[node]:
+                continue
+
+            end = index + 1
+            after_ok = end == text_length or not text[end].isalnum()
+            for term, category in output[node]:
+                start = end - len(term)
+                # Only accept matches that sit on word boundaries, so "mid" does
+                # not match inside "middleware" and "api" not inside "capital"
+                before_ok = start == 0 or not text[start - 1].isalnum()
+                if before_ok and after_ok:
+                    matches.append(KeywordMatch(term, category, start, end))
+
+        return matches
+
+    def find_by_category(self, text: str) -> Dict[str, List[KeywordMatch]]:
+        """Group matches by category, preserving text order within each category"""
+        grouped: Dict[str, List[KeywordMatch]] = {}
+        for match in self.find_all(text):
+            grouped.setdefault(match.category, []).append(match)
+        return grouped
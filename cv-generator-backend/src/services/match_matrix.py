@@ -0,0 +1,161 @@
+from typing import Dict, List, Tuple
+
+from src.services.cv_generator import CVGenerator
+from src.services.profile_index import ProfileIndex
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+# Points awarded by validate_ats_compatibility for job alignment
+KEYWORD_POINTS = 15
+SKILL_POINTS = 15
+TOP_KEYWORDS = 10
+
+
+class MatchMatrix:
+    """ATS match scores for many candidate profiles against many job analyses.
+
+    Job keywords and skills form one shared vocabulary. Profiles and jobs are
+    encoded once as sparse vectors over it, and the whole score matrix is
+    two sparse products on top of each profile's section score:
+
+        scores = base + P_text @ K + P_skills @ S
+
+    P_text marks vocabulary terms that appear as whole words in a profile,
+    P_skills marks terms listed among its technical skills, and K and S hold
+    the points each job awards per matched keyword and skill. Profiles are
+    read through the same ProfileIndex as
+    CVGenerator.validate_ats_compatibility, so the scores are identical.
+    """
+
+    def __init__(self, profiles: List[Dict], job_analyses: List[Dict]):
+        if np is None:
+            raise ImportError("numpy and scipy are required for bulk matching")
+
+        self.profile_count = len(profiles)
+        self.job_count = len(job_analyses)
+
+        self.vocabulary: Dict[str, int] = {}
+        keyword_weights = self._encode_jobs(job_analyses, 'keywords')
+        skill_weights = self._encode_jobs(job_analyses, 'technical_skills')
+
+        vocabulary_size = len(self.vocabulary)
+        self.keyword_weights = keyword_weights.to_matrix((vocabulary_size, self.job_count))
+        self.skill_weights = skill_weights.to_matrix((vocabulary_size, self.job_count))
+
+        self.base_scores = np.array(
+            [CVGenerator.score_profile_sections(profile)[0] for profile in profiles],
+            dtype=np.float64
+        )
+        self.profile_terms, self.profile_skills = self._encode_profiles(profiles)
+
+        self._scores = None
+
+    @property
+    def scores(self) -> "np.ndarray":
+        """Dense profiles x jobs matrix of ATS scores, computed on first access"""
+        if self._scores is None:
+            alignment = self.profile_terms @ self.keyword_weights + self.profile_skills @ self.skill_weights
+            self._scores = np.asarray(alignment.todense()) + self.base_scores[:, np.newaxis]
+        return self._scores
+
+    def top_k(self, k: int, by: str = 'job') -> List[List[Tuple[int, float]]]:
+        """Return the k best (index, score) pairs for each job or each candidate.
+
+        by='job' ranks candidates for every job; by='candidate' ranks jobs for
+        every candidate. Ties keep the lower index first.
+        """
+        if by not in ('job', 'candidate'):
+            raise ValueError("by must be 'job' or 'candidate'")
+
+        scores = self.scores.T if by == 'job' else self.scores
+        rows, columns = scores.shape
+        k = min(k, columns)
+        if k <= 0 or rows == 0:
+            return [[] for _ in range(rows)]
+
+        # Negate and use a stable sort on the partitioned slice so ties keep index order
+        if k < columns:
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            candidates.sort(axis=1)
+        else:
+            candidates = np.tile(np.arange(columns), (rows, 1))
+        picked = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-picked, axis=1, kind='stable')
+        indices = np.take_along_axis(candidates, order, axis=1)
+        values = np.take_along_axis(picked, order, axis=1)
+
+        return [
+            [(int(index), round(float(value), 1)) for index, value in zip(row_indices, row_values)]
+            for row_indices, row_values in zip(indices, values)
+        ]
+
+    def _term_index(self, term: str) -> int:
+        index = self.vocabulary.get(term)
+        if index is None:
+            index = self.vocabulary[term] = len(self.vocabulary)
+        return index
+
+    def _encode_jobs(self, job_analyses: List[Dict], field: str) -> "_Triplets":
+        """Collect the points each job awards per matched term of one field"""
+        weights = _Triplets()
+        for column, analysis in enumerate(job_analyses):
+            terms = [term.lower() for term in analysis.get(field, []) if isinstance(term, str) and term]
+            if field == 'keywords':
+                # The keyword score is out of the top ten, however many there are
+                terms = terms[:TOP_KEYWORDS]
+                points = KEYWORD_POINTS / TOP_KEYWORDS
+            elif terms:
+                points = SKILL_POINTS / len(terms)
+            # Repeated terms are summed when the matrix is built, matching the
+            # per-entry counting of validate_ats_compatibility
+            for term in terms:
+                weights.append(self._term_index(term), column, points)
+        return weights
+
+    def _encode_profiles(self, profiles: List[Dict]):
+        """Build the binary profiles x vocabulary term and skill matrices"""
+        # Single words are a set intersection with each profile's words;
+        # only phrases need ProfileIndex's text search
+        words = {term for term in self.vocabulary if ProfileIndex.is_word(term)}
+        phrases = [term for term in self.vocabulary if term not in words]
+        terms = _Triplets()
+        skills = _Triplets()
+
+        for row, user_data in enumerate(profiles):
+            profile = ProfileIndex(user_data)
+            found = (profile.tokens & words).union(term for term in phrases if profile.has_term(term))
+            for term in found:
+                terms.append(row, self.vocabulary[term], 1.0)
+
+            for skill in profile.skills['technical_skills']:
+                index = self.vocabulary.get(skill)
+                if index is not None:
+                    skills.append(row, index, 1.0)
+
+        shape = (self.profile_count, len(self.vocabulary))
+        return terms.to_matrix(shape), skills.to_matrix(shape)
+
+
+class _Triplets:
+    """Row, column and value lists accumulated before building a sparse matrix"""
+
+    def __init__(self):
+        self.rows: List[int] = []
+        self.columns: List[int] = []
+        self.values: List[float] = []
+
+    def append(self, row: int, column: int, value: float):
+        self.rows.append(row)
+        self.columns.append(column)
+        self.values.append(value)
+
+    def to_matrix(self, shape: Tuple[int, int]) -> "sparse.csr_matrix":
+        # COO to CSR conversion sums duplicate entries
+        return sparse.coo_matrix(
+            (np.array(self.values, dtype=np.float64), (self.rows, self.columns)), shape=shape
+        ).tocsr()
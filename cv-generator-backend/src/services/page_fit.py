@@ -0,0 +1,252 @@
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph
+
+from src.services.cv_document import SPACER, Block, CVDocument
+from src.services.cv_templates import CVTemplate
+
+# (font scale, spacing scale) tried in order, from the template as designed
+# down to the tightest layout that still reads comfortably
+FIT_STEPS = (
+    (1.0, 1.0),
+    (1.0, 0.75),
+    (0.95, 0.75),
+    (0.95, 0.5),
+    (0.9, 0.5),
+    (0.85, 0.4),
+)
+
+# Bullets every job keeps when low-priority bullets are trimmed
+MIN_BULLETS_PER_JOB = 1
+
+# Padding SimpleDocTemplate's frame leaves inside the page margins
+_FRAME_PADDING = 6
+
+# Frame overflow ReportLab tolerates before moving a flowable to the next page
+_FUZZ = 1e-6
+
+
+class Measurement(NamedTuple):
+    height: float
+    lines: int
+
+
+class MeasurementCache:
+    """Bounded LRU of wrapped paragraph heights.
+
+    Keyed by paragraph markup, the style attributes that affect line
+    breaking and the frame width, so every layout the page-fit search tries
+    only wraps the paragraphs it has not seen at that size before. The
+    cache is per process and shared by every CV rendered in it.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Measurement]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def make_key(markup: str, style: ParagraphStyle, width: float) -> tuple:
+        return (
+            markup, style.fontName, style.fontSize, style.leading, style.leftIndent,
+            style.rightIndent, style.firstLineIndent, style.wordWrap, width
+        )
+
+    def measure(self, markup: str, style: ParagraphStyle, width: float) -> Measurement:
+        """Return the height and line count of markup wrapped to width"""
+        key = self.make_key(markup, style, width)
+        with self._lock:
+            found = self._entries.get(key)
+            if found is not None:
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return found
+            self._counters['misses'] += 1
+
+        paragraph = Paragraph(markup, style)
+        _, height = paragraph.wrap(width, 1e9)
+        measurement = Measurement(height, len(paragraph.blPara.lines))
+
+        with self._lock:
+            self._entries[key] = measurement
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+        return measurement
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                **self._counters,
+                'hit_rate': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+            }
+
+
+class FittedLayout(NamedTuple):
+    """The layout chosen for a page target: scaled template, possibly trimmed document"""
+    template: CVTemplate
+    document: CVDocument
+    pages: int
+    font_scale: float
+    space_scale: float
+    trimmed_bullets: int
+
+
+_measurements = MeasurementCache()
+
+
+def measurement_stats() -> Dict:
+    return _measurements.stats()
+
+
+def scale_template(template: CVTemplate, font_scale: float, space_scale: float) -> CVTemplate:
+    """Copy of template with font sizes and leading scaled by font_scale and paragraph spacing by space_scale"""
+    if font_scale == 1 and space_scale == 1:
+        return template
+    styles = {
+        name: ParagraphStyle(
+            style.name,
+            parent=style,
+            fontSize=style.fontSize * font_scale,
+            leading=style.leading * font_scale,
+            spaceBefore=style.spaceBefore * space_scale,
+            spaceAfter=style.spaceAfter * space_scale,
+        )
+        for name, style in template.styles.items()
+    }
+    return template._replace(styles=MappingProxyType(styles))
+
+
+def block_markup(block: Block) -> str:
+    """Paragraph markup a block is rendered with.
+
+    Line breaks become <br/>, since a Paragraph would otherwise collapse them
+    and run every bullet of a job into one line of extracted text.
+    """
+    text = block.text.replace('\n', '<br/>')
+    return f"<b>{block.label}</b> {text}" if block.label else text
+
+
+def fit_to_pages(document: CVDocument, template: CVTemplate, pages: int,
+                 cache: Optional[MeasurementCache] = None, slack: float = 0) -> FittedLayout:
+    """Find the most generous layout whose estimated page count is at most pages.
+
+    Each FIT_STEPS layout is tried in turn. When even the tightest one is
+    too long, the last bullets of the oldest jobs are dropped, one at a
+    time, down to MIN_BULLETS_PER_JOB per job. Heights come from the
+    measurement cache, so trying a layout costs one page-count pass over
+    cached measurements rather than a full PDF build. slack points are
+    kept free on every page, for callers re-fitting after an estimate fell
+    short. If nothing fits, the tightest fully trimmed layout is returned
+    and its pages exceed the target.
+    """
+    cache = cache or _measurements
+    width, frame_height = frame_size(template)
+    frame_height -= slack
+
+    for font_scale, space_scale in FIT_STEPS:
+        scaled = scale_template(template, font_scale, space_scale)
+        spaced = _scale_spacers(document, space_scale)
+        count = count_pages(spaced, scaled, width, frame_height, cache)
+        if count <= pages:
+            return FittedLayout(scaled, spaced, count, font_scale, space_scale, 0)
+
+    trimmed = 0
+    for spaced in _trimmed_documents(spaced):
+        trimmed += 1
+        count = count_pages(spaced, scaled, width, frame_height, cache)
+        if count <= pages:
+            return FittedLayout(scaled, spaced, count, font_scale, space_scale, trimmed)
+
+    return FittedLayout(scaled, spaced, count, font_scale, space_scale, trimmed)
+
+
+def frame_size(template: CVTemplate) -> Tuple[float, float]:
+    """Width and height available to flowables on an A4 page with the template's margins"""
+    page_width, page_height = A4
+    margin = template.margin_inches * inch
+    return (page_width - 2 * margin - 2 * _FRAME_PADDING,
+            page_height - 2 * margin - 2 * _FRAME_PADDING)
+
+
+def count_pages(document: CVDocument, template: CVTemplate, width: float, frame_height: float,
+                cache: MeasurementCache) -> int:
+    """Estimate the pages the document fills, following ReportLab's frame rules.
+
+    Space before a paragraph is dropped at the top of a page, and a
+    paragraph that does not fit is split between lines when at least two of
+    them fit on the current page (ReportLab's default orphan control).
+    """
+    pages = 1
+    remaining = frame_height
+    at_top = True
+    for block in document.blocks:
+        if block.style == SPACER:
+            height, before, after, leading, lines = block.space, 0, 0, 0, 1
+        else:
+            style = template.styles[block.style]
+            height, lines = cache.measure(block_markup(block), style, width)
+            before, after, leading = style.spaceBefore, style.spaceAfter, style.leading
+
+        while True:
+            space = 0 if at_top else before
+            if height + space <= remaining + _FUZZ:
+                remaining -= height + space + after
+                at_top = False
+                break
+            if leading and lines > 1:
+                fitting = int((remaining - space) / leading)
+                if 2 <= fitting < lines:
+                    lines -= fitting
+                    height = lines * leading
+            if at_top:
+                # Taller than a whole page and unsplittable; ReportLab would fail too
+                break
+            pages += 1
+            remaining = frame_height
+            at_top = True
+    return pages
+
+
+def _scale_spacers(document: CVDocument, space_scale: float) -> CVDocument:
+    if space_scale == 1:
+        return document
+    return document._replace(sections=tuple(
+        (section, tuple(
+            block._replace(space=block.space * space_scale) if block.style == SPACER else block
+            for block in blocks
+        ))
+        for section, blocks in document.sections
+    ))
+
+
+def _trimmed_documents(document: CVDocument):
+    """Yield the document with one more low-priority bullet dropped each time.
+
+    Bullets go from the end of the oldest job first, and every job keeps at
+    least MIN_BULLETS_PER_JOB of them.
+    """
+    sections = [(section, list(blocks)) for section, blocks in document.sections]
+    for section, blocks in sections:
+        if section != 'experience':
+            continue
+        descriptions = [i for i, block in enumerate(blocks) if block.style == 'CVBodyText']
+        for index in reversed(descriptions):
+            bullets = blocks[index].text.split('\n')
+            while len(bullets) > MIN_BULLETS_PER_JOB:
+                bullets.pop()
+                blocks[index] = blocks[index]._replace(text='\n'.join(bullets))
+                yield document._replace(sections=tuple(
+                    (name, tuple(section_blocks)) for name, section_blocks in sections
+                ))
+
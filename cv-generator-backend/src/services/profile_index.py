@@ -0,0 +1,93 @@
+import re
+from typing import Dict, Set
+
+# Runs of letters and digits; matches KeywordMatcher's word boundaries, where
+# anything that is not alphanumeric (including '_') separates words
+_TOKEN = re.compile(r'[^\W_]+')
+
+SKILL_CATEGORIES = ('technical_skills', 'soft_skills', 'languages', 'certifications')
+
+
+def profile_text(user_data) -> str:
+    """Lowercased user-visible text of a profile: every string value, one per line.
+
+    Dictionary keys are left out so field names such as 'skills' or
+    'description' never count as keyword matches.
+    """
+    values = []
+    pending = [user_data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, str):
+            values.append(value)
+        elif isinstance(value, dict):
+            pending.extend(reversed(list(value.values())))
+        elif isinstance(value, (list, tuple)):
+            pending.extend(reversed(value))
+        elif value is not None:
+            values.append(str(value))
+    return '\n'.join(values).lower()
+
+
+class ProfileIndex:
+    """Normalized, searchable view of one profile, built once and shared per request.
+
+    Holds the lowercased text of the user-visible fields, the set of words
+    in it, the same per top-level section, and the lowercased skills of each
+    category. Single-word terms are answered with a set lookup; phrases and
+    terms with punctuation ("machine learning", "node.js") fall back to a
+    whole-word search of the text, and every answer is memoized.
+    """
+
+    def __init__(self, user_data: Dict):
+        self.user_data = user_data or {}
+
+        self.section_text: Dict[str, str] = {}
+        self.section_terms: Dict[str, Set[str]] = {}
+        for section, value in self.user_data.items():
+            text = profile_text(value)
+            self.section_text[section] = text
+            self.section_terms[section] = set(_TOKEN.findall(text))
+
+        self.text = '\n'.join(self.section_text.values())
+        self.tokens: Set[str] = set().union(*self.section_terms.values())
+
+        skills = self.user_data.get('skills') or {}
+        self.skills: Dict[str, Set[str]] = {
+            category: {skill.lower() for skill in skills.get(category) or [] if isinstance(skill, str)}
+            for category in SKILL_CATEGORIES
+        }
+
+        self._term_cache: Dict[str, bool] = {}
+
+    def has_term(self, term: str) -> bool:
+        """Whether term occurs as a whole word or phrase anywhere in the profile"""
+        lowered = term.lower().strip()
+        found = self._term_cache.get(lowered)
+        if found is None:
+            found = self._term_cache[lowered] = self._search(lowered)
+        return found
+
+    def has_skill(self, skill: str, category: str = 'technical_skills') -> bool:
+        """Whether skill is listed (case-insensitively) under a skills category"""
+        return skill.lower() in self.skills.get(category, ())
+
+    @staticmethod
+    def is_word(term: str) -> bool:
+        """Whether a lowercased term is a single word, answerable from the token set alone"""
+        return _TOKEN.fullmatch(term) is not None
+
+    def _search(self, lowered: str) -> bool:
+        if self.is_word(lowered):
+            return lowered in self.tokens
+        words = _TOKEN.findall(lowered)
+        if not words:
+            return False
+        # Every word of the phrase must be present before the text is searched
+        if not self.tokens.issuperset(words):
+            return False
+        # Words of a phrase may be separated by any run of spaces, but not by
+        # the line breaks that separate one field's value from the next
+        phrase = r'[^\S\n]+'.join(re.escape(part) for part in lowered.split())
+        pattern = rf'(?<![^\W_]){phrase}(?![^\W_])'
+        return re.search(pattern, self.text) is not None
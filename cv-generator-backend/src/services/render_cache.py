@@ -0,0 +1,102 @@
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, Optional
+
+from src.services.text_cache import ExtractedTextCache
+
+_KEY_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+class RenderedCVCache(ExtractedTextCache):
+    """Content-addressed on-disk cache of rendered CV PDFs.
+
+    Keys hash everything that affects the output, so a key doubles as the
+    CV id: generating the same profile for the same job and template again
+    returns the stored PDF without running ReportLab.
+    """
+
+    _suffix = '.pdf'
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(directory, max_bytes=max_bytes)
+        self._renders = 0
+        self._render_seconds = 0.0
+
+    @staticmethod
+    def make_key(user_data: Dict, job_analysis: Optional[Dict], template_id: str, version: str,
+                 compact: bool = False, fit_pages: Optional[int] = None) -> str:
+        """Hash a canonical JSON encoding of the render inputs"""
+        inputs = {
+            'user_data': user_data,
+            'job_analysis': job_analysis,
+            'template': template_id,
+            'version': version,
+        }
+        # Only present when set, so keys of default renders stay unchanged
+        if compact:
+            inputs['compact'] = True
+        if fit_pages:
+            inputs['fit_pages'] = fit_pages
+        payload = json.dumps(
+            inputs,
+            sort_keys=True,
+            separators=(',', ':'),
+            ensure_ascii=False,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_key(value: str) -> bool:
+        return bool(_KEY_PATTERN.fullmatch(value))
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the path of the cached PDF for a key, marking it recently used.
+
+        Recency is recorded in the access time only; the modification time
+        stays that of the render, so the file's Last-Modified never moves.
+        """
+        path = self._path(key)
+        try:
+            info = os.stat(path)
+            os.utime(path, ns=(time.time_ns(), info.st_mtime_ns))
+        except OSError:
+            with self._lock:
+                self._counters['misses'] += 1
+            return None
+
+        with self._lock:
+            self._counters['hits'] += 1
+        return path
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Return the cached PDF bytes for a key, marking it recently used"""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as cv_file:
+                return cv_file.read()
+        except OSError:
+            # Evicted between the lookup and the read
+            return None
+
+    def set(self, key: str, pdf_bytes: bytes, render_seconds: float = 0.0) -> Optional[str]:
+        """Store a rendered PDF and return its path, or None if it could not be written"""
+        with self._lock:
+            self._renders += 1
+            self._render_seconds += render_seconds
+        return self._store(key, lambda temp_file: temp_file.write(pdf_bytes))
+
+    def stats(self) -> Dict:
+        """Return cache counters plus the render time the hits are estimated to have saved"""
+        stats = super().stats()
+        with self._lock:
+            average = self._render_seconds / self._renders if self._renders else 0.0
+            stats['renders'] = self._renders
+            stats['average_render_seconds'] = round(average, 4)
+            stats['estimated_render_seconds_saved'] = round(average * stats['hits'], 3)
+        return stats
@@ -0,0 +1,463 @@
+import ctypes
+import math
+import multiprocessing
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from io import BytesIO
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.services.cv_generator import CVGenerator
+from src.services.cv_templates import DEFAULT_TEMPLATE, get_template
+from src.services.profile_index import ProfileIndex
+
+
+class RenderPoolBusy(RuntimeError):
+    """Raised when the render queue is full; retry_after is a suggested wait in seconds"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Render queue is full, retry after {retry_after} seconds")
+        self.retry_after = retry_after
+
+
+class RenderTimeoutError(TimeoutError):
+    """Raised when a render does not finish within the pool's timeout"""
+
+
+class _RenderExpired(BaseException):
+    """Raised into a render that outlived its deadline; not an Exception, so ReportLab cannot swallow it"""
+
+
+# Extra seconds a timed-out render gets to stop on its own before its pool's workers are terminated
+STUCK_RENDER_GRACE = 5.0
+
+
+class RenderBatch:
+    """Iterator over render_many results that owns the batch's first queue slot until iteration starts.
+
+    The rendering generator only runs its cleanup once started, so a batch
+    that is dropped or closed before its first result (say, the client went
+    away before the response streamed) releases the slot here instead.
+    """
+
+    def __init__(self, results: Iterator[Tuple[int, Optional[bytes], Optional[str]]], release_slot):
+        self._results = results
+        self._release_slot = weakref.finalize(self, release_slot)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Tuple[int, Optional[bytes], Optional[str]]:
+        # From the first result on, the generator releases the slot itself
+        self._release_slot.detach()
+        return next(self._results)
+
+    def close(self):
+        """Stop rendering and free the batch's queue slots"""
+        self._release_slot()
+        self._results.close()
+
+
+class RenderPool:
+    """Renders CV PDFs in worker processes with a bounded queue.
+
+    ReportLab layout is pure Python, so renders on server threads serialize on
+    the GIL. Each worker process keeps one CVGenerator with its stylesheet
+    built. At most max_workers + max_queue renders are admitted at once.
+    Further requests fail fast with RenderPoolBusy instead of piling up. A
+    render that times out still holds its slot until its worker stops, so
+    the queue bound stays honest. Every render is stopped by a deadline of
+    timeout_seconds from when it starts, in the worker or on the calling
+    thread alike. A render stuck where that cannot reach it, in C code,
+    gets STUCK_RENDER_GRACE more seconds before the pool's worker processes
+    are terminated and replaced.
+
+    With max_workers=0 renders run inline on the calling thread.
+    """
+
+    def __init__(self, max_workers: int = 0, max_queue: int = 16, timeout_seconds: float = 30.0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+
+        self._slots = threading.BoundedSemaphore(max(1, max_workers) + max_queue)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._generator = CVGenerator() if max_workers <= 0 else None
+        self._counters = {'submitted': 0, 'completed': 0, 'rejected': 0, 'timeouts': 0, 'failures': 0}
+        self._in_flight = 0
+        self._render_seconds = 0.0
+        self._pdfs = 0
+        self._pdf_bytes = 0
+
+    def render(self, user_data: Dict, job_analysis: Optional[Dict] = None,
+               template_id: str = DEFAULT_TEMPLATE, compact: bool = False, fit_pages: int = None) -> bytes:
+        """Render a CV and return the PDF bytes.
+
+        Raises RenderPoolBusy when the queue is full and RenderTimeoutError
+        when the render takes longer than timeout_seconds.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters['rejected'] += 1
+            raise RenderPoolBusy(self._retry_after())
+
+        with self._lock:
+            self._counters['submitted'] += 1
+            self._in_flight += 1
+
+        if self.max_workers <= 0:
+            started = time.perf_counter()
+            pdf_bytes = None
+            try:
+                with render_deadline(self.timeout_seconds):
+                    pdf_bytes = self._generator.generate_cv_bytes(
+                        user_data, job_analysis, template_id, compact, fit_pages
+                    )
+                return pdf_bytes
+            except RenderTimeoutError:
+                with self._lock:
+                    self._counters['timeouts'] += 1
+                raise
+            finally:
+                self._finish(time.perf_counter() - started, failed=pdf_bytes is None, pdfs=[pdf_bytes])
+
+        submitted = time.perf_counter()
+        try:
+            pool = self._get_pool()
+            future = pool.submit(
+                _render_in_worker, user_data, job_analysis, template_id, compact, fit_pages, self.timeout_seconds
+            )
+        except Exception:
+            self._finish(0.0, failed=True)
+            raise
+        future.add_done_callback(lambda done: self._on_done(done, submitted))
+
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            # Drop it if it never started; otherwise its worker's deadline stops it
+            if not future.cancel():
+                self._watch_stuck(future, pool, self.timeout_seconds)
+            with self._lock:
+                self._counters['timeouts'] += 1
+            raise RenderTimeoutError(f"Render did not finish within {self.timeout_seconds} seconds")
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool; drop it so the next render starts fresh
+            self.shutdown()
+            raise
+
+    def render_many(self, user_data: Dict, job_analyses: List[Dict], template_id: str = DEFAULT_TEMPLATE,
+                    chunk_size: int = 4, compact: bool = False,
+                    fit_pages: int = None) -> RenderBatch:
+        """Render one profile against many jobs, yielding (index, pdf, error) as renders finish.
+
+        Jobs are sent to workers in chunks so the profile is pickled and its
+        job-independent sections are built once per chunk instead of once
+        per job. Each in-flight chunk holds one queue slot. Admission of the
+        first chunk is checked up front and raises RenderPoolBusy. Later
+        chunks wait for a slot instead, since their results are streamed.
+        Close the returned batch if it may not be iterated to the end.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._counters['rejected'] += 1
+            raise RenderPoolBusy(self._retry_after())
+
+        workers = max(1, self.max_workers)
+        chunk_size = max(1, min(chunk_size, math.ceil(len(job_analyses) / workers)))
+        chunks = [
+            list(range(start, min(start + chunk_size, len(job_analyses))))
+            for start in range(0, len(job_analyses), chunk_size)
+        ]
+        if not chunks:
+            self._slots.release()
+            return RenderBatch(iter(()), lambda: None)
+        return RenderBatch(
+            self._render_chunks(user_data, job_analyses, template_id, chunks, compact, fit_pages),
+            self._slots.release
+        )
+
+    def _render_chunks(self, user_data: Dict, job_analyses: List[Dict], template_id: str,
+                       chunks: List[List[int]], compact: bool, fit_pages: Optional[int]):
+        """Yield chunk results; takes over the queue slot acquired by render_many once started"""
+        with self._lock:
+            self._in_flight += 1
+
+        if self.max_workers <= 0:
+            # Inline: the whole batch is one render on the calling thread
+            with self._lock:
+                self._counters['submitted'] += 1
+            started = time.perf_counter()
+            failed = True
+            pdfs = []
+            try:
+                for chunk in chunks:
+                    outcomes = _render_many_safely(
+                        self._generator, user_data, [job_analyses[i] for i in chunk], template_id, compact, fit_pages,
+                        self.timeout_seconds
+                    )
+                    pdfs.extend(pdf for pdf, _ in outcomes)
+                    for index, outcome in zip(chunk, outcomes):
+                        yield (index,) + outcome
+                failed = False
+            finally:
+                self._finish(time.perf_counter() - started, failed=failed, pdfs=pdfs)
+            return
+
+        timeout = self.timeout_seconds * max((len(chunk) for chunk in chunks), default=1)
+        pending = {}
+        # Pool each chunk went to, which may have been replaced since
+        pools = {}
+        remaining = list(chunks)
+        # A held slot is released either by the chunk it is handed to or in the finally block
+        holding_slot = True
+        try:
+            while remaining or pending:
+                # Keep one chunk per worker in flight
+                while remaining and len(pending) < self.max_workers:
+                    if not holding_slot:
+                        if not self._slots.acquire(timeout=self.timeout_seconds):
+                            break
+                        with self._lock:
+                            self._in_flight += 1
+                        holding_slot = True
+                    chunk = remaining.pop(0)
+                    holding_slot = False
+                    future, pool = self._submit_chunk(
+                        user_data, [job_analyses[i] for i in chunk], template_id, compact, fit_pages
+                    )
+                    pending[future] = chunk
+                    pools[future] = pool
+
+                if not pending:
+                    for chunk in remaining:
+                        for index in chunk:
+                            yield index, None, 'Render queue stayed full'
+                    return
+
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    with self._lock:
+                        self._counters['timeouts'] += len(pending)
+                    for chunk in list(pending.values()) + remaining:
+                        for index in chunk:
+                            yield index, None, f'Render did not finish within {self.timeout_seconds} seconds'
+                    return
+
+                for future in done:
+                    chunk = pending.pop(future)
+                    del pools[future]
+                    try:
+                        outcomes = future.result()
+                    except BrokenProcessPool as e:
+                        self.shutdown()
+                        outcomes = [(None, f'Render worker failed: {str(e)}')] * len(chunk)
+                    except Exception as e:
+                        outcomes = [(None, str(e))] * len(chunk)
+                    for index, outcome in zip(chunk, outcomes):
+                        yield (index,) + tuple(outcome)
+        finally:
+            # Stop chunks that have not started; running ones free their slots when done
+            for future in pending:
+                if not future.cancel():
+                    self._watch_stuck(future, pools[future], timeout)
+            if holding_slot:
+                self._finish(0.0, failed=True)
+
+    def _submit_chunk(self, user_data: Dict, job_analyses: List[Dict], template_id: str, compact: bool,
+                      fit_pages: Optional[int]) -> Tuple[Future, ProcessPoolExecutor]:
+        """Submit a chunk that already holds a queue slot; the slot frees when it finishes.
+
+        Returns the chunk's future and the pool it was submitted to.
+        """
+        with self._lock:
+            self._counters['submitted'] += 1
+        submitted = time.perf_counter()
+        try:
+            pool = self._get_pool()
+            future = pool.submit(
+                _render_many_in_worker, user_data, job_analyses, template_id, compact, fit_pages, self.timeout_seconds
+            )
+        except Exception:
+            self._finish(0.0, failed=True)
+            raise
+        future.add_done_callback(lambda done: self._on_done(done, submitted))
+        return future, pool
+
+    def stats(self) -> Dict:
+        with self._lock:
+            completed = self._counters['completed']
+            return {
+                **self._counters,
+                'workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'in_flight': self._in_flight,
+                'average_seconds': round(self._render_seconds / completed, 4) if completed else 0.0,
+                'pdfs': self._pdfs,
+                'pdf_bytes': self._pdf_bytes,
+                'average_pdf_bytes': round(self._pdf_bytes / self._pdfs) if self._pdfs else 0,
+            }
+
+    def shutdown(self):
+        """Stop the render process pool, if one was started"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _watch_stuck(self, future, pool: ProcessPoolExecutor, deadline: float):
+        """Terminate pool's workers if a timed-out render is still running once its deadline and grace have passed"""
+        if future.done():
+            return
+        timer = threading.Timer(deadline + STUCK_RENDER_GRACE, self._terminate_if_running, (future, pool))
+        timer.daemon = True
+        timer.start()
+
+    def _terminate_if_running(self, future, pool: ProcessPoolExecutor):
+        """Kill pool's worker processes if future is still running; the next render starts a fresh pool.
+
+        ProcessPoolExecutor cannot stop one task, so renders sharing the pool
+        fail too. Their futures, and future, then finish with
+        BrokenProcessPool, which frees their queue slots.
+        """
+        if future.done():
+            return
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        processes = list((pool._processes or {}).values())
+        for process in processes:
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Spawned workers avoid inheriting locks and sockets from a threaded server
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._pool
+
+    def _on_done(self, future, submitted: float):
+        failed = future.cancelled() or future.exception() is not None
+        pdfs = []
+        if not failed:
+            # A single render returns the PDF, a chunk a list of (pdf, error)
+            result = future.result()
+            pdfs = [result] if isinstance(result, bytes) else [pdf for pdf, _ in result]
+        self._finish(time.perf_counter() - submitted, failed=failed, pdfs=pdfs)
+
+    def _finish(self, seconds: float, failed: bool = False, pdfs: List[Optional[bytes]] = ()):
+        """Release a render's queue slot and record its outcome and output sizes"""
+        with self._lock:
+            self._in_flight -= 1
+            if failed:
+                self._counters['failures'] += 1
+            else:
+                self._counters['completed'] += 1
+                self._render_seconds += seconds
+            for pdf in pdfs:
+                if pdf:
+                    self._pdfs += 1
+                    self._pdf_bytes += len(pdf)
+        self._slots.release()
+
+    def _retry_after(self) -> int:
+        """Estimate how long the current backlog takes to drain, in whole seconds"""
+        with self._lock:
+            completed = self._counters['completed']
+            average = self._render_seconds / completed if completed else 1.0
+            backlog = self._in_flight
+        return max(1, math.ceil(backlog * average / max(1, self.max_workers)))
+
+
+# Generator owned by a pool worker process, built once by _init_worker
+_worker_generator = None
+
+def _init_worker():
+    global _worker_generator
+    _worker_generator = CVGenerator()
+
+@contextmanager
+def render_deadline(seconds: Optional[float]):
+    """Stop the calling thread's render with RenderTimeoutError once it has run for seconds.
+
+    A timer thread raises _RenderExpired in the rendering thread, which
+    interrupts ReportLab's pure-Python layout between bytecodes. Nothing
+    waiting in C code is interrupted until it returns. seconds=None
+    disables the deadline.
+    """
+    if seconds is None:
+        yield
+        return
+    thread_id = ctypes.c_ulong(threading.get_ident())
+    lock = threading.Lock()
+    state = {'running': True}
+
+    def expire():
+        with lock:
+            if state['running']:
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, ctypes.py_object(_RenderExpired))
+
+    timer = threading.Timer(seconds, expire)
+    timer.daemon = True
+    try:
+        try:
+            timer.start()
+            yield
+        finally:
+            timer.cancel()
+            with lock:
+                state['running'] = False
+                # Clear an expiry that fired as the render finished but was not raised yet
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, None)
+    except _RenderExpired:
+        # Also reached when the expiry lands in the cleanup above, before the lock is taken
+        raise RenderTimeoutError(f"Render did not finish within {seconds} seconds") from None
+
+def _render_in_worker(user_data: Dict, job_analysis: Optional[Dict], template_id: str,
+                      compact: bool = False, fit_pages: Optional[int] = None,
+                      timeout_seconds: Optional[float] = None) -> bytes:
+    with render_deadline(timeout_seconds):
+        return _worker_generator.generate_cv_bytes(user_data, job_analysis, template_id, compact, fit_pages)
+
+def _render_many_in_worker(user_data: Dict, job_analyses: List[Dict], template_id: str,
+                           compact: bool = False, fit_pages: Optional[int] = None,
+                           timeout_seconds: Optional[float] = None) -> List[Tuple[Optional[bytes], Optional[str]]]:
+    return _render_many_safely(
+        _worker_generator, user_data, job_analyses, template_id, compact, fit_pages, timeout_seconds
+    )
+
+def _render_many_safely(generator: CVGenerator, user_data: Dict, job_analyses: List[Dict], template_id: str,
+                        compact: bool = False, fit_pages: Optional[int] = None,
+                        timeout_seconds: Optional[float] = None) -> List[Tuple[Optional[bytes], Optional[str]]]:
+    """Render a chunk, reporting failures per job instead of failing the chunk.
+
+    Each job gets its own timeout_seconds deadline, so one slow job does not
+    fail the rest of the chunk.
+    """
+    try:
+        profile = ProfileIndex(user_data)
+        profile_sections = generator._build_profile_sections(profile, get_template(template_id))
+    except Exception as e:
+        return [(None, str(e))] * len(job_analyses)
+
+    outcomes = []
+    for job_analysis in job_analyses:
+        try:
+            buffer = BytesIO()
+            with render_deadline(timeout_seconds):
+                generator.render_cv(
+                    buffer, user_data, job_analysis, template_id, profile_sections, profile, compact, fit_pages
+                )
+            outcomes.append((buffer.getvalue(), None))
+        except Exception as e:
+            outcomes.append((None, str(e)))
+    return outcomes
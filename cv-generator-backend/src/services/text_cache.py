@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+# Size of the chunks hashed while reading an upload
+_HASH_CHUNK = 64 * 1024
+
+
+class DigestingSpool(tempfile.SpooledTemporaryFile):
+    """Upload spool that hashes bytes as they are written.
+
+    Werkzeug writes each uploaded file into a spool front to back once, so
+    hashing there gives ExtractedTextCache its key without reading the
+    upload a second time. A write anywhere but the end invalidates the
+    digest.
+    """
+
+    def __init__(self, max_size: int = 500 * 1024):
+        super().__init__(max_size=max_size, mode='w+b')
+        self.bytes_written = 0
+        self._digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        if self._digest is not None:
+            if self.tell() == self.bytes_written:
+                self._digest.update(data)
+                self.bytes_written += len(data)
+            else:
+                self._digest = None
+        return super().write(data)
+
+    def writelines(self, lines: Iterable[bytes]):
+        for line in lines:
+            self.write(line)
+
+    def content_digest(self) -> Optional[str]:
+        """sha256 of everything written, or None if it was not written sequentially"""
+        return self._digest.hexdigest() if self._digest is not None else None
+
+
+def _extraction_key(tag: str, content_digest: str) -> str:
+    """Combine the extractor configuration tag with the sha256 of the upload's bytes"""
+    return hashlib.sha256(f'{tag}\0{content_digest}'.encode('utf-8')).hexdigest()
+
+
+class ExtractedTextCache:
+    """Size-capped on-disk cache of extracted document text, evicted least recently used first"""
+
+    # Extension of cache entry files; other files in the directory are ignored
+    _suffix = '.json'
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'purges': 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._total_bytes, self._entries = self._scan()
+
+    @staticmethod
+    def digest_stream(stream: BinaryIO, tag: str, limit: int) -> Tuple[str, int]:
+        """Key at most limit bytes of an upload plus the extractor configuration tag.
+
+        Returns the cache key and the number of bytes hashed. A DigestingSpool
+        within the limit was hashed while it was written and is not read
+        again; other streams are read and rewound so they can still be
+        extracted on a miss.
+        """
+        if isinstance(stream, DigestingSpool) and stream.bytes_written <= limit:
+            content_digest = stream.content_digest()
+            if content_digest is not None:
+                return _extraction_key(tag, content_digest), stream.bytes_written
+
+        digest = hashlib.sha256()
+        hashed = 0
+        while hashed < limit:
+            chunk = stream.read(min(_HASH_CHUNK, limit - hashed))
+            if not chunk:
+                break
+            digest.update(chunk)
+            hashed += len(chunk)
+
+        stream.seek(0)
+        return _extraction_key(tag, digest.hexdigest()), hashed
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached extraction for a key, marking it recently used"""
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as handle:
+                entry = json.load(handle)
+            # Access time drives LRU eviction; set it explicitly since many
+            # filesystems are mounted noatime
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self._counters['misses'] += 1
+            return None
+
+        with self._lock:
+            self._counters['hits'] += 1
+        return entry
+
+    def set(self, key: str, entry: Dict):
+        """Write an extraction atomically, then evict old entries if over budget"""
+        self._store(key, lambda temp_file: json.dump(entry, temp_file), mode='w')
+
+    def _store(self, key: str, write, mode: str = 'wb') -> Optional[str]:
+        """Atomically write an entry with write(file) and return its path, or None on failure"""
+        path = self._path(key)
+        directory = os.path.dirname(path)
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        except OSError:
+            return None
+        try:
+            encoding = None if 'b' in mode else 'utf-8'
+            with os.fdopen(handle, mode, encoding=encoding) as temp_file:
+                write(temp_file)
+            size = os.path.getsize(temp_path)
+            existed = os.path.exists(path)
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+
+        with self._lock:
+            if not existed:
+                self._entries += 1
+                self._total_bytes += size
+            over_budget = self._total_bytes > self.max_bytes
+
+        if over_budget:
+            self._evict()
+        return path
+
+    def purge(self) -> int:
+        """Remove every cached extraction and return how many were deleted"""
+        removed = 0
+        for path, _, _ in self._iter_files():
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+
+        with self._lock:
+            self._counters['purges'] += 1
+            self._total_bytes, self._entries = 0, 0
+        return removed
+
+    def stats(self) -> Dict:
+        """Return hit/miss/eviction counters and current disk usage"""
+        with self._lock:
+            counters = dict(self._counters)
+            lookups = counters['hits'] + counters['misses']
+            return {
+                **counters,
+                'lookups': lookups,
+                'hit_rate': round(counters['hits'] / lookups, 4) if lookups else 0.0,
+                'entries': self._entries,
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'directory': self.directory,
+            }
+
+    def _path(self, key: str) -> str:
+        # Shard by key prefix so no single directory grows too large
+        return os.path.join(self.directory, key[:2], f'{key}{self._suffix}')
+
+    def _iter_files(self):
+        """Yield (path, size, last_used) for every cached file"""
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(self._suffix):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    info = os.stat(path)
+                except OSError:
+                    continue
+                yield path, info.st_size, max(info.st_atime, info.st_mtime)
+
+    def _scan(self) -> Tuple[int, int]:
+        total, entries = 0, 0
+        for _, size, _ in self._iter_files():
+            total += size
+            entries += 1
+        return total, entries
+
+    def _evict(self):
+        """Delete least recently used files until the cache is back under 90% of its budget.
+
+        The directory is rescanned so entries written by other worker
+        processes are accounted for.
+        """
+        files = sorted(self._iter_files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+        target = self.max_bytes * 0.9
+        evicted = 0
+
+        for path, size, _ in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._counters['evictions'] += evicted
+            self._total_bytes = total
+            self._entries = len(files) - evicted
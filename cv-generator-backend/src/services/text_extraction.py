@@ -0,0 +1,389 @@
+import codecs
+import io
+import os
+import tempfile
+import zipfile
+from typing import BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+from xml.etree import ElementTree
+
+from src.services.text_cache import ExtractedTextCache
+
+try:
+    import textract
+except ImportError:
+    textract = None
+try:
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.layout import LAParams, LTTextContainer
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+except ImportError:
+    PDFPage = None
+try:
+    from PyPDF2 import PdfReader
+except ImportError:
+    PdfReader = None
+try:
+    import docx
+except ImportError:
+    docx = None
+try:
+    import docx2txt
+except ImportError:
+    docx2txt = None
+
+# WordprocessingML namespace used by word/document.xml
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Size of the chunks read from plain-text uploads
+_READ_CHUNK = 64 * 1024
+
+
+class ExtractionLimits(NamedTuple):
+    max_bytes: int = 16 * 1024 * 1024
+    max_pages: int = 50
+    max_chars: int = 100000
+
+
+class ExtractionResult(NamedTuple):
+    text: str
+    limit_hit: Optional[str]  # 'bytes', 'pages', 'chars' or None
+    pages: int
+    bytes_read: int
+    cached: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            'limit_hit': self.limit_hit,
+            'pages': self.pages,
+            'characters': len(self.text),
+            'bytes_read': self.bytes_read,
+            'cached': self.cached,
+        }
+
+
+class ExtractorBackend(NamedTuple):
+    name: str
+    extract: Callable[[BinaryIO], Iterator[str]]
+    paged: bool  # chunks are pages, so the page limit applies
+    available: bool
+
+
+# Registered backends by document format, then by backend name
+EXTRACTOR_REGISTRY: Dict[str, Dict[str, ExtractorBackend]] = {}
+
+# Backends tried for each format, in order; textract is always the last resort
+DEFAULT_BACKENDS = {
+    'pdf': ('pypdf2', 'pdfminer'),
+    'docx': ('docx-stream', 'python-docx', 'docx2txt'),
+    'doc': (),
+}
+
+# File signatures used to detect the real document format
+_PDF_MAGIC = b'%PDF-'
+_ZIP_MAGIC = b'PK\x03\x04'
+_OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+# File extension textract needs to pick its parser for each format
+_TEXTRACT_EXTENSIONS = {'pdf': '.pdf', 'docx': '.docx', 'doc': '.doc'}
+
+
+def register_extractor(file_format: str, name: str, paged: bool = False, available: bool = True):
+    """Register a function yielding text chunks as an extractor backend for a format"""
+    def decorator(func):
+        EXTRACTOR_REGISTRY.setdefault(file_format, {})[name] = ExtractorBackend(name, func, paged, available)
+        return func
+    return decorator
+
+
+def parse_backend_preferences(spec: str) -> Dict[str, Sequence[str]]:
+    """Parse a preference string such as 'pdf=pypdf2,pdfminer;docx=python-docx'"""
+    preferences = {}
+    for entry in filter(None, (part.strip() for part in (spec or '').split(';'))):
+        file_format, _, names = entry.partition('=')
+        preferences[file_format.strip()] = tuple(name.strip() for name in names.split(',') if name.strip())
+    return preferences
+
+
+def sniff_format(stream: BinaryIO) -> str:
+    """Detect the document format from its leading bytes rather than its file name"""
+    header = stream.read(8)
+    stream.seek(0)
+
+    if header.startswith(_PDF_MAGIC):
+        return 'pdf'
+    if header.startswith(_OLE_MAGIC):
+        return 'doc'
+    if header.startswith(_ZIP_MAGIC):
+        try:
+            with zipfile.ZipFile(stream) as archive:
+                is_docx = 'word/document.xml' in archive.namelist()
+        except zipfile.BadZipFile:
+            is_docx = False
+        stream.seek(0)
+        if is_docx:
+            return 'docx'
+        raise ValueError("Unsupported archive format")
+    return 'text'
+
+
+class ExtractionLimitError(ValueError):
+    """Raised when a document cannot be read within the configured limits"""
+
+    def __init__(self, limit: str, message: str):
+        super().__init__(message)
+        self.limit = limit
+
+
+class StreamingTextExtractor:
+    """Extract text from uploads incrementally, within byte, page and character limits"""
+
+    def __init__(self, limits: ExtractionLimits = None, backends: Dict[str, Sequence[str]] = None,
+                 cache: ExtractedTextCache = None):
+        self.limits = limits or ExtractionLimits()
+        self.backends = {**DEFAULT_BACKENDS, **(backends or {})}
+        self.cache = cache
+
+        for file_format, names in self.backends.items():
+            unknown = [name for name in names if name not in EXTRACTOR_REGISTRY.get(file_format, {})]
+            if unknown:
+                raise ValueError(f"Unknown {file_format} extractor backends: {', '.join(unknown)}")
+
+    def extract(self, stream: BinaryIO, filename: str) -> ExtractionResult:
+        """Extract text from a file-like upload without reading it into memory at once.
+
+        The format is detected from the file signature, not from filename.
+        """
+        try:
+            file_format = sniff_format(stream)
+            size = self._checked_size(stream) if file_format != 'text' else None
+
+            cache_key = None
+            if self.cache is not None:
+                # Text beyond max_bytes never affects the result, so only the prefix is hashed
+                cache_key, _ = self.cache.digest_stream(stream, self.cache_tag, self.limits.max_bytes)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return ExtractionResult(**cached, cached=True)
+
+            if file_format == 'text':
+                result = self._extract_plain_text(stream)
+            else:
+                result = self._extract_with_backends(stream, file_format, size)
+
+            if cache_key is not None:
+                self.cache.set(cache_key, {
+                    'text': result.text,
+                    'limit_hit': result.limit_hit,
+                    'pages': result.pages,
+                    'bytes_read': result.bytes_read,
+                })
+            return result
+        except ExtractionLimitError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Could not extract text from file: {str(e)}")
+
+    @property
+    def cache_tag(self) -> str:
+        """Identify the limits and backends that produced a cached extraction"""
+        backends = ';'.join(f"{name}={','.join(order)}" for name, order in sorted(self.backends.items()))
+        return f"{tuple(self.limits)}|{backends}"
+
+    def backend_chain(self, file_format: str) -> List[ExtractorBackend]:
+        """Return the available backends tried for a format, ending with the textract fallback"""
+        registered = EXTRACTOR_REGISTRY.get(file_format, {})
+        chain = [registered[name] for name in self.backends.get(file_format, ()) if registered[name].available]
+        fallback = registered.get('textract')
+        if fallback and fallback.available and fallback not in chain:
+            chain.append(fallback)
+        return chain
+
+    def _extract_with_backends(self, stream: BinaryIO, file_format: str, size: int) -> ExtractionResult:
+        """Try each backend for the format in order until one succeeds"""
+        chain = self.backend_chain(file_format)
+        if not chain:
+            raise ValueError(f"No extractor backend available for {file_format} files")
+
+        errors = []
+        for backend in chain:
+            stream.seek(0)
+            try:
+                return self._collect(backend.extract(stream), size, paged=backend.paged)
+            except Exception as e:
+                errors.append(f"{backend.name}: {str(e)}")
+
+        raise ValueError('; '.join(errors))
+
+    def _checked_size(self, stream: BinaryIO) -> int:
+        """Return the upload size, rejecting documents over the byte limit.
+
+        Binary formats cannot be parsed from a truncated prefix (PDF keeps its
+        cross-reference table at the end, DOCX its zip directory), so oversized
+        documents are refused before any parsing work is done.
+        """
+        stream.seek(0, io.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        if size > self.limits.max_bytes:
+            raise ExtractionLimitError(
+                'bytes',
+                f"File is {size} bytes, which exceeds the {self.limits.max_bytes} byte limit"
+            )
+        return size
+
+    def _collect(self, chunks: Iterator[str], size: int, paged: bool = False) -> ExtractionResult:
+        """Join text chunks until the input ends or a page/character limit is reached"""
+        parts = []
+        characters = 0
+        pages = 0
+        limit_hit = None
+
+        try:
+            for chunk in chunks:
+                if paged and pages >= self.limits.max_pages:
+                    limit_hit = 'pages'
+                    break
+                pages += 1
+
+                remaining = self.limits.max_chars - characters
+                if len(chunk) >= remaining:
+                    # Enough text for analysis; stop without parsing the rest
+                    parts.append(chunk[:remaining])
+                    characters += remaining
+                    limit_hit = 'chars'
+                    break
+
+                parts.append(chunk)
+                characters += len(chunk)
+        finally:
+            # Release parser resources when stopping early
+            close = getattr(chunks, 'close', None)
+            if close:
+                close()
+
+        return ExtractionResult(''.join(parts), limit_hit, pages if paged else 0, size)
+
+    def _extract_plain_text(self, stream: BinaryIO) -> ExtractionResult:
+        """Decode UTF-8 text in chunks, stopping at the byte or character limit"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parts = []
+        characters = 0
+        bytes_read = 0
+        limit_hit = None
+
+        while True:
+            chunk = stream.read(min(_READ_CHUNK, self.limits.max_bytes - bytes_read + 1))
+            if not chunk:
+                parts.append(decoder.decode(b'', final=True))
+                break
+
+            if bytes_read + len(chunk) > self.limits.max_bytes:
+                # Keep the allowed prefix; a character split at the cut is dropped
+                chunk = chunk[:self.limits.max_bytes - bytes_read]
+                bytes_read += len(chunk)
+                parts.append(decoder.decode(chunk))
+                limit_hit = 'bytes'
+                break
+
+            bytes_read += len(chunk)
+            text = decoder.decode(chunk)
+            parts.append(text)
+            characters += len(text)
+            if characters >= self.limits.max_chars:
+                limit_hit = 'chars'
+                break
+
+        text = ''.join(parts)
+        if len(text) > self.limits.max_chars:
+            text = text[:self.limits.max_chars]
+            limit_hit = 'chars'
+
+        return ExtractionResult(text, limit_hit, 0, bytes_read)
+
+
+@register_extractor('pdf', 'pdfminer', paged=True, available=PDFPage is not None)
+def _iter_pdfminer_pages(stream: BinaryIO) -> Iterator[str]:
+    """Yield the text of each PDF page in turn using pdfminer"""
+    manager = PDFResourceManager()
+    device = PDFPageAggregator(manager, laparams=LAParams())
+    interpreter = PDFPageInterpreter(manager, device)
+    try:
+        for page in PDFPage.get_pages(stream, caching=False):
+            interpreter.process_page(page)
+            layout = device.get_result()
+            yield ''.join(
+                element.get_text() for element in layout if isinstance(element, LTTextContainer)
+            ) + '\n'
+    finally:
+        device.close()
+
+
+@register_extractor('pdf', 'pypdf2', paged=True, available=PdfReader is not None)
+def _iter_pypdf2_pages(stream: BinaryIO) -> Iterator[str]:
+    """Yield the text of each PDF page using PyPDF2's faster, layout-free extraction"""
+    reader = PdfReader(stream)
+    for page in reader.pages:
+        yield (page.extract_text() or '') + '\n'
+
+
+@register_extractor('docx', 'docx-stream')
+def _iter_docx_paragraphs(stream: BinaryIO) -> Iterator[str]:
+    """Yield DOCX paragraphs by streaming word/document.xml out of the archive"""
+    with zipfile.ZipFile(stream) as archive:
+        with archive.open('word/document.xml') as document:
+            for _, element in ElementTree.iterparse(document, events=('end',)):
+                if element.tag != f'{_W}p':
+                    continue
+
+                parts = []
+                for node in element.iter():
+                    if node.tag == f'{_W}t' and node.text:
+                        parts.append(node.text)
+                    elif node.tag == f'{_W}tab':
+                        parts.append('\t')
+                    elif node.tag in (f'{_W}br', f'{_W}cr'):
+                        parts.append('\n')
+
+                # Free the parsed paragraph so memory stays flat on long documents
+                element.clear()
+                yield ''.join(parts) + '\n'
+
+
+@register_extractor('docx', 'python-docx', available=docx is not None)
+def _iter_python_docx_paragraphs(stream: BinaryIO) -> Iterator[str]:
+    """Yield body paragraphs, then table cell paragraphs, using python-docx"""
+    document = docx.Document(stream)
+    for paragraph in document.paragraphs:
+        yield paragraph.text + '\n'
+    for table in document.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                yield cell.text + '\n'
+
+
+@register_extractor('docx', 'docx2txt', available=docx2txt is not None)
+def _iter_docx2txt(stream: BinaryIO) -> Iterator[str]:
+    """Yield the whole document text extracted by docx2txt"""
+    yield docx2txt.process(stream)
+
+
+def _iter_textract(stream: BinaryIO, extension: str) -> Iterator[str]:
+    """Fall back to textract, which shells out and needs the upload on disk"""
+    handle, path = tempfile.mkstemp(suffix=extension)
+    try:
+        with os.fdopen(handle, 'wb') as temp_file:
+            while True:
+                chunk = stream.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                temp_file.write(chunk)
+        yield textract.process(path).decode('utf-8', errors='replace')
+    finally:
+        os.remove(path)
+
+
+for _format, _extension in _TEXTRACT_EXTENSIONS.items():
+    register_extractor(_format, 'textract', available=textract is not None)(
+        lambda stream, extension=_extension: _iter_textract(stream, extension)
+    )
@@ -0,0 +1,99 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, Set, Tuple
+
+
+class PhraseRewriter:
+    """Replaces whole-word phrases in a single regex pass.
+
+    All phrases are compiled into one alternation (longest first) and
+    resolved through a lookup table, so the text is scanned once however
+    many replacements there are. Matches must sit on word boundaries, so
+    "made" is rewritten but "homemade" is left alone. Matching ignores case
+    and the replacement keeps a capitalized or upper-case original's casing.
+    """
+
+    def __init__(self, replacements: Dict[str, str]):
+        self._table = {self._normalize(phrase): replacement for phrase, replacement in replacements.items()}
+        # Let multi-word phrases match across any run of spaces or tabs
+        alternation = '|'.join(
+            r'[ \t]+'.join(re.escape(word) for word in phrase.split())
+            for phrase in sorted(self._table, key=len, reverse=True)
+        )
+        self._pattern = re.compile(
+            rf'(?<!\w){_first_char_guard(self._table, ignore_case=True)}(?:{alternation})(?!\w)', re.IGNORECASE
+        )
+        # Resolved replacement per exact matched text; only a few casings occur in practice
+        self._resolved: Dict[str, str] = {}
+
+    @staticmethod
+    def _normalize(phrase: str) -> str:
+        return ' '.join(phrase.lower().split())
+
+    def rewrite(self, text: str) -> str:
+        return self._pattern.sub(self._replace, text)
+
+    def _replace(self, match: re.Match) -> str:
+        original = match.group(0)
+        resolved = self._resolved.get(original)
+        if resolved is None:
+            resolved = self._resolve(original)
+            if len(self._resolved) < 1024:
+                self._resolved[original] = resolved
+        return resolved
+
+    def _resolve(self, original: str) -> str:
+        replacement = self._table[self._normalize(original)]
+        if len(original) > 1 and original.isupper():
+            return replacement.upper()
+        if original[0].isupper():
+            return replacement[:1].upper() + replacement[1:]
+        return replacement
+
+
+class TermFinder:
+    """Finds which of a fixed set of terms occur as whole words, in one regex pass"""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = tuple(sorted({term.lower() for term in terms if term}, key=len, reverse=True))
+        self._pattern = _term_pattern(self.terms) if self.terms else None
+
+    def find(self, lowered_text: str) -> Set[str]:
+        """Return the terms present in already-lowercased text"""
+        if self._pattern is None:
+            return set()
+
+        found = set(self._pattern.findall(lowered_text))
+
+        # The alternation reports one term per position, so a term that only
+        # occurs inside a longer match ("machine" in "machine learning") is
+        # looked for within the matched text
+        if found and len(found) < len(self.terms):
+            hidden = tuple(term for term in self.terms if term not in found)
+            found.update(_term_pattern(hidden).findall('\n'.join(found)))
+        return found
+
+
+@lru_cache(maxsize=1024)
+def term_finder(terms: Tuple[str, ...]) -> TermFinder:
+    """Return a shared finder for a job's terms, so each term list compiles once per process"""
+    return TermFinder(terms)
+
+
+@lru_cache(maxsize=1024)
+def _term_pattern(terms: Tuple[str, ...]) -> re.Pattern:
+    alternation = '|'.join(re.escape(term) for term in terms)
+    return re.compile(rf'(?<!\w){_first_char_guard(terms)}(?:{alternation})(?!\w)')
+
+
+def _first_char_guard(phrases: Iterable[str], ignore_case: bool = False) -> str:
+    """Lookahead on the phrases' possible first characters.
+
+    It lets the regex engine reject most positions with one character-class
+    test instead of trying every branch of the alternation.
+    """
+    first_chars = {phrase[0] for phrase in phrases if phrase}
+    if ignore_case:
+        first_chars |= {char.upper() for char in first_chars} | {char.lower() for char in first_chars}
+    return '(?=[' + ''.join(re.escape(char) for char in sorted(first_chars)) + '])'
+
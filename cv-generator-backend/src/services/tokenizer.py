@@ -0,0 +1,209 @@
+import re
+from typing import List
+
+# NLTK's English stopword list, frozen so the fast tokenizer needs no corpus download
+ENGLISH_STOP_WORDS = frozenset([
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're",
+    "you've", "you'll", "you'd", 'your', 'yours', 'yourself', 'yourselves', 'he',
+    "he'd", "he'll", 'him', 'his', 'himself', "he's", 'she', "she'd", "she'll",
+    "she's", 'her', 'hers', 'herself', 'it', "it'd", "it'll", "it's", 'its',
+    'itself', 'they', "they'd", "they'll", "they're", "they've", 'them', 'their',
+    'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that',
+    "that'll", 'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a',
+    'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while',
+    'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into',
+    'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up',
+    'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further',
+    'then', 'once', 'here', 'there', 'when', 'where', 'why', 'how', 'all', 'any',
+    'both', 'each', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor',
+    'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can',
+    'will', 'just', 'don', "don't", 'should', "should've", 'now', 'd', "i'd",
+    "i'll", "i'm", "i've", 'll', 'm', 'o', 're', 've', 'y', 'ain', 'aren',
+    "aren't", 'couldn', "couldn't", 'didn', "didn't", 'doesn', "doesn't", 'hadn',
+    "hadn't", 'hasn', "hasn't", 'haven', "haven't", 'isn', "isn't", 'ma',
+    'mightn', "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan',
+    "shan't", 'shouldn', "shouldn't", 'wasn', "wasn't", "we'd", "we'll", "we're",
+    'weren', "weren't", "we've", 'won', "won't", 'wouldn', "wouldn't",
+])
+
+# Hand-picked abbreviations common in job postings (not the list from NLTK's
+# trained Punkt model, which is longer); a period after one does not end a
+# sentence
+PUNKT_ABBREVIATIONS = frozenset([
+    'a.m', 'p.m', 'e.g', 'i.e', 'etc', 'vs', 'cf', 'al', 'approx', 'no', 'nos',
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'jr', 'sr', 'st', 'messrs', 'rev', 'gen',
+    'gov', 'sen', 'rep', 'lt', 'col', 'capt', 'sgt', 'adm', 'ft', 'mt', 'ave',
+    'inc', 'corp', 'co', 'ltd', 'bros', 'cos', 'plc', 'pty', 'dept', 'assn',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct',
+    'nov', 'dec', 'u.s', 'u.k', 'u.n', 'n.y', 'd.c', 'l.a', 'calif', 'mass',
+    'yr', 'yrs', 'exp', 'hrs', 'wk', 'wks', 'mos',
+])
+
+# Punkt's word segmentation, used to classify the token before a candidate
+# sentence end, and its candidate sentence ends: '.', '?' or '!' followed by
+# punctuation or by whitespace and another token
+_PUNKT_NON_WORD = r"(?:[)\";}\]*:@'({\[‘’“”\xab\xbb?!])"
+_PUNKT_MULTI_CHAR = r"(?:-{2,}|\.{2,}|(?:\.\s){2,}\.)"
+_PUNKT_WORD = re.compile(
+    _PUNKT_MULTI_CHAR + r"|(?=[^(\"`{\[:;&#*@)}\]\-,])\S+?(?=\s|$|" + _PUNKT_NON_WORD + "|" + _PUNKT_MULTI_CHAR
+    + r"|,(?=$|\s|" + _PUNKT_NON_WORD + "|" + _PUNKT_MULTI_CHAR + r"))|\S"
+)
+_PUNKT_END_CONTEXT = re.compile(r"[.?!](?=(?P<after_tok>" + _PUNKT_NON_WORD + r"|\s+(?P<next_tok>\S+)))")
+_PUNKT_REALIGNMENT = re.compile(r"[\"')\]}‘’“”\xab\xbb]+?(?:\s+|(?=--)|$)")
+_PUNKT_WHITESPACE = frozenset(' \t\n\r\x0b\x0c')
+_PUNKT_PUNCTUATION = frozenset(';:,.!?')
+_PUNKT_INITIAL = re.compile(r"[^\W\d]\.$")
+_PUNKT_NUMBER = re.compile(r"^-?[\.,]?\d[\d,\.-]*\.?$")
+
+# NLTK's Treebank word tokenizer rules (nltk.tokenize.NLTKWordTokenizer),
+# applied in this order. They run once over all sentences joined by
+# _SENTENCE_SEPARATOR, so the rules NLTK anchors at the start or end of a
+# sentence are anchored at the separator too. Each rule is skipped when none
+# of the characters it needs are in the text
+_SENTENCE_SEPARATOR = ' \x00 '
+_STARTING_QUOTES = [
+    (re.compile(r"([«“‘„]|[`]+)"), r" \1 ", '«“‘„`'),
+    (re.compile(r"(?:^|(?<=\x00 ))\""), r"``", '"'),
+    (re.compile(r"(``)"), r" \1 ", '`'),
+    (re.compile(r"((?<!\x00) |[\(\[{<])(\"|\'{2})"), r"\1 `` ", '"\''),
+    (re.compile(r"(?i)(?<!\w)(\')(?!(?:re|ve|ll|m|t|s|d|n)\b)(?=\w)"), r"\1 ", "'"),
+]
+_PUNCTUATION = [
+    (re.compile(r"([^\.])(\.)([\]\)}>\"\'»”’ ]*)\s*(?=\x00|$)"), r"\1 \2 \3 ", '.'),
+    (re.compile(r"([:,])([^\d])"), r" \1 \2", ':,'),
+    (re.compile(r"([:,])$"), r" \1 ", ':,'),
+    (re.compile(r"\.{2,}"), r" \g<0> ", '.'),
+    (re.compile(r"[;@#$%&]"), r" \g<0> ", ';@#$%&'),
+    (re.compile(r"[‒-―]"), r" \g<0> ", '‒–—―'),
+    (re.compile(r"([^\.])(\.)([\]\)}>\"\']*)\s*(?=\x00|$)"), r"\1 \2\3 ", '.'),
+    (re.compile(r"[?!]"), r" \g<0> ", '?!'),
+    (re.compile(r"([^'])' (?!\x00)"), r"\1 ' ", "'"),
+    (re.compile(r"[*]"), r" \g<0> ", '*'),
+    (re.compile(r"[\]\[\(\)\{\}\<\>]"), r" \g<0> ", '[](){}<>'),
+    (re.compile(r"--"), r" -- ", '-'),
+]
+_ENDING_QUOTES = [
+    (re.compile(r"([»”’])"), r" \1 ", '»”’'),
+    (re.compile(r"''"), " '' ", "'"),
+    (re.compile(r'"'), " '' ", '"'),
+]
+# Applied after whitespace is collapsed, as NLTK does
+_CLITICS = [
+    (re.compile(r"([^' ])('[sS]|'[mM]|'[dD]|') "), r"\1 \2 ", "'"),
+    (re.compile(r"([^' ])('ll|'LL|'re|'RE|'ve|'VE|n't|N'T) "), r"\1 \2 ", "'"),
+]
+_CONTRACTIONS = [(re.compile(pattern), trigger) for pattern, trigger in (
+    (r"(?i)\b(can)(not)\b", 'cannot'), (r"(?i)\b(d)('ye)\b", "d'ye"), (r"(?i)\b(gim)(me)\b", 'gimme'),
+    (r"(?i)\b(gon)(na)\b", 'gonna'), (r"(?i)\b(got)(ta)\b", 'gotta'), (r"(?i)\b(lem)(me)\b", 'lemme'),
+    (r"(?i)\b(more)('n)\b", "more'n"), (r"(?i)\b(wan)(na)(?=\s)", 'wanna'),
+    (r"(?i) ('t)(is)\b", "'tis"), (r"(?i) ('t)(was)\b", "'twas"),
+)]
+
+def tokenize(text: str) -> List[str]:
+    """Split lowercase text into word tokens without NLTK.
+
+    Follows nltk.word_tokenize: sentences are found with Punkt's rules (see
+    split_sentences) and each one is split with the Treebank rules. So a
+    sentence-final period is split off ("python." -> "python", "."), while a
+    mid-sentence "etc." or "salary:100k" stays one token. Tokens can differ
+    from NLTK's wherever split_sentences differs from its trained model.
+    """
+    return _treebank_tokenize(split_sentences(text))
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split lowercase text into sentences with Punkt's rules, without its model.
+
+    A period ends a sentence unless it follows one of PUNKT_ABBREVIATIONS,
+    or an initial or number followed by punctuation or a lowercase word.
+    Known differences from NLTK with its trained English model: its
+    abbreviation list is longer, its collocations (word pairs a period never
+    splits) are not applied, and it keeps an initial or number in the same
+    sentence as the next lowercase word only when its statistics say that
+    word is not usually sentence-initial, where this always does.
+    """
+    slices = []
+    start = 0
+    for match, context in _end_contexts(text):
+        if _contains_sentence_break(context):
+            slices.append((start, match.end()))
+            start = match.start('next_tok') if match.group('next_tok') else match.end()
+    slices.append((start, len(text.rstrip())))
+
+    # Closing quotes and brackets after a sentence end belong to that sentence
+    sentences = []
+    realign = 0
+    for index, (begin, end) in enumerate(slices):
+        begin += realign
+        realign = 0
+        if index + 1 < len(slices):
+            following, following_end = slices[index + 1]
+            match = _PUNKT_REALIGNMENT.match(text, following, following_end)
+            if match:
+                end = following + len(match.group(0).rstrip())
+                realign = match.end() - following
+        if text[begin:end]:
+            sentences.append(text[begin:end])
+    return sentences
+
+
+def _end_contexts(text: str):
+    """Yield (match, context) for each candidate sentence end.
+
+    The context is the word before the end character, the character and what
+    follows it. A candidate whose word overlaps the next candidate's (as in
+    "wow!!!") is dropped in favour of the later one.
+    """
+    previous = None
+    previous_start = previous_stop = 0
+    for match in _PUNKT_END_CONTEXT.finditer(text):
+        word_start = previous_start
+        for index in range(match.start() - 1, previous_stop, -1):
+            if text[index] in _PUNKT_WHITESPACE:
+                word_start = index + 1
+                break
+        if previous is not None and previous_stop <= word_start:
+            yield previous, text[previous_start:previous_stop] + previous.group() + previous.group('after_tok')
+        previous = match
+        previous_start, previous_stop = word_start, match.start()
+    if previous is not None:
+        yield previous, text[previous_start:previous_stop] + previous.group() + previous.group('after_tok')
+
+
+def _contains_sentence_break(context: str) -> bool:
+    """Whether any token but the last in a candidate's context ends a sentence"""
+    tokens = [token for line in context.split('\n') for token in _PUNKT_WORD.findall(line)]
+    return any(_is_sentence_break(token, next_token) for token, next_token in zip(tokens, tokens[1:]))
+
+
+def _is_sentence_break(token: str, next_token: str) -> bool:
+    if token in ('.', '?', '!'):
+        return True
+    if not token.endswith('.') or token.endswith('..'):
+        return False
+    word = token[:-1].lower()
+    if word in PUNKT_ABBREVIATIONS or word.split('-')[-1] in PUNKT_ABBREVIATIONS:
+        return False
+    # Initials and numbers before punctuation or a lowercase word are abbreviations
+    if _PUNKT_INITIAL.match(token) or _PUNKT_NUMBER.match(token.lower()):
+        return not (next_token in _PUNKT_PUNCTUATION or next_token[0].islower())
+    return True
+
+
+def _treebank_tokenize(sentences: List[str]) -> List[str]:
+    text = _SENTENCE_SEPARATOR.join(sentences)
+    for pattern, replacement, triggers in _STARTING_QUOTES + _PUNCTUATION + _ENDING_QUOTES:
+        if any(char in text for char in triggers):
+            text = pattern.sub(replacement, text)
+
+    text = f" {' '.join(text.split())} "
+    for pattern, replacement, triggers in _CLITICS:
+        if triggers in text:
+            text = pattern.sub(replacement, text)
+
+    lowered = text.lower()
+    for pattern, trigger in _CONTRACTIONS:
+        if trigger in lowered:
+            text = pattern.sub(r' \1 \2 ', text)
+    return [token for token in text.split() if token != '\x00']
@@ -0,0 +1,49 @@
+import time
+import zipfile
+from typing import Iterable, Iterator, List, Tuple
+
+
+class _ChunkSink:
+    """Write-only file object that collects what ZipFile writes until it is drained.
+
+    It has no tell() or seek(), so ZipFile falls back to streaming mode and
+    writes data descriptors after each entry instead of seeking back.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, bytes]],
+               compression: int = zipfile.ZIP_DEFLATED) -> Iterator[bytes]:
+    """Yield a ZIP archive piece by piece as (name, data) entries arrive.
+
+    Each entry is emitted as soon as it is added, so the caller never holds
+    more than one entry in memory and clients start receiving data at once.
+    """
+    sink = _ChunkSink()
+    timestamp = time.localtime(time.time())[:6]
+    with zipfile.ZipFile(sink, mode='w', compression=compression) as archive:
+        for name, data in entries:
+            info = zipfile.ZipInfo(name, date_time=timestamp)
+            info.compress_type = compression
+            archive.writestr(info, data)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    # Central directory, written when the archive closes
+    chunk = sink.drain()
+    if chunk:
+        yield chunk
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Tests import the backend as the app does, from the cv-generator-backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Importing the routes builds the app's analyzer; the fast tokenizer needs no NLTK data files
+os.environ.setdefault('ANALYZER_TOKENIZER', 'fast')
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from benchmarks.synthetic import synthetic_job_description
+from src.services.analysis_session import AnalysisSession, AnalysisSessionStore
+from src.services.job_analyzer import JobAnalyzer
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return JobAnalyzer(tokenizer='fast')
+
+
+def full_analysis(analyzer, session):
+    return analyzer._analyze_normalized(analyzer._normalize_text('\n'.join(session.paragraphs)))
+
+
+def test_incremental_matches_full_analysis_across_edits(analyzer):
+    generator = random.Random(0)
+    lines = [line for seed in range(20) for line in synthetic_job_description(seed, 600).split('\n')]
+    session = AnalysisSessionStore(analyzer).create('\n'.join(lines[:30]))
+
+    for _ in range(300):
+        start = generator.randint(0, len(session.paragraphs))
+        delete = generator.randint(0, min(3, len(session.paragraphs) - start))
+        insert = generator.sample(lines, generator.randint(0, 3))
+        session.apply_edits([{'start': start, 'delete': delete, 'insert': insert}])
+        assert session.analysis() == full_analysis(analyzer, session)
+
+
+def test_repeated_inserts_at_one_spot_relabel(analyzer):
+    session = AnalysisSession(analyzer, 'test', ['Python developer', 'Go developer'])
+    for index in range(80):
+        session.apply_edits([{'start': 1, 'delete': 0, 'insert': [f'Rust and Java {index}']}])
+
+    assert session.labels == sorted(session.labels)
+    assert session.analysis() == full_analysis(analyzer, session)
+
+
+def test_leading_blank_lines_keep_job_title(analyzer):
+    text = '\n\n  \n\n\t\n\nJob Title: Senior Python Developer\nCompany: Acme\nPython and Django required.'
+    session = AnalysisSessionStore(analyzer).create(text)
+
+    assert session.analysis()['job_info']['job_title'] == 'job title: senior python developer'
+    assert session.analysis() == analyzer._analyze_normalized(analyzer._normalize_text(text))
+
+    session.apply_edits([{'start': 0, 'delete': 0, 'insert': ['', '']}])
+    assert session.analysis() == full_analysis(analyzer, session)
+
+
+def test_lines_are_tokenized_separately(analyzer):
+    # "etc." before a lowercase word does not end a sentence in the whole text, but ends its line here
+    text = 'Python etc.\nand Django'
+    session = AnalysisSessionStore(analyzer).create(text)
+
+    assert session.analysis()['keywords'] == ['python', 'etc', 'django']
+    assert analyzer._analyze_normalized(analyzer._normalize_text(text))['keywords'] == ['python', 'django']
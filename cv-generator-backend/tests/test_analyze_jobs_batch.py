@@ -0,0 +1,40 @@
+import io
+
+import pytest
+from flask import Flask
+
+from src.routes import cv as cv_routes
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(cv_routes.cv_bp, url_prefix='/api')
+    return app.test_client()
+
+
+def test_duplicate_postings_keep_their_own_index(client, monkeypatch):
+    # Uncached, so the duplicates share one analysis run
+    monkeypatch.setattr(cv_routes.job_analyzer, 'cache', None)
+    text = 'Senior Python developer with Django and AWS experience.'
+    response = client.post('/api/analyze-jobs-batch', json={'job_texts': [text, text, '']})
+
+    results = response.get_json()['results']
+    assert [result['index'] for result in results] == [0, 1, 2]
+    assert [result['success'] for result in results] == [True, True, False]
+    assert results[0]['analysis'] == results[1]['analysis']
+
+
+def test_oversized_multipart_batch_is_rejected_before_extraction(client, monkeypatch):
+    monkeypatch.setattr(cv_routes, 'MAX_BATCH_SIZE', 2)
+    monkeypatch.setattr(
+        cv_routes.job_analyzer, 'extract_text_from_stream',
+        lambda *args: pytest.fail('uploads were extracted before the batch size was checked')
+    )
+
+    response = client.post('/api/analyze-jobs-batch', data={
+        'job_texts': ['Python developer'],
+        'job_files': [(io.BytesIO(b'Go developer'), 'one.txt'), (io.BytesIO(b'Rust developer'), 'two.txt')],
+    })
+
+    assert response.status_code == 413
@@ -0,0 +1,15 @@
+from benchmarks.reporting import percentile
+
+
+def test_percentile_uses_nearest_rank():
+    values = [5.0, 1.0, 4.0, 2.0, 3.0]
+
+    assert percentile(values, 0.5) == 3.0
+    assert percentile(values, 0.95) == 5.0
+    assert percentile(values, 0.2) == 1.0
+    assert percentile(values, 0.0) == 1.0
+    assert percentile(list(range(1, 101)), 0.99) == 99
+
+
+def test_percentile_of_nothing_is_zero():
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,138 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src.services.cv_job_queue import CVJobQueue
+
+
+class Busy(RuntimeError):
+    retry_after = 0
+
+
+def make_queue(tmp_path, handler=lambda payload: {'echo': payload}, **options):
+    return CVJobQueue(str(tmp_path / 'jobs.sqlite3'), handler, **options)
+
+
+def test_running_job_is_reclaimed_after_its_lease_expires(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0.2)
+    job_id = queue.submit({'n': 1})
+
+    assert queue._claim() == (job_id, {'n': 1})
+    # Still leased to the first worker
+    assert queue._claim() is None
+
+    time.sleep(0.25)
+    assert queue._claim() == (job_id, {'n': 1})
+    job = queue.get(job_id)
+    assert job['status'] == 'running' and job['attempts'] == 2
+
+
+def test_job_fails_once_its_leases_use_up_max_attempts(tmp_path):
+    queue = make_queue(tmp_path, lease_seconds=0, max_attempts=2)
+    job_id = queue.submit({})
+
+    assert queue._claim() is not None
+    time.sleep(0.01)
+    assert queue._claim() is not None
+    time.sleep(0.01)
+    assert queue._claim() is None
+
+    job = queue.get(job_id)
+    assert job['status'] == 'failed'
+    assert job['attempts'] == 2
+    assert job['error'] == 'Worker stopped before the CV was generated'
+
+
+def test_retryable_error_requeues_without_using_an_attempt(tmp_path):
+    calls = []
+
+    def handler(payload):
+        calls.append(payload)
+        if len(calls) == 1:
+            raise Busy()
+        return {'ok': True}
+
+    queue = make_queue(tmp_path, handler, max_attempts=1, retry_on=(Busy,))
+    job_id = queue.submit({})
+
+    queue._run(*queue._claim())
+    job = queue.get(job_id)
+    assert job['status'] == 'queued' and job['attempts'] == 0
+
+    queue._run(*queue._claim())
+    job = queue.get(job_id)
+    assert job['status'] == 'succeeded' and job['attempts'] == 1
+    assert job['result'] == {'ok': True}
+
+
+def test_retry_waits_for_retry_after(tmp_path):
+    class SlowDown(RuntimeError):
+        retry_after = 60
+
+    def handler(payload):
+        raise SlowDown()
+
+    queue = make_queue(tmp_path, handler, retry_on=(SlowDown,))
+    queue.submit({})
+
+    queue._run(*queue._claim())
+    assert queue._claim() is None
+
+
+def test_other_errors_fail_the_job(tmp_path):
+    def handler(payload):
+        raise ValueError('Full name is required')
+
+    queue = make_queue(tmp_path, handler, retry_on=(Busy,))
+    job_id = queue.submit({})
+
+    queue._run(*queue._claim())
+    job = queue.get(job_id)
+    assert job['status'] == 'failed' and job['error'] == 'Full name is required'
+    assert queue._claim() is None
+
+
+def test_worker_threads_run_submitted_jobs(tmp_path):
+    queue = make_queue(tmp_path, worker_threads=1, poll_seconds=0.05)
+    queue.start()
+    try:
+        job_id = queue.submit({'n': 2})
+        deadline = time.time() + 5
+        while queue.get(job_id)['status'] != 'succeeded':
+            assert time.time() < deadline, 'job did not finish'
+            time.sleep(0.02)
+    finally:
+        queue.stop()
+
+    assert queue.get(job_id)['result'] == {'echo': {'n': 2}}
+    assert queue.stats()['succeeded'] == 1
+
+
+@pytest.mark.parametrize('status', ['succeeded', 'failed'])
+def test_finished_jobs_are_pruned_after_their_ttl(tmp_path, status):
+    def handler(payload):
+        if status == 'failed':
+            raise ValueError('boom')
+        return {}
+
+    queue = make_queue(tmp_path, handler, result_ttl_seconds=0)
+    job_id = queue.submit({})
+    queue._run(*queue._claim())
+    time.sleep(0.01)
+
+    queue._prune()
+    assert queue.get(job_id) is None
+
+
+def test_importing_the_routes_starts_no_workers_and_creates_no_files(tmp_path):
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, 'TMPDIR': str(tmp_path), 'ANALYZER_TOKENIZER': 'fast', 'PYTHONPATH': backend}
+    script = 'import threading, src.routes.cv; print(threading.active_count())'
+
+    output = subprocess.run([sys.executable, '-c', script], env=env, cwd=backend,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.split() == ['1']
+    assert os.listdir(tmp_path) == []
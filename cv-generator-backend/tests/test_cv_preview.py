@@ -0,0 +1,36 @@
+from io import BytesIO
+
+import pytest
+
+from src.services.cv_generator import CVGenerator
+from src.services.cv_preview import render_text
+from src.services.cv_templates import list_templates
+
+# Short enough that no line wraps in the PDF, so every preview line is one PDF line
+USER_DATA = {
+    'personal_info': {'full_name': 'Ada Lovelace', 'email': 'ada@example.com', 'location': 'London'},
+    'professional_summary': 'Engineer building Python data pipelines.',
+    'work_experience': [{
+        'job_title': 'Senior Engineer',
+        'company': 'Analytical Engines',
+        'start_date': '2020',
+        'end_date': 'Present',
+        'description': 'Built the parser\nShipped the 2.0 release\nFixed bugs',
+    }],
+    'education': [{'degree': 'BSc Mathematics', 'school': 'University of London', 'graduation_date': '2015'}],
+    'skills': {'technical': ['Python', 'SQL']},
+}
+
+
+@pytest.mark.parametrize('template_id', [template['id'] for template in list_templates()])
+def test_text_preview_matches_pdfminer_lines(template_id):
+    extract_text = pytest.importorskip('pdfminer.high_level').extract_text
+    generator = CVGenerator()
+
+    preview = render_text(generator.build_document(USER_DATA, None, template_id))
+    extracted = extract_text(BytesIO(generator.generate_cv_bytes(USER_DATA, None, template_id)))
+
+    # pdfminer reads the standard fonts' bullet glyph back as (cid:127)
+    extracted_lines = [line.replace('(cid:127)', '•').strip() for line in extracted.splitlines()]
+    assert [line for line in extracted_lines if line] == [line for line in preview.splitlines() if line]
+    assert '• Built the parser' in extracted_lines
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from src.services.cv_storage import CVStorage, LocalCVStorage, SQLiteCVStorage
+
+PDF = b'%PDF-1.4 ' + b'x' * 291
+
+
+@pytest.fixture(params=['local', 'sqlite'])
+def make_storage(request, tmp_path):
+    storages = []
+
+    def make(**options):
+        if request.param == 'local':
+            storage = LocalCVStorage(str(tmp_path / 'cvs'), **options)
+        else:
+            storage = SQLiteCVStorage(str(tmp_path / 'cvs.sqlite3'), **options)
+        storages.append(storage)
+        return storage
+
+    yield make
+    for storage in storages:
+        storage.stop()
+
+
+def cv_id(number: int) -> str:
+    return f'{number:064x}'
+
+
+def test_storage_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CVStorage()
+
+
+def test_get_returns_stored_cv(make_storage):
+    storage = make_storage()
+    storage.put(cv_id(1), PDF)
+
+    stored = storage.get(cv_id(1))
+    assert stored.size == len(PDF)
+    assert stored.etag == cv_id(1)
+    assert storage.get(cv_id(2)) is None
+
+
+def test_sweep_removes_expired_cvs(make_storage):
+    storage = make_storage(ttl_seconds=0.2)
+    storage.put(cv_id(1), PDF)
+    time.sleep(0.3)
+    storage.put(cv_id(2), PDF)
+
+    # Expired CVs are not served even before a sweep removes them
+    assert storage.get(cv_id(1)) is None
+    assert storage.sweep() == 1
+    assert storage.get(cv_id(2)) is not None
+
+    stats = storage.stats()
+    assert stats['entries'] == 1
+    assert stats['expired'] == 1
+    assert stats['last_sweep_removed'] == 1
+
+
+def test_background_sweeper_removes_expired_cvs(make_storage):
+    storage = make_storage(ttl_seconds=0.05, sweep_interval=0.05)
+    storage.put(cv_id(1), PDF)
+    storage.start()
+
+    deadline = time.time() + 5
+    while storage.stats()['entries']:
+        assert time.time() < deadline, 'sweeper did not run'
+        time.sleep(0.05)
+    assert storage.stats()['sweeps'] >= 1
+
+
+def test_quota_evicts_oldest_cvs_down_to_ninety_percent(make_storage):
+    storage = make_storage(max_bytes=1000)
+    for number in range(1, 5):
+        storage.put(cv_id(number), PDF)
+        time.sleep(0.01)
+
+    # Four 300 byte CVs exceed the quota; dropping the oldest gets back to 900 bytes, its 90%
+    assert storage.get(cv_id(1)) is None
+    assert all(storage.get(cv_id(number)) is not None for number in range(2, 5))
+
+    stats = storage.stats()
+    assert stats['evicted'] == 1
+    assert stats['bytes'] == len(PDF) * 3
+
+
+def test_sweep_enforces_a_lowered_quota(make_storage):
+    storage = make_storage()
+    for number in range(1, 5):
+        storage.put(cv_id(number), PDF)
+        time.sleep(0.01)
+
+    storage.max_bytes = len(PDF) * 2
+    assert storage.sweep() == 3
+    assert storage.get(cv_id(4)) is not None
+    assert storage.stats()['entries'] == 1
+
+
+def test_rejects_invalid_ids(make_storage):
+    storage = make_storage()
+    with pytest.raises(ValueError):
+        storage.put('../escape', PDF)
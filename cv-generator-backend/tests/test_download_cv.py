@@ -0,0 +1,134 @@
+import pytest
+from flask import Flask
+
+from src.routes import cv as cv_routes
+from src.services.cv_job_queue import CVJobQueue
+from src.services.cv_storage import LocalCVStorage, SQLiteCVStorage
+from src.services.render_pool import RenderPool
+
+PDF = b'%PDF-1.4 ' + bytes(range(256)) * 4
+CONTENT_ID = 'ab' * 32
+UUID_ID = '0f1e2d3c-4b5a-4978-8695-a4b3c2d1e0f9'
+
+
+@pytest.fixture(params=['local', 'sqlite'])
+def client(request, tmp_path, monkeypatch):
+    if request.param == 'local':
+        storage = LocalCVStorage(str(tmp_path / 'cvs'))
+    else:
+        storage = SQLiteCVStorage(str(tmp_path / 'cvs.sqlite3'))
+    storage.put(CONTENT_ID, PDF)
+    storage.put(UUID_ID, PDF)
+    monkeypatch.setattr(cv_routes, 'cv_storage', storage)
+
+    app = Flask(__name__)
+    app.register_blueprint(cv_routes.cv_bp, url_prefix='/api')
+    return app.test_client()
+
+
+@pytest.fixture
+def job_result_url(tmp_path, monkeypatch):
+    """Result URL of a finished CV job whose CV is CONTENT_ID"""
+    jobs = CVJobQueue(str(tmp_path / 'jobs.sqlite3'), lambda payload: {'cv_id': CONTENT_ID})
+    job_id = jobs.submit({})
+    jobs._run(*jobs._claim())
+    monkeypatch.setattr(cv_routes, 'cv_jobs', jobs)
+    return f'/api/cv-jobs/{job_id}/result'
+
+
+@pytest.mark.parametrize('cv_id', [CONTENT_ID, UUID_ID])
+def test_download_sends_pdf_with_validators(client, cv_id):
+    response = client.get(f'/api/download-cv/{cv_id}')
+
+    assert response.status_code == 200
+    assert response.data == PDF
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['ETag']
+    assert response.headers['Last-Modified']
+
+
+def test_content_addressed_cv_uses_its_id_as_etag(client):
+    response = client.get(f'/api/download-cv/{CONTENT_ID}')
+
+    assert response.headers['ETag'] == f'"{CONTENT_ID}"'
+    assert 'immutable' in response.headers['Cache-Control']
+
+
+@pytest.mark.parametrize('cv_id', [CONTENT_ID, UUID_ID])
+def test_matching_etag_returns_304(client, cv_id):
+    etag = client.get(f'/api/download-cv/{cv_id}').headers['ETag']
+
+    response = client.get(f'/api/download-cv/{cv_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+    response = client.get(f'/api/download-cv/{cv_id}', headers={'If-None-Match': '"something-else"'})
+    assert response.status_code == 200
+
+
+def test_etag_survives_regenerating_the_same_cv(client):
+    etag = client.get(f'/api/download-cv/{CONTENT_ID}').headers['ETag']
+    cv_routes.cv_storage.put(CONTENT_ID, PDF)
+
+    response = client.get(f'/api/download-cv/{CONTENT_ID}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('cv_id', [CONTENT_ID, UUID_ID])
+def test_range_request_returns_206(client, cv_id):
+    response = client.get(f'/api/download-cv/{cv_id}', headers={'Range': 'bytes=100-199'})
+
+    assert response.status_code == 206
+    assert response.data == PDF[100:200]
+    assert response.headers['Content-Range'] == f'bytes 100-199/{len(PDF)}'
+
+
+def test_if_range_with_stale_etag_returns_whole_pdf(client):
+    response = client.get(
+        f'/api/download-cv/{CONTENT_ID}', headers={'Range': 'bytes=0-9', 'If-Range': '"stale"'}
+    )
+
+    assert response.status_code == 200
+    assert response.data == PDF
+
+
+def test_unsatisfiable_range_returns_416(client):
+    response = client.get(f'/api/download-cv/{CONTENT_ID}', headers={'Range': f'bytes={len(PDF)}-'})
+    assert response.status_code == 416
+    assert response.headers['Content-Range'] == f'bytes */{len(PDF)}'
+
+
+def test_job_result_answers_conditional_and_range_requests(client, job_result_url):
+    response = client.get(job_result_url)
+    assert response.status_code == 200
+    assert response.data == PDF
+
+    response = client.get(job_result_url, headers={'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+    response = client.get(job_result_url, headers={'Range': 'bytes=100-199'})
+    assert response.status_code == 206
+    assert response.data == PDF[100:200]
+
+    response = client.get(job_result_url, headers={'Range': f'bytes={len(PDF)}-'})
+    assert response.status_code == 416
+
+
+def test_unknown_cv_returns_404(client):
+    assert client.get(f'/api/download-cv/{"cd" * 32}').status_code == 404
+    assert client.get('/api/download-cv/not-an-id').status_code == 404
+
+
+def test_streamed_cv_has_no_downloadable_id(client, monkeypatch):
+    monkeypatch.setattr(cv_routes, 'render_cache', None)
+    monkeypatch.setattr(cv_routes, 'render_pool', RenderPool(max_workers=0))
+    user_data = {'personal_info': {'full_name': 'Ada Lovelace'}}
+
+    response = client.post('/api/generate-cv?stream=true', json={'user_data': user_data})
+
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF')
+    assert response.headers['ETag']
+    # Streamed CVs are not stored, so there is no id to pass to /download-cv
+    assert 'X-CV-Id' not in response.headers
+    assert cv_routes.cv_storage.stats()['entries'] == 2
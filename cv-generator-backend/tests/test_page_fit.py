@@ -0,0 +1,48 @@
+from io import BytesIO
+
+import pytest
+
+from benchmarks.synthetic import synthetic_profile
+from src.services.cv_generator import CVGenerator
+from src.services.cv_templates import get_template, list_templates
+from src.services.page_fit import MeasurementCache, count_pages, fit_to_pages, frame_size
+
+TEMPLATE_IDS = [template['id'] for template in list_templates()]
+
+# Work-experience entries per profile: one, two and three pages as designed
+EXPERIENCES = (2, 6, 20)
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return CVGenerator()
+
+
+def pdf_pages(pdf_bytes):
+    PdfReader = pytest.importorskip('PyPDF2').PdfReader
+    return len(PdfReader(BytesIO(pdf_bytes)).pages)
+
+
+@pytest.mark.parametrize('template_id', TEMPLATE_IDS)
+@pytest.mark.parametrize('experiences', EXPERIENCES)
+def test_estimate_matches_rendered_pages(generator, template_id, experiences):
+    profile = synthetic_profile(experiences, experiences)
+    template = get_template(template_id)
+    document = generator.build_document(profile, None, template_id)
+
+    estimated = count_pages(document, template, *frame_size(template), MeasurementCache())
+    assert estimated == pdf_pages(generator.generate_cv_bytes(profile, None, template_id))
+
+
+@pytest.mark.parametrize('template_id', TEMPLATE_IDS)
+@pytest.mark.parametrize('experiences', EXPERIENCES)
+@pytest.mark.parametrize('pages', [1, 2])
+def test_fitted_layout_renders_to_its_estimated_pages(generator, template_id, experiences, pages):
+    document = generator.build_document(synthetic_profile(experiences, experiences), None, template_id)
+    layout = fit_to_pages(document, get_template(template_id), pages)
+
+    buffer = BytesIO()
+    generator._build_pdf(buffer, generator._to_flowables(layout.document.blocks, layout.template), layout.template, False)
+    assert pdf_pages(buffer.getvalue()) == layout.pages
+    # 20 jobs cannot fit one page even fully trimmed; everything else must fit
+    assert layout.pages <= pages or (experiences == 20 and pages == 1)
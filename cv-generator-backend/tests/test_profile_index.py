@@ -0,0 +1,43 @@
+from src.services.profile_index import ProfileIndex
+
+USER_DATA = {
+    'personal_info': {'full_name': 'Ada Lovelace', 'email': 'ada@example.com'},
+    'work_experience': [{
+        'job_title': 'Frontend Developer',
+        'description': 'Built JavaScript dashboards\nMachine   learning on Node.js',
+    }],
+    'skills': {'technical_skills': ['JavaScript', 'React']},
+}
+
+
+def test_dictionary_keys_are_not_terms():
+    profile = ProfileIndex(USER_DATA)
+
+    for key in ('skills', 'technical_skills', 'description', 'job_title', 'personal_info'):
+        assert not profile.has_term(key)
+
+
+def test_terms_match_whole_words_only():
+    profile = ProfileIndex(USER_DATA)
+
+    assert profile.has_term('javascript')
+    assert not profile.has_term('java')
+    assert not profile.has_term('script')
+    assert profile.has_term('JavaScript')
+
+
+def test_phrases_match_across_spaces_but_not_fields():
+    profile = ProfileIndex(USER_DATA)
+
+    assert profile.has_term('machine learning')
+    assert profile.has_term('node.js')
+    # "dashboards" ends one line and "machine" starts the next
+    assert not profile.has_term('dashboards machine')
+
+
+def test_skills_are_looked_up_per_category():
+    profile = ProfileIndex(USER_DATA)
+
+    assert profile.has_skill('react')
+    assert not profile.has_skill('react', 'soft_skills')
+    assert not profile.has_skill('java')
@@ -0,0 +1,167 @@
+import gc
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.services.render_pool import RenderPool, RenderPoolBusy, RenderTimeoutError
+
+USER_DATA = {'personal_info': {'full_name': 'Ada Lovelace', 'email': 'ada@example.com'}}
+
+
+@pytest.fixture
+def pool():
+    # Inline rendering with room for a single render at a time
+    pool = RenderPool(max_workers=0, max_queue=0)
+    yield pool
+    pool.shutdown()
+
+
+def test_unstarted_batch_releases_slot_on_close(pool):
+    batch = pool.render_many(USER_DATA, [{}, {}])
+    with pytest.raises(RenderPoolBusy):
+        pool.render_many(USER_DATA, [{}])
+
+    batch.close()
+    pool.render_many(USER_DATA, [{}]).close()
+
+
+def test_dropped_batch_releases_slot(pool):
+    pool.render_many(USER_DATA, [{}, {}])
+    gc.collect()
+
+    pool.render_many(USER_DATA, [{}]).close()
+
+
+def test_started_batch_releases_slot_once(pool):
+    batch = pool.render_many(USER_DATA, [{}, {}])
+    index, pdf_bytes, error = next(batch)
+    batch.close()
+
+    assert index == 0 and error is None and pdf_bytes.startswith(b'%PDF')
+    assert pool.stats()['in_flight'] == 0
+    pool.render_many(USER_DATA, [{}]).close()
+    # A double release would let a second batch in alongside the first
+    held = pool.render_many(USER_DATA, [{}])
+    with pytest.raises(RenderPoolBusy):
+        pool.render_many(USER_DATA, [{}])
+    held.close()
+
+
+def test_full_queue_raises_busy_with_retry_after(pool, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    render = pool._generator.generate_cv_bytes
+
+    def slow_render(*args):
+        started.set()
+        release.wait(5)
+        return render(*args)
+
+    monkeypatch.setattr(pool._generator, 'generate_cv_bytes', slow_render)
+    worker = threading.Thread(target=pool.render, args=(USER_DATA,))
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(RenderPoolBusy) as busy:
+            pool.render(USER_DATA)
+        with pytest.raises(RenderPoolBusy):
+            pool.render_many(USER_DATA, [{}])
+    finally:
+        release.set()
+        worker.join(5)
+
+    assert busy.value.retry_after >= 1
+    stats = pool.stats()
+    assert stats['rejected'] == 2 and stats['completed'] == 1 and stats['in_flight'] == 0
+    assert pool.render(USER_DATA).startswith(b'%PDF')
+
+
+def test_render_timeout_keeps_slot_until_worker_finishes():
+    # The first render also waits for a worker process to spawn, so it cannot finish in 1ms
+    pool = RenderPool(max_workers=1, max_queue=0, timeout_seconds=0.001)
+    try:
+        with pytest.raises(RenderTimeoutError):
+            pool.render(USER_DATA)
+        assert pool.stats()['timeouts'] == 1
+        # The timed-out render still holds the only slot
+        with pytest.raises(RenderPoolBusy):
+            pool.render(USER_DATA)
+
+        deadline = time.time() + 60
+        while pool.stats()['in_flight']:
+            assert time.time() < deadline, 'timed out render never finished'
+            time.sleep(0.05)
+
+        pool.timeout_seconds = 60
+        assert pool.render(USER_DATA).startswith(b'%PDF')
+    finally:
+        pool.shutdown()
+
+
+def test_render_many_reports_timeouts_per_job():
+    pool = RenderPool(max_workers=1, max_queue=1, timeout_seconds=0.001)
+    try:
+        outcomes = sorted(pool.render_many(USER_DATA, [{}, {}]))
+    finally:
+        pool.shutdown()
+
+    assert [index for index, _, _ in outcomes] == [0, 1]
+    assert all(pdf is None and 'did not finish' in error for _, pdf, error in outcomes)
+    assert pool.stats()['timeouts'] == 1
+
+
+def spin(*args):
+    """A render stuck in a Python loop"""
+    while True:
+        time.sleep(0.01)
+
+
+def test_inline_render_is_stopped_at_its_deadline(monkeypatch):
+    pool = RenderPool(max_workers=0, max_queue=0, timeout_seconds=0.2)
+    monkeypatch.setattr(pool._generator, 'generate_cv_bytes', spin)
+
+    started = time.time()
+    with pytest.raises(RenderTimeoutError):
+        pool.render(USER_DATA)
+    assert time.time() - started < 5
+    stats = pool.stats()
+    assert stats['timeouts'] == 1 and stats['in_flight'] == 0
+
+    monkeypatch.undo()
+    assert pool.render(USER_DATA).startswith(b'%PDF')
+
+
+def test_render_many_stops_only_the_slow_job(monkeypatch):
+    pool = RenderPool(max_workers=0, max_queue=0, timeout_seconds=0.2)
+    render_cv = pool._generator.render_cv
+
+    def render_or_spin(buffer, user_data, job_analysis, *args):
+        if job_analysis.get('slow'):
+            spin()
+        return render_cv(buffer, user_data, job_analysis, *args)
+
+    monkeypatch.setattr(pool._generator, 'render_cv', render_or_spin)
+    outcomes = sorted(pool.render_many(USER_DATA, [{'slow': True}, {}]))
+
+    assert outcomes[0][1] is None and 'did not finish' in outcomes[0][2]
+    assert outcomes[1][1].startswith(b'%PDF') and outcomes[1][2] is None
+    assert pool.stats()['in_flight'] == 0
+
+
+def test_stuck_worker_is_terminated():
+    pool = RenderPool(max_workers=1, max_queue=0)
+    try:
+        executor = pool._get_pool()
+        # Sleeping in C code, out of reach of the render deadline
+        future = executor.submit(time.sleep, 60)
+        deadline = time.time() + 60
+        while not future.running():
+            assert time.time() < deadline, 'worker never started'
+            time.sleep(0.05)
+
+        pool._terminate_if_running(future, executor)
+        assert isinstance(future.exception(timeout=30), BrokenProcessPool)
+        assert pool._pool is None
+    finally:
+        pool.shutdown()
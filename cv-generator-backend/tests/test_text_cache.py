@@ -0,0 +1,69 @@
+import io
+
+import pytest
+from flask import Flask, request
+
+from src.routes.cv import UploadRequest
+from src.services.text_cache import DigestingSpool, ExtractedTextCache
+from src.services.text_extraction import ExtractionLimits, StreamingTextExtractor
+
+TEXT = ('Senior Python developer. Flask, Docker and AWS required.\n' * 2000).encode('utf-8')
+
+
+def spooled(data: bytes, chunk: int = 4096) -> DigestingSpool:
+    spool = DigestingSpool()
+    for start in range(0, len(data), chunk):
+        spool.write(data[start:start + chunk])
+    spool.seek(0)
+    return spool
+
+
+def test_spool_key_matches_reading_the_stream_without_rereading_it(monkeypatch):
+    spool = spooled(TEXT)
+    monkeypatch.setattr(spool, 'read', lambda *args: pytest.fail('spooled upload was read again'))
+
+    assert ExtractedTextCache.digest_stream(spool, 'tag', len(TEXT)) == \
+        ExtractedTextCache.digest_stream(io.BytesIO(TEXT), 'tag', len(TEXT))
+
+
+def test_spool_over_the_limit_keys_only_the_prefix():
+    limit = len(TEXT) // 2
+    assert ExtractedTextCache.digest_stream(spooled(TEXT), 'tag', limit) == \
+        ExtractedTextCache.digest_stream(io.BytesIO(TEXT[:limit]), 'tag', limit)
+
+
+def test_rewritten_spool_is_hashed_from_its_contents():
+    spool = spooled(TEXT)
+    spool.seek(0)
+    spool.write(b'Junior')
+    spool.seek(0)
+
+    edited = b'Junior' + TEXT[6:]
+    assert spool.content_digest() is None
+    assert ExtractedTextCache.digest_stream(spool, 'tag', len(TEXT)) == \
+        ExtractedTextCache.digest_stream(io.BytesIO(edited), 'tag', len(TEXT))
+    assert spool.read() == edited
+
+
+def test_uploads_are_hashed_while_spooled_and_hit_the_cache(tmp_path):
+    extractor = StreamingTextExtractor(
+        ExtractionLimits(max_bytes=len(TEXT) * 2), cache=ExtractedTextCache(str(tmp_path))
+    )
+    app = Flask(__name__)
+    app.request_class = UploadRequest
+
+    @app.route('/upload', methods=['POST'])
+    def upload():
+        stream = request.files['job_file'].stream
+        assert isinstance(stream, DigestingSpool)
+        result = extractor.extract(stream, 'job.txt')
+        return {'text': result.text, 'cached': result.cached}
+
+    client = app.test_client()
+    responses = [
+        client.post('/upload', data={'job_file': (io.BytesIO(TEXT), 'job.txt')}).get_json()
+        for _ in range(2)
+    ]
+
+    assert [response['cached'] for response in responses] == [False, True]
+    assert responses[1]['text'] == extractor.extract(io.BytesIO(TEXT), 'job.txt').text
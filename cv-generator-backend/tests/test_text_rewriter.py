@@ -0,0 +1,22 @@
+import pytest
+
+from src.services.cv_generator import EXPERIENCE_REWRITER
+from src.services.text_rewriter import PhraseRewriter
+
+
+@pytest.mark.parametrize('text', ['homemade', 'candidate', 'Candidates', 'reused tools', 'did_not'])
+def test_phrases_inside_words_are_left_alone(text):
+    assert EXPERIENCE_REWRITER.rewrite(text) == text
+
+
+def test_replacement_keeps_the_original_casing():
+    assert EXPERIENCE_REWRITER.rewrite('helped, Helped and HELPED') == 'collaborated, Collaborated and COLLABORATED'
+
+
+def test_multi_word_phrases_match_across_spaces_and_tabs():
+    assert EXPERIENCE_REWRITER.rewrite('Worked  on search\nworked\ton billing') == 'Developed search\ndeveloped billing'
+
+
+def test_longest_phrase_wins():
+    rewriter = PhraseRewriter({'made': 'created', 'made with': 'built with'})
+    assert rewriter.rewrite('made with care, made by hand') == 'built with care, created by hand'
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from benchmarks.synthetic import synthetic_job_description
+from src.services.job_analyzer import JobAnalyzer
+from src.services.tokenizer import PUNKT_ABBREVIATIONS, split_sentences, tokenize
+
+EDGE_CASES = [
+    "Requirements: Python, Django, etc. We offer salary:100k and 5 yrs. exp. required.",
+    "Work with AWS (EC2, S3, etc.) and GCP. Knowledge of C++ is a plus!! Really?",
+    "He said \"great work.\" Then left. 'Quoted' text... and more.. done",
+    "We can't, won't, shouldn't stop. You'll love it -- really; #1 @home & 50% off*",
+    "(Sentence one.) Sentence two. [three.] {four.} e.g. this i.e. that. u.s.-based roles.",
+    "leading text\n\n- bullet one.\n- bullet two\nend etc.",
+    "cannot gonna gotta wanna lemme gimme 'tis 'twas more'n d'ye",
+    "“smart quotes.” and «guillemets.» – en dash — em dash ‒ figure",
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return JobAnalyzer(tokenizer='fast')
+
+
+@pytest.fixture(scope='module')
+def nltk_tokenize():
+    """nltk.word_tokenize built from NLTK's classes, with PUNKT_ABBREVIATIONS as the whole Punkt model.
+
+    Matching it shows the rules were ported faithfully, not that tokens match
+    NLTK's trained model; scripts/compare_tokenizers.py checks that.
+    """
+    punkt = pytest.importorskip('nltk.tokenize.punkt')
+    destructive = pytest.importorskip('nltk.tokenize.destructive')
+
+    params = punkt.PunktParameters()
+    params.abbrev_types = set(PUNKT_ABBREVIATIONS)
+    sentences = punkt.PunktSentenceTokenizer(params)
+    words = destructive.NLTKWordTokenizer()
+    return lambda text: [token for sentence in sentences.tokenize(text) for token in words.tokenize(sentence)]
+
+
+def test_follows_nltk_rules_on_postings_and_edge_cases(analyzer, nltk_tokenize):
+    texts = [synthetic_job_description(seed, 2000) for seed in range(50)] + EDGE_CASES
+    for text in map(analyzer._normalize_text, texts):
+        assert tokenize(text) == nltk_tokenize(text)
+
+
+def test_follows_nltk_rules_on_random_punctuation(nltk_tokenize):
+    generator = random.Random(0)
+    alphabet = "abxyz .,:;!?'\"()[]{}<>-\n\t12etc/+*&#@%$`“”‘’«»–—‒"
+    for _ in range(5000):
+        text = ''.join(generator.choice(alphabet) for _ in range(generator.randint(1, 80)))
+        assert tokenize(text) == nltk_tokenize(text)
+
+
+def test_only_sentence_final_periods_are_split():
+    assert tokenize('python etc. and django.') == ['python', 'etc.', 'and', 'django', '.']
+    assert tokenize('salary:100k, skills: go') == ['salary:100k', ',', 'skills', ':', 'go']
+    assert split_sentences('5 yrs. exp. with go. then rust') == ['5 yrs. exp. with go.', 'then rust']
+
+
+def test_abbreviations_are_not_keywords(analyzer):
+    text = analyzer._normalize_text('Python, Django, etc. 5 yrs. exp. with Python required. Senior Python role.')
+    keywords = analyzer._extract_keywords(text)
+
+    assert keywords[0] == 'python'
+    assert not {'etc', 'yrs', 'exp'} & set(keywords)